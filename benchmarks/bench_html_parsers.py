@@ -0,0 +1,101 @@
+"""Compare listing-parser engines on a synthetic 5,000-card page.
+
+Usage: python benchmarks/bench_html_parsers.py [--cards 5000] [--repeat 3]
+"""
+
+from __future__ import annotations  # no installation needed
+
+import argparse  # no installation needed
+import time  # no installation needed
+
+from acq_pipeline.modules.discovery.generic_html import parse_directory_html
+from acq_pipeline.modules.discovery.html_engine import ENGINES
+from acq_pipeline.modules.discovery.producthunt_html import (
+    parse_producthunt_listing_html,
+)
+
+SELECTORS = {
+    "card": "div.card",
+    "name": ".name",
+    "url": "a::attr(href)",
+    "description": ".desc",
+}
+
+
+def _directory_html(cards: int) -> str:
+    body = "".join(
+        f'<div class="card"><span class="name">Company {idx}</span>'
+        f'<a href="/company-{idx}">Visit</a>'
+        f'<p class="desc">B2B <b>workflow</b> tool #{idx} &amp; more.</p></div>'
+        for idx in range(cards)
+    )
+    return f"<html><body><nav>menu</nav>{body}<footer>f</footer></body></html>"
+
+
+def _producthunt_html(cards: int) -> str:
+    body = "".join(
+        f'<div class="ph-card"><a class="ph-link" href="/posts/p{idx}">P{idx}</a>'
+        f'<div class="ph-name">Product {idx}</div>'
+        f'<div class="ph-tagline">Ship faster {idx}</div>'
+        f'<div class="ph-upvotes">{idx % 500}</div>'
+        f'<ul class="ph-topics"><li>DevTools</li><li>AI</li></ul>'
+        f'<a class="ph-website" href="https://p{idx}.example.com">W</a></div>'
+        for idx in range(cards)
+    )
+    return f"<html><body>{body}</body></html>"
+
+
+def _comparable(leads: list) -> list[dict]:
+    rows = []
+    for lead in leads:
+        row = lead.to_dict()
+        row.pop("discovered_at")
+        rows.append(row)
+    return rows
+
+
+def _bench(label: str, parse, repeat: int) -> None:
+    baseline = None
+    base_time = None
+    for engine in ENGINES:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            leads = parse(engine)
+            best = min(best, time.perf_counter() - start)
+        rows = _comparable(leads)
+        if baseline is None:
+            baseline, base_time = rows, best
+        identical = rows == baseline
+        print(
+            f"{label:<17} {engine:<12} {best:8.3f}s  "
+            f"x{base_time / best:5.2f}  leads={len(rows)} identical={identical}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cards", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    directory = _directory_html(args.cards)
+    listing = _producthunt_html(args.cards)
+    _bench(
+        "generic_html",
+        lambda engine: parse_directory_html(
+            directory, "generic_html", "https://example.com/", SELECTORS, engine
+        ),
+        args.repeat,
+    )
+    _bench(
+        "producthunt_html",
+        lambda engine: parse_producthunt_listing_html(
+            listing, base_url="https://www.producthunt.com/", engine=engine
+        ),
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
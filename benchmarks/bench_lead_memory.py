@@ -0,0 +1,94 @@
+"""Measure peak RSS and write time for holding and serializing N leads.
+
+Each encoder runs in a fresh subprocess so its peak RSS is its own.
+``dict`` writes ``lead.to_dict()`` records; ``direct`` writes each lead's
+``to_json()`` line without building the intermediate dict.
+
+Usage: python benchmarks/bench_lead_memory.py [--leads 1000000]
+"""
+
+from __future__ import annotations  # no installation needed
+
+import argparse  # no installation needed
+import json  # no installation needed
+import resource  # no installation needed
+import subprocess  # no installation needed
+import sys  # no installation needed
+import tempfile  # no installation needed
+import time  # no installation needed
+from pathlib import Path  # no installation needed
+
+ENCODERS = ("dict", "direct")
+
+
+def _rss_mb() -> float:
+    # ru_maxrss is KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _child(count: int, encoder: str) -> dict[str, float]:
+    from acq_pipeline.modules.discovery.schema import Lead
+    from acq_pipeline.modules.discovery.storage import NdjsonWriter
+
+    baseline = _rss_mb()
+    start = time.perf_counter()
+    leads = [
+        Lead(
+            source="producthunt_api",
+            source_url=f"https://www.producthunt.com/posts/product-{idx}",
+            discovered_at="2026-01-05T00:00:00Z",
+            company_name=f"Product {idx}",
+            website=f"https://product-{idx}.example.com",
+            description=f"B2B workflow automation for teams, release {idx}.",
+            signals={"votes": idx % 500},
+            raw={"id": str(idx)},
+        )
+        for idx in range(count)
+    ]
+    build = time.perf_counter() - start
+    held = _rss_mb()
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        with NdjsonWriter(Path(tmp) / "leads.ndjson") as writer:
+            if encoder == "direct":
+                writer.write_many_leads(leads)
+            else:
+                writer.write_many(lead.to_dict() for lead in leads)
+        write = time.perf_counter() - start
+    return {
+        "build_s": build,
+        "write_s": write,
+        "held_mb": held - baseline,
+        "peak_mb": _rss_mb(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leads", type=int, default=1_000_000)
+    parser.add_argument("--encoder", choices=ENCODERS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.encoder:
+        print(json.dumps(_child(args.leads, args.encoder)))
+        return
+
+    for encoder in ENCODERS:
+        result = subprocess.run(
+            [sys.executable, __file__, "--leads", str(args.leads), "--encoder", encoder],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            print(f"{encoder:<7} failed: {result.stderr.strip().splitlines()[-1]}")
+            continue
+        stats = json.loads(result.stdout)
+        print(
+            f"{encoder:<7} leads held {stats['held_mb']:7.1f} MB  "
+            f"peak RSS {stats['peak_mb']:7.1f} MB  "
+            f"build {stats['build_s']:5.2f}s  write {stats['write_s']:5.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Measure peak RSS and wall time of merge_sources in memory and spilled.
+
+Each mode runs in a fresh subprocess over the same generated raw partitions,
+so its peak RSS is its own. Half of the second source repeats the first.
+
+Usage: python benchmarks/bench_merge_spill.py [--leads 2000000] [--memory-mb 64]
+"""
+
+from __future__ import annotations  # no installation needed
+
+import argparse  # no installation needed
+import json  # no installation needed
+import resource  # no installation needed
+import subprocess  # no installation needed
+import sys  # no installation needed
+import tempfile  # no installation needed
+import time  # no installation needed
+from datetime import date  # no installation needed
+from pathlib import Path  # no installation needed
+
+MODES = ("memory", "spill")
+SOURCES = ("generic_html", "producthunt_api")
+RUN_DATE = date(2026, 1, 5)
+
+
+def _cfg(root: Path, memory_mb: float):
+    from acq_pipeline.config import ProjectConfig, ProjectPaths
+
+    return ProjectConfig(
+        paths=ProjectPaths(
+            repo_root=root,
+            configs_dir=root / "configs",
+            data_dir=root / "data",
+            outputs_dir=root / "outputs",
+            proof_dir=root / "proof",
+        ),
+        settings={"merge": {"memory_mb": memory_mb}},
+        sources={},
+    )
+
+
+def _generate(root: Path, count: int) -> None:
+    from acq_pipeline.modules.discovery.storage import NdjsonWriter, get_run_dir
+
+    cfg = _cfg(root, 0)
+    per_source = count // len(SOURCES)
+    for offset, source in enumerate(SOURCES):
+        path = get_run_dir(cfg, source, RUN_DATE) / "leads.ndjson"
+        with NdjsonWriter(path) as writer:
+            for idx in range(per_source):
+                key = idx + offset * per_source // 2
+                writer.write(
+                    {
+                        "source": source,
+                        "source_url": f"https://{source}.test/{idx}",
+                        "discovered_at": "2026-01-05T00:00:00Z",
+                        "company_name": f"Company {key}",
+                        "website": f"https://company-{key}.example.com",
+                        "description": f"B2B workflow automation, release {idx}.",
+                        "signals": {"votes": idx % 500},
+                        "raw": {"id": str(idx)},
+                    }
+                )
+
+
+def _rss_mb() -> float:
+    # ru_maxrss is KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _child(root: Path, mode: str, memory_mb: float) -> dict[str, float]:
+    from acq_pipeline.modules.discovery.merge import merge_sources
+
+    baseline = _rss_mb()
+    start = time.perf_counter()
+    result = merge_sources(
+        _cfg(root, memory_mb), list(SOURCES), RUN_DATE, spill=mode == "spill"
+    )
+    return {
+        "merge_s": time.perf_counter() - start,
+        "output_count": result["output_count"],
+        "grew_mb": _rss_mb() - baseline,
+        "peak_mb": _rss_mb(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leads", type=int, default=2_000_000)
+    parser.add_argument("--memory-mb", type=float, default=64)
+    parser.add_argument("--root", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(_child(args.root, args.mode, args.memory_mb)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        start = time.perf_counter()
+        _generate(root, args.leads)
+        print(f"generated {args.leads:,} leads in {time.perf_counter() - start:.1f}s")
+        for mode in MODES:
+            result = subprocess.run(
+                [
+                    sys.executable, __file__, "--root", str(root), "--mode", mode,
+                    "--memory-mb", str(args.memory_mb),
+                ],
+                capture_output=True,
+                text=True,
+            )
+            if result.returncode != 0:
+                print(f"{mode:<7} failed: {result.stderr.strip().splitlines()[-1]}")
+                continue
+            stats = json.loads(result.stdout)
+            print(
+                f"{mode:<7} merged {stats['output_count']:,}  "
+                f"RSS growth {stats['grew_mb']:7.1f} MB  "
+                f"peak RSS {stats['peak_mb']:7.1f} MB  "
+                f"merge {stats['merge_s']:6.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compare NDJSON partition size and read time for each storage compression.
+
+Usage: python benchmarks/bench_ndjson_compression.py [--leads 100000] [--repeat 3]
+"""
+
+from __future__ import annotations  # no installation needed
+
+import argparse  # no installation needed
+import tempfile  # no installation needed
+import time  # no installation needed
+from pathlib import Path  # no installation needed
+
+from acq_pipeline.modules.discovery.storage import (
+    NdjsonWriter,
+    iter_ndjson,
+    resolve_compression,
+)
+
+
+def _records(count: int):
+    for idx in range(count):
+        yield {
+            "source": "producthunt_api",
+            "source_url": f"https://www.producthunt.com/posts/product-{idx}",
+            "discovered_at": "2026-01-05T00:00:00Z",
+            "company_name": f"Product {idx}",
+            "website": f"https://product-{idx}.example.com",
+            "description": f"B2B workflow automation for teams, release {idx}.",
+            "signals": {"votes": idx % 500, "topics": ["SaaS", "Productivity"]},
+            "raw": {
+                "id": str(idx),
+                "tagline": "Ship faster with fewer meetings",
+                "makers": [{"name": "Zoë Müller"}, {"name": "山田太郎"}],
+            },
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leads", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_size = None
+        base_read = None
+        for compression in ("none", "gzip", "zstd"):
+            try:
+                resolve_compression(compression)
+                path = Path(tmp) / compression / "leads.ndjson"
+                start = time.perf_counter()
+                with NdjsonWriter(path, compression=compression) as writer:
+                    writer.write_many(_records(args.leads))
+            except ImportError:
+                print(f"{compression:<5} skipped (zstandard not installed)")
+                continue
+            write_time = time.perf_counter() - start
+            size = writer.path.stat().st_size
+            read_time = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                count = sum(1 for _ in iter_ndjson(path))
+                read_time = min(read_time, time.perf_counter() - start)
+            if base_size is None:
+                base_size, base_read = size, read_time
+            print(
+                f"{compression:<5} {size / 1e6:8.1f} MB  x{base_size / size:5.2f}  "
+                f"write {write_time:6.2f}s  read {read_time:6.2f}s "
+                f"(x{base_read / read_time:4.2f})  records={count}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Time single-lead lookups through the .idx offset sidecar against a full scan.
+
+Usage: python benchmarks/bench_offset_index.py [--leads 1000000] [--lookups 100]
+"""
+
+from __future__ import annotations  # no installation needed
+
+import argparse  # no installation needed
+import random  # no installation needed
+import tempfile  # no installation needed
+import time  # no installation needed
+from pathlib import Path  # no installation needed
+
+from acq_pipeline.modules.discovery.keys import dedup_key
+from acq_pipeline.modules.discovery.offset_index import open_offset_index
+from acq_pipeline.modules.discovery.storage import NdjsonWriter, iter_ndjson
+
+
+def _records(count: int):
+    for idx in range(count):
+        yield {
+            "source": "producthunt_api",
+            "source_url": f"https://www.producthunt.com/posts/product-{idx}",
+            "discovered_at": "2026-01-05T00:00:00Z",
+            "company_name": f"Product {idx}",
+            "website": f"https://product-{idx}.example.com",
+            "description": f"B2B workflow automation for teams, release {idx}.",
+            "signals": {"votes": idx % 500, "topics": ["SaaS", "Productivity"]},
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leads", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    keys = [
+        f"product-{rng.randrange(args.leads)}.example.com" for _ in range(args.lookups)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "leads.ndjson"
+        start = time.perf_counter()
+        with NdjsonWriter(path, index=True) as writer:
+            writer.write_many(_records(args.leads))
+        print(
+            f"write+index {time.perf_counter() - start:6.2f}s  "
+            f"{path.stat().st_size / 1e6:.1f} MB"
+        )
+
+        start = time.perf_counter()
+        found = next(r for r in iter_ndjson(path) if dedup_key(r) == keys[0])
+        scan = time.perf_counter() - start
+        print(f"scan lookup     {scan * 1e3:9.2f} ms  ({found['company_name']})")
+
+        start = time.perf_counter()
+        with open_offset_index(path) as index:
+            opened = time.perf_counter() - start
+            start = time.perf_counter()
+            for key in keys:
+                assert index.find(key)
+            per_lookup = (time.perf_counter() - start) / len(keys)
+            start = time.perf_counter()
+            for _ in range(args.lookups):
+                index.record(rng.randrange(len(index)))
+            per_record = (time.perf_counter() - start) / args.lookups
+        print(f"index open      {opened * 1e3:9.2f} ms")
+        print(f"index lookup    {per_lookup * 1e3:9.3f} ms  (x{scan / per_lookup:,.0f})")
+        print(f"record by line  {per_record * 1e3:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
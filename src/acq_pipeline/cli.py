@@ -10,12 +10,19 @@ from dotenv import load_dotenv  # already in env; no new install
 
 from .config import load_config  # no installation needed
 from .modules.discovery.filter import (  # no installation needed
-    load_ndjson,
     run_filter,
     score_record,
 )
 from .modules.discovery.generic_html import run_generic_html  # no installation needed
-from .modules.discovery.merge import merge_sources  # no installation needed
+from .modules.discovery.keys import dedup_key  # no installation needed
+from .modules.discovery.lead_store import (  # no installation needed
+    find_in_stage,
+    iter_stage,
+    open_store,
+    stage_exists,
+    store_path,
+)
+from .modules.discovery.merge import merge_sources, rekey  # no installation needed
 from .modules.discovery.producthunt_api import (  # no installation needed
     run_producthunt_fixture,
     run_producthunt_live as run_producthunt_api_live,
@@ -24,9 +31,13 @@ from .modules.discovery.producthunt_html import (  # no installation needed
     run_producthunt_html,
     run_producthunt_live as run_producthunt_html_live,
 )
+from .modules.discovery.producthunt_partition import (  # no installation needed
+    run_producthunt_partitioned,
+)
 from .modules.dossier.io import build_dossiers  # no installation needed
 from .modules.discovery.schema import Lead  # no installation needed
 from .modules.discovery.storage import write_leads  # no installation needed
+from .pipeline import run_pipeline  # no installation needed
 
 
 def _print(obj: Any) -> None:
@@ -50,9 +61,25 @@ def cmd_run(args: argparse.Namespace) -> int:
         _print(payload)
         return 0
 
-    # Placeholder for actual pipeline execution.
-    print("Run mode not implemented yet. Use --dry for now.")
-    return 0
+    run_date = date.today()
+    if args.run_date:
+        try:
+            run_date = date.fromisoformat(args.run_date)
+        except ValueError as exc:
+            raise ValueError("run-date must be in YYYY-MM-DD format.") from exc
+
+    payload = run_pipeline(
+        cfg,
+        run_date=run_date,
+        limit=args.limit,
+        threshold=args.threshold,
+        dossier_limit=args.dossier_limit,
+        force=args.force,
+        max_workers=args.max_workers,
+        new_only=args.new_only,
+    )
+    _print(payload)
+    return 0 if payload["ok"] else 1
 
 
 def _demo_leads(source: str, count: int) -> list[Lead]:
@@ -94,11 +121,19 @@ def cmd_discovery_fetch(args: argparse.Namespace) -> int:
 
     if args.source == "generic_html":
         payload = run_generic_html(
-            cfg, limit=args.limit, run_date=run_date, seed_url=args.url
+            cfg,
+            limit=args.limit,
+            run_date=run_date,
+            seed_url=args.url,
+            overwrite=args.overwrite,
         )
     elif args.source == "producthunt_html":
         payload = run_producthunt_html(
-            cfg, limit=args.limit, run_date=run_date, seed_url=args.url
+            cfg,
+            limit=args.limit,
+            run_date=run_date,
+            seed_url=args.url,
+            overwrite=args.overwrite,
         )
     elif args.source == "producthunt_api":
         if run_date is None:
@@ -122,9 +157,25 @@ def cmd_discovery_fetch_live(args: argparse.Namespace) -> int:
     if args.source == "producthunt_html":
         if not args.url:
             raise ValueError("--url is required for producthunt_html fetch-live.")
+        if args.resume:
+            raise ValueError("--resume is only supported for producthunt_api.")
         payload = run_producthunt_html_live(
             cfg, url=args.url, limit=args.limit, run_date=run_date
         )
+    elif args.source == "producthunt_api" and args.partition:
+        if not (args.posted_after and args.posted_before):
+            raise ValueError("--partition needs both --posted-after and --posted-before.")
+        payload = run_producthunt_partitioned(
+            cfg,
+            limit=args.limit,
+            run_date=run_date,
+            posted_after=args.posted_after,
+            posted_before=args.posted_before,
+            order=args.order,
+            featured=args.featured,
+            overwrite=args.overwrite,
+            resume=args.resume,
+        )
     elif args.source == "producthunt_api":
         payload = run_producthunt_api_live(
             cfg,
@@ -135,6 +186,7 @@ def cmd_discovery_fetch_live(args: argparse.Namespace) -> int:
             posted_after=args.posted_after,
             posted_before=args.posted_before,
             overwrite=args.overwrite,
+            resume=args.resume,
         )
     else:
         raise ValueError(
@@ -163,7 +215,18 @@ def cmd_discovery_merge(args: argparse.Namespace) -> int:
     if not sources:
         raise ValueError("At least one source must be provided.")
 
-    payload = merge_sources(cfg, sources=sources, run_date=run_date)
+    payload = merge_sources(
+        cfg,
+        sources=sources,
+        run_date=run_date,
+        new_only=args.new_only,
+        reuse=not args.force,
+        spill=True if args.spill else None,
+        near_dup=True if args.near_dup else None,
+        entities=True if args.entities else None,
+        # --force recomputes the partition rather than merging the new tail.
+        incremental=False if args.force else (True if args.incremental else None),
+    )
     _print(payload)
     return 0
 
@@ -175,7 +238,9 @@ def cmd_discovery_filter(args: argparse.Namespace) -> int:
     except ValueError as exc:
         raise ValueError("run-date must be in YYYY-MM-DD format.") from exc
 
-    payload = run_filter(cfg, run_date=run_date, threshold=args.threshold)
+    payload = run_filter(
+        cfg, run_date=run_date, threshold=args.threshold, reuse=not args.force
+    )
     _print(payload)
     return 0
 
@@ -191,10 +256,15 @@ def cmd_discovery_score(args: argparse.Namespace) -> int:
     input_path = (
         cfg.paths.data_dir / "interim" / "merged" / run_date_str / "leads.ndjson"
     )
-    if not input_path.exists():
+    if not stage_exists(cfg, "merged", run_date_str, input_path):
         raise FileNotFoundError(f"Missing merged input: {input_path}")
 
-    records = load_ndjson(input_path)
+    if args.url or args.name:
+        key = dedup_key({"website": args.url, "company_name": args.name})
+        records = iter(find_in_stage(cfg, "merged", run_date_str, input_path, key))
+    else:
+        records = iter_stage(cfg, "merged", run_date_str, input_path, limit=args.limit)
+
     payload = []
     for record in records:
         score_payload = score_record(record)
@@ -211,6 +281,28 @@ def cmd_discovery_score(args: argparse.Namespace) -> int:
     return 0
 
 
+def cmd_discovery_lookup(args: argparse.Namespace) -> int:
+    cfg = load_config()
+    key = dedup_key({"website": args.url, "company_name": args.name})
+    if not key:
+        raise ValueError("Provide --url or --name to look up.")
+    path = store_path(cfg)
+    if not path.exists():
+        raise FileNotFoundError(
+            f"No lead store at {path}; set storage.backend to sqlite or both."
+        )
+    with open_store(cfg) as store:
+        history = store.history(key)
+    _print({"dedup_key": key, "seen": bool(history), "history": history})
+    return 0
+
+
+def cmd_discovery_rekey(args: argparse.Namespace) -> int:
+    cfg = load_config()
+    _print(rekey(cfg))
+    return 0
+
+
 def cmd_dossier_build(args: argparse.Namespace) -> int:
     cfg = load_config()
     try:
@@ -218,7 +310,12 @@ def cmd_dossier_build(args: argparse.Namespace) -> int:
     except ValueError as exc:
         raise ValueError("run-date must be in YYYY-MM-DD format.") from exc
 
-    payload = build_dossiers(cfg, run_date=run_date, limit=args.limit)
+    key = None
+    if args.url or args.name:
+        key = dedup_key({"website": args.url, "company_name": args.name})
+    payload = build_dossiers(
+        cfg, run_date=run_date, limit=args.limit, key=key, reuse=not args.force
+    )
     _print(payload)
     return 0
 
@@ -232,6 +329,25 @@ def build_parser() -> argparse.ArgumentParser:
 
     run = sub.add_parser("run", help="Run the pipeline (use --dry for smoke test).")
     run.add_argument("--dry", action="store_true", help="Print loaded config and exit.")
+    run.add_argument("--run-date", help="Run date (YYYY-MM-DD, default today).")
+    run.add_argument("--limit", type=int, default=25, help="Max leads per source.")
+    run.add_argument(
+        "--threshold", type=int, default=2, help="Minimum filter score to keep."
+    )
+    run.add_argument(
+        "--dossier-limit", type=int, default=10, help="Max dossiers to write."
+    )
+    run.add_argument(
+        "--force", action="store_true", help="Rerun stages even if inputs are unchanged."
+    )
+    run.add_argument(
+        "--max-workers", type=int, default=4, help="Stages to run in parallel."
+    )
+    run.add_argument(
+        "--new-only",
+        action="store_true",
+        help="Merge only leads not seen on an earlier run date.",
+    )
     run.set_defaults(func=cmd_run)
 
     discovery = sub.add_parser("discovery", help="Discovery module commands.")
@@ -272,6 +388,19 @@ def build_parser() -> argparse.ArgumentParser:
     fetch_live.add_argument(
         "--overwrite", action="store_true", help="Overwrite output file."
     )
+    fetch_live.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from the last checkpointed cursor (producthunt_api).",
+    )
+    fetch_live.add_argument(
+        "--partition",
+        action="store_true",
+        help=(
+            "Split the posted-after/before range into time windows crawled in "
+            "parallel (producthunt_api); leads come in window order."
+        ),
+    )
     fetch_live.set_defaults(func=cmd_discovery_fetch_live)
 
     merge = discovery_sub.add_parser("merge", help="Merge discovery leads by date.")
@@ -285,6 +414,36 @@ def build_parser() -> argparse.ArgumentParser:
         help="Repeatable source option (alternative to --sources).",
     )
     merge.add_argument("--run-date", required=True, help="Run date (YYYY-MM-DD).")
+    merge.add_argument(
+        "--new-only",
+        action="store_true",
+        help="Drop leads already merged on an earlier run date.",
+    )
+    merge.add_argument(
+        "--spill",
+        action="store_true",
+        help="Dedup through sorted runs on disk (bounded by merge.memory_mb).",
+    )
+    merge.add_argument(
+        "--near-dup",
+        action="store_true",
+        help="Also drop near-duplicate companies (merge.near_dup settings).",
+    )
+    merge.add_argument(
+        "--entities",
+        action="store_true",
+        help="Fuse leads that share any identity key (merge.entities settings).",
+    )
+    merge.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Merge only lines appended to the inputs since the last merge.",
+    )
+    merge.add_argument(
+        "--force",
+        action="store_true",
+        help="Rerun in full even if inputs are unchanged or only grew.",
+    )
     merge.set_defaults(func=cmd_discovery_merge)
 
     filter_cmd = discovery_sub.add_parser(
@@ -294,14 +453,33 @@ def build_parser() -> argparse.ArgumentParser:
     filter_cmd.add_argument(
         "--threshold", type=int, default=2, help="Minimum score to keep."
     )
+    filter_cmd.add_argument(
+        "--force", action="store_true", help="Rerun even if inputs are unchanged."
+    )
     filter_cmd.set_defaults(func=cmd_discovery_filter)
 
     score_cmd = discovery_sub.add_parser(
         "score", help="Score merged leads without writing files."
     )
     score_cmd.add_argument("--run-date", required=True, help="Run date (YYYY-MM-DD).")
+    score_cmd.add_argument("--limit", type=int, help="Score only the first N leads.")
+    score_cmd.add_argument("--url", help="Score only the lead with this website/URL.")
+    score_cmd.add_argument("--name", help="Score only the lead with this company name.")
     score_cmd.set_defaults(func=cmd_discovery_score)
 
+    lookup = discovery_sub.add_parser(
+        "lookup", help="Show every stored appearance of a lead (SQLite store)."
+    )
+    lookup.add_argument("--url", help="Company website or source URL.")
+    lookup.add_argument("--name", help="Company name (used when no URL is given).")
+    lookup.set_defaults(func=cmd_discovery_lookup)
+
+    rekey_cmd = discovery_sub.add_parser(
+        "rekey",
+        help="Recompute stored dedup keys and rebuild the seen index after a key change.",
+    )
+    rekey_cmd.set_defaults(func=cmd_discovery_rekey)
+
     dossier = sub.add_parser("dossier", help="Dossier generation commands.")
     dossier_sub = dossier.add_subparsers(dest="dossier_command", required=True)
 
@@ -310,6 +488,13 @@ def build_parser() -> argparse.ArgumentParser:
     dossier_build.add_argument(
         "--limit", type=int, default=10, help="Max dossiers to write."
     )
+    dossier_build.add_argument("--url", help="Build only the lead with this website/URL.")
+    dossier_build.add_argument(
+        "--name", help="Build only the lead with this company name."
+    )
+    dossier_build.add_argument(
+        "--force", action="store_true", help="Rerun even if inputs are unchanged."
+    )
     dossier_build.set_defaults(func=cmd_dossier_build)
 
     return p
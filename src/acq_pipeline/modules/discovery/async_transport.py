@@ -0,0 +1,144 @@
+from __future__ import annotations  # no installation needed
+
+import asyncio  # no installation needed
+import queue  # no installation needed
+import threading  # no installation needed
+from typing import Any, Callable, Iterable, Iterator  # no installation needed
+
+from .fetch_pool import FetchResult, host_key, unique_urls  # no installation needed
+from .http_cache import HttpCache  # no installation needed
+from .transport import (  # no installation needed
+    HttpClient,
+    rate_key_for,
+    read_local_html,
+)
+
+_DONE = object()
+
+
+def _require_aiohttp() -> Any:
+    try:
+        import aiohttp  # optional: requirements/scraping.txt
+    except ImportError as exc:
+        raise ImportError(
+            "live_scrape.engine: async needs aiohttp "
+            "(pip install -r requirements/scraping.txt)."
+        ) from exc
+    return aiohttp
+
+
+async def async_fetch_html(session: Any, url: str, client: HttpClient) -> str:
+    """``fetch_html`` on an aiohttp session, sharing the client's cache and limiter.
+
+    Local files and the cache are read and written on worker threads
+    (``asyncio.to_thread``) so disk I/O never stalls the other requests on
+    the loop.
+    """
+    local = await asyncio.to_thread(read_local_html, url)
+    if local is not None:
+        return local
+
+    cache = client.cache
+    entry = await asyncio.to_thread(cache.lookup, url) if cache is not None else None
+    if cache is not None and entry is not None and cache.is_fresh(entry):
+        return await asyncio.to_thread(cache.read, entry)
+
+    key = rate_key_for(url)
+    if client.limiter is not None:
+        wait = client.limiter.reserve(key)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    headers = HttpCache.conditional_headers(entry)
+    async with session.get(url, headers=headers) as response:
+        if client.limiter is not None:
+            client.limiter.observe(key, response.headers, response.status)
+        if cache is not None and entry is not None and response.status == 304:
+            return await asyncio.to_thread(cache.read, entry, True)
+        response.raise_for_status()
+        content = await response.read()
+        encoding = response.get_encoding()
+        if cache is not None:
+            await asyncio.to_thread(cache.store, url, content, encoding, response.headers)
+        return content.decode(encoding, errors="replace")
+
+
+async def _fetch_all(
+    urls: list[str],
+    client: HttpClient,
+    max_per_host: int,
+    emit: Callable[[FetchResult], None],
+    stop: threading.Event,
+) -> None:
+    aiohttp = _require_aiohttp()
+    settings = client.settings
+    connector = aiohttp.TCPConnector(
+        limit=settings.max_in_flight, limit_per_host=max_per_host
+    )
+    timeout = aiohttp.ClientTimeout(total=settings.timeout)
+    host_slots: dict[str, asyncio.Semaphore] = {}
+    for url in urls:
+        host_slots.setdefault(host_key(url), asyncio.Semaphore(max_per_host))
+
+    async with aiohttp.ClientSession(
+        headers=dict(settings.headers), timeout=timeout, connector=connector
+    ) as session:
+
+        async def _one(url: str) -> None:
+            async with host_slots[host_key(url)]:
+                if stop.is_set():
+                    return
+                try:
+                    html = await async_fetch_html(session, url, client)
+                except Exception as exc:  # reported per URL, like fetch_many
+                    emit(FetchResult(url=url, error=exc))
+                else:
+                    emit(FetchResult(url=url, html=html))
+
+        await asyncio.gather(*(_one(url) for url in urls))
+
+
+def fetch_many_async(
+    urls: Iterable[str], client: HttpClient, max_per_host: int = 2
+) -> Iterator[FetchResult]:
+    """Async counterpart of ``fetch_pool.fetch_many`` on a single event loop.
+
+    The loop runs on one helper thread and results are yielded in completion
+    order. Up to ``live_scrape.max_in_flight`` requests share the loop, at
+    most ``max_per_host`` per host. Closing the iterator early stops requests
+    that have not started yet.
+    """
+    _require_aiohttp()
+    ordered = unique_urls(urls)
+    if not ordered:
+        return
+
+    results: queue.Queue[object] = queue.Queue()
+    stop = threading.Event()
+    errors: list[BaseException] = []
+
+    def _runner() -> None:
+        try:
+            asyncio.run(
+                _fetch_all(ordered, client, max(1, max_per_host), results.put, stop)
+            )
+        except BaseException as exc:  # surfaced on the consumer thread
+            errors.append(exc)
+        finally:
+            results.put(_DONE)
+
+    thread = threading.Thread(target=_runner, name="acq-async-fetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = results.get()
+            if item is _DONE:
+                break
+            if not isinstance(item, FetchResult):
+                raise TypeError(f"Unexpected item from the fetch loop: {item!r}")
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+    if errors:
+        raise errors[0]
@@ -0,0 +1,187 @@
+from __future__ import annotations  # no installation needed
+
+import ipaddress  # no installation needed
+from functools import lru_cache  # no installation needed
+from pathlib import Path  # no installation needed
+from urllib.parse import parse_qsl, urlencode, urlsplit  # no installation needed
+
+# Snapshot of https://publicsuffix.org/list/public_suffix_list.dat (MPL-2.0),
+# ICANN and private sections; refresh by replacing the file.
+PSL_PATH = Path(__file__).parent / "data" / "public_suffix_list.dat"
+URL_CACHE_SIZE = 1 << 16
+HOST_CACHE_SIZE = 1 << 16
+TRACKING_PREFIXES = ("utm_",)
+TRACKING_PARAMS = frozenset(
+    {
+        "_hsenc",
+        "_hsmi",
+        "dclid",
+        "fbclid",
+        "gclid",
+        "gclsrc",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "msclkid",
+        "ref",
+        "ref_src",
+        "ref_url",
+        "twclid",
+        "yclid",
+    }
+)
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _idna(rule: str) -> str:
+    try:
+        return rule.encode("idna").decode("ascii")
+    except UnicodeError:
+        return rule
+
+
+class PublicSuffixList:
+    """Public suffix rules (exact, ``*.`` wildcard and ``!`` exception)."""
+
+    def __init__(self, lines: list[str]) -> None:
+        self.rules: set[str] = set()
+        self.wildcards: set[str] = set()
+        self.exceptions: set[str] = set()
+        for line in lines:
+            rule = line.split(maxsplit=1)[0] if line.strip() else ""
+            if not rule or rule.startswith("//"):
+                continue
+            rule = rule.lower()
+            for variant in {rule, _idna(rule)}:
+                if variant.startswith("!"):
+                    self.exceptions.add(variant[1:])
+                elif variant.startswith("*."):
+                    self.wildcards.add(variant[2:])
+                else:
+                    self.rules.add(variant)
+
+    @classmethod
+    def load(cls, path: Path = PSL_PATH) -> PublicSuffixList:
+        return cls(path.read_text(encoding="utf-8").splitlines())
+
+    def suffix_labels(self, labels: list[str]) -> int:
+        """How many trailing ``labels`` form the public suffix (at least one)."""
+        for idx in range(len(labels)):
+            candidate = ".".join(labels[idx:])
+            if candidate in self.exceptions:
+                return len(labels) - idx - 1
+            if candidate in self.rules:
+                return len(labels) - idx
+            if idx + 1 < len(labels) and ".".join(labels[idx + 1 :]) in self.wildcards:
+                return len(labels) - idx
+        return 1
+
+
+@lru_cache(maxsize=1)
+def public_suffix_list() -> PublicSuffixList:
+    return PublicSuffixList.load()
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+    except ValueError:
+        return False
+    return True
+
+
+@lru_cache(maxsize=HOST_CACHE_SIZE)
+def split_host(host: str) -> tuple[str, str]:
+    """``(registrable domain, public suffix)`` of ``host``.
+
+    ``shop.acme.co.uk`` gives ``("acme.co.uk", "co.uk")``. A host that is
+    itself a public suffix, an IP address or empty has no registrable domain.
+    """
+    host = host.strip().strip(".").lower()
+    if not host or _is_ip(host):
+        return "", ""
+    labels = host.split(".")
+    suffix = public_suffix_list().suffix_labels(labels)
+    if len(labels) <= suffix:
+        return "", host
+    return ".".join(labels[-suffix - 1 :]), ".".join(labels[-suffix:])
+
+
+def registrable_domain(host: str) -> str:
+    return split_host(host)[0]
+
+
+def domain_label(host: str) -> str:
+    """The label left of the public suffix, e.g. ``acme`` for ``www.acme.io``."""
+    domain, suffix = split_host(host)
+    return domain[: -len(suffix) - 1] if domain else ""
+
+
+def _is_tracking(key: str) -> bool:
+    return key in TRACKING_PARAMS or key.startswith(TRACKING_PREFIXES)
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def canonical_url(url: str) -> str:
+    """Scheme-less, lowercase ``host/path?query`` used to compare URLs.
+
+    ``www.`` and default ports are dropped, as are tracking parameters
+    (``utm_*``, ``ref``, ``fbclid``, ...), the fragment and a trailing slash.
+    """
+    value = url.strip().lower()
+    if not value:
+        return ""
+    parts = urlsplit(value)
+    if not parts.scheme or not parts.netloc:
+        parts = urlsplit(f"http://{value}")
+
+    host = parts.hostname or ""
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+        host = parts.netloc
+    host = host.removeprefix("www.")
+    if port is not None and port != _DEFAULT_PORTS.get(parts.scheme):
+        host = f"{host}:{port}"
+
+    query = parts.query
+    if query:
+        query = urlencode(
+            [
+                (key, val)
+                for key, val in parse_qsl(query, keep_blank_values=True)
+                if not _is_tracking(key)
+            ]
+        )
+    base = f"{host}{parts.path.rstrip('/')}"
+    return f"{base}?{query}" if query else base
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def website_key(url: str) -> str:
+    """Identity of a company website: its canonical URL without a port.
+
+    The full host is kept, so ``https://www.acme.io/?ref=ph`` and ``acme.io``
+    match but ``app.acme.io`` does not, and neither do ``acme.notion.site``
+    and ``beta.notion.site``: shared hosts like these are not all in the
+    suffix list, so a registrable domain is only a hint, never a key.
+    """
+    canonical = canonical_url(url)
+    end = len(canonical)
+    for mark in "/?":
+        found = canonical.find(mark)
+        if found != -1:
+            end = min(end, found)
+    host, rest = canonical[:end], canonical[end:]
+    if host.count(":") == 1:  # not a bare IPv6 address
+        host = host.split(":", 1)[0]
+    return host + rest
+
+
+def cache_info() -> dict[str, object]:
+    return {
+        "canonical_url": canonical_url.cache_info()._asdict(),
+        "website_key": website_key.cache_info()._asdict(),
+        "split_host": split_host.cache_info()._asdict(),
+    }
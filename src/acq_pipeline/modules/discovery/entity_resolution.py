@@ -0,0 +1,231 @@
+from __future__ import annotations  # no installation needed
+
+import re  # no installation needed
+from dataclasses import dataclass  # no installation needed
+from typing import Any, Iterable, Iterator  # no installation needed
+from urllib.parse import urlparse  # no installation needed
+
+from ...config import ProjectConfig  # no installation needed
+from .domains import registrable_domain, website_key  # no installation needed
+from .keys import dedup_key  # no installation needed
+from .near_dup import normalize_name  # no installation needed
+
+KEY_KINDS = ("dedup", "website", "producthunt", "name")
+# ``name`` is opt-in: union-find is transitive, so two companies that merely
+# share a name would chain together everything either of them matches.
+DEFAULT_KEYS = ("dedup", "website", "producthunt")
+_PH_PATH = re.compile(r"^/(?:posts|products)/([^/?#]+)")
+_FILLABLE = ("company_name", "website", "description", "source_url")
+
+
+@dataclass(frozen=True)
+class EntitySettings:
+    """Entity resolution options read from ``settings.yaml`` ``merge.entities``."""
+
+    enabled: bool = False
+    keys: tuple[str, ...] = DEFAULT_KEYS
+
+
+def entity_settings(cfg: ProjectConfig) -> EntitySettings:
+    settings: Any = {}
+    if isinstance(cfg.settings, dict):
+        merge = cfg.settings.get("merge", {})
+        if isinstance(merge, dict):
+            settings = merge.get("entities", {})
+    if not isinstance(settings, dict):
+        settings = {}
+    keys = settings.get("keys") or DEFAULT_KEYS
+    if isinstance(keys, str):
+        keys = [item.strip() for item in keys.split(",") if item.strip()]
+    unknown = [kind for kind in keys if kind not in KEY_KINDS]
+    if unknown:
+        raise ValueError(
+            f"Unknown merge.entities.keys {unknown}; expected a subset of {KEY_KINDS}."
+        )
+    return EntitySettings(
+        enabled=bool(settings.get("enabled", False)), keys=tuple(keys)
+    )
+
+
+class DisjointSet:
+    """Union-find over ``0..n-1`` with path halving and union by size."""
+
+    def __init__(self) -> None:
+        self._parent: list[int] = []
+        self._size: list[int] = []
+
+    def add(self) -> int:
+        item = len(self._parent)
+        self._parent.append(item)
+        self._size.append(1)
+        return item
+
+    def find(self, item: int) -> int:
+        parent = self._parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> int:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size[root_b]
+        return root_a
+
+    def __len__(self) -> int:
+        return len(self._parent)
+
+
+def website_host(url: object) -> str:
+    """``url``'s host without ``www.`` or a port, e.g. ``shop.acme.co.uk``."""
+    if not isinstance(url, str) or not url.strip():
+        return ""
+    return website_key(url).split("/", 1)[0].split("?", 1)[0]
+
+
+def website_domain(url: object) -> str:
+    """Registrable domain of ``url``'s host, e.g. ``acme.co.uk``."""
+    return registrable_domain(website_host(url))
+
+
+def producthunt_slug(url: object) -> str:
+    if not isinstance(url, str) or "producthunt.com" not in url.lower():
+        return ""
+    parsed = urlparse(url.strip().lower())
+    if not (parsed.hostname or "").endswith("producthunt.com"):
+        return ""
+    match = _PH_PATH.match(parsed.path)
+    return match.group(1) if match else ""
+
+
+def entity_keys(
+    record: dict[str, Any], kinds: Iterable[str] = DEFAULT_KEYS
+) -> list[str]:
+    """Every identity key ``record`` offers, prefixed by kind.
+
+    ``website`` is the site's host, ``producthunt`` the post or
+    product slug from ``source_url`` or ``raw.slug`` and ``name`` the
+    normalized company name.
+    """
+    kinds = set(kinds)
+    keys: list[str] = []
+    if "dedup" in kinds:
+        key = dedup_key(record)
+        if key:
+            keys.append(f"key:{key}")
+    if "website" in kinds:
+        # The key is the full host: shared hosts (acme.notion.site,
+        # beta.notion.site) are not all public suffixes. The registrable
+        # domain only tells a website on the listing's own site (a directory
+        # link, a Product Hunt redirect), which says nothing about the company.
+        host = website_host(record.get("website"))
+        domain = registrable_domain(host)
+        if host and not (domain and domain == website_domain(record.get("source_url"))):
+            keys.append(f"domain:{host}")
+    if "producthunt" in kinds:
+        raw = record.get("raw")
+        slug = producthunt_slug(record.get("source_url"))
+        if not slug and isinstance(raw, dict) and isinstance(raw.get("slug"), str):
+            slug = raw["slug"].lower()
+        if slug:
+            keys.append(f"ph:{slug}")
+    if "name" in kinds:
+        name = normalize_name(str(record.get("company_name") or ""))
+        if name:
+            keys.append(f"name:{name}")
+    return keys
+
+
+def _merge_signals(into: dict[str, Any], other: dict[str, Any]) -> None:
+    """Fold ``other`` into ``into``: first value wins, lists and dicts combine."""
+    for key, value in other.items():
+        current = into.get(key)
+        if key not in into or current is None:
+            into[key] = value
+        elif isinstance(current, list) and isinstance(value, list):
+            into[key] = current + [item for item in value if item not in current]
+        elif isinstance(current, dict) and isinstance(value, dict):
+            merged = dict(current)
+            _merge_signals(merged, value)
+            into[key] = merged
+
+
+def fuse_records(records: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """One lead from an entity's records, in input order.
+
+    The first record's fields win; empty ones are filled from later records.
+    ``signals`` are merged across all of them and ``signals.sources`` lists
+    every contributing source.
+    """
+    fused: dict[str, Any] | None = None
+    sources: list[str] = []
+    for record in records:
+        source = record.get("source")
+        if isinstance(source, str) and source and source not in sources:
+            sources.append(source)
+        if fused is None:
+            fused = dict(record)
+            fused["signals"] = dict(record.get("signals") or {})
+            continue
+        for field in _FILLABLE:
+            if not fused.get(field) and record.get(field):
+                fused[field] = record[field]
+        if not fused.get("raw") and record.get("raw"):
+            fused["raw"] = record["raw"]
+        _merge_signals(fused["signals"], record.get("signals") or {})
+    if fused is None:
+        raise ValueError("fuse_records needs at least one record.")
+    if len(sources) > 1:
+        fused["signals"]["sources"] = sources
+    return fused
+
+
+def resolve_entities(
+    records: Iterable[dict[str, Any]],
+    kinds: Iterable[str] = DEFAULT_KEYS,
+    skip: set[int] | None = None,
+) -> DisjointSet:
+    """Union every record position with the others that share any key.
+
+    Positions in ``skip`` are still numbered but never joined to anything.
+    Each key costs one dictionary probe and at most one union, so the pass is
+    O(n α(n)) in the number of records.
+    """
+    kinds = tuple(kinds)
+    skip = skip or set()
+    groups = DisjointSet()
+    owners: dict[str, int] = {}
+    for position, record in enumerate(records):
+        groups.add()
+        if position in skip:
+            continue
+        for key in entity_keys(record, kinds):
+            owner = owners.setdefault(key, position)
+            if owner != position:
+                groups.union(owner, position)
+    return groups
+
+
+def iter_fused(
+    records: Iterable[dict[str, Any]],
+    groups: DisjointSet,
+    skip: set[int] | None = None,
+) -> Iterator[tuple[dict[str, Any], list[dict[str, Any]]]]:
+    """``(fused lead, members)`` per entity, ordered by first appearance.
+
+    ``records`` must replay the input ``groups`` was built from. Members are
+    held until the input ends.
+    """
+    skip = skip or set()
+    members: dict[int, list[dict[str, Any]]] = {}
+    for position, record in enumerate(records):
+        if position in skip:
+            continue
+        members.setdefault(groups.find(position), []).append(record)
+    for group in members.values():
+        yield fuse_records(group), group
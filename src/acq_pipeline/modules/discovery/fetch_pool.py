@@ -0,0 +1,266 @@
+from __future__ import annotations  # no installation needed
+
+from collections import deque  # no installation needed
+from concurrent.futures import (  # no installation needed
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field  # no installation needed
+from typing import Callable, Iterable, Iterator  # no installation needed
+from urllib.parse import urlparse  # no installation needed
+
+from ...config import ProjectConfig  # no installation needed
+from .keys import normalize_url  # no installation needed
+from .schema import Lead  # no installation needed
+from .transport import HttpClient  # no installation needed
+
+
+@dataclass(frozen=True)
+class FetchResult:
+    url: str
+    html: str | None = None
+    error: Exception | None = None
+
+
+def fetch_pool_settings(cfg: ProjectConfig) -> tuple[int, int]:
+    if isinstance(cfg.settings, dict):
+        settings = cfg.settings.get("live_scrape", {})
+    else:
+        settings = {}
+    if not isinstance(settings, dict):
+        settings = {}
+
+    def _get_int(key: str, default: int) -> int:
+        value = settings.get(key, default)
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    max_workers = max(1, _get_int("max_workers", 8))
+    max_per_host = max(1, _get_int("max_per_host", 2))
+    return max_workers, max_per_host
+
+
+def host_key(url: str) -> str:
+    parsed = urlparse(url)
+    if parsed.scheme in {"http", "https"} and parsed.netloc:
+        return parsed.netloc.lower()
+    return "local"
+
+
+def unique_urls(urls: Iterable[str]) -> list[str]:
+    seen: set[str] = set()
+    ordered: list[str] = []
+    for url in urls:
+        if url in seen:
+            continue
+        seen.add(url)
+        ordered.append(url)
+    return ordered
+
+
+def fetch_many(
+    urls: Iterable[str],
+    fetch: Callable[[str], str],
+    max_workers: int = 8,
+    max_per_host: int = 2,
+) -> Iterator[FetchResult]:
+    """Fetch URLs on a bounded pool, yielding results in completion order.
+
+    Work is only handed to the pool while its host is below ``max_per_host``
+    in-flight requests, so a slow host never ties up every worker.
+    """
+    pending: dict[str, deque[str]] = {}
+    for url in unique_urls(urls):
+        pending.setdefault(host_key(url), deque()).append(url)
+    if not pending:
+        return
+
+    max_workers = max(1, max_workers)
+    max_per_host = max(1, max_per_host)
+    in_flight: dict[Future[str], str] = {}
+    host_load: dict[str, int] = {host: 0 for host in pending}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+
+        def _dispatch() -> None:
+            for host, queue in pending.items():
+                while (
+                    queue
+                    and host_load[host] < max_per_host
+                    and len(in_flight) < max_workers
+                ):
+                    url = queue.popleft()
+                    host_load[host] += 1
+                    in_flight[pool.submit(fetch, url)] = url
+
+        _dispatch()
+        while in_flight:
+            done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in done:
+                url = in_flight.pop(future)
+                host_load[host_key(url)] -= 1
+                error = future.exception()
+                if error is not None:
+                    yield FetchResult(url=url, error=error)
+                else:
+                    yield FetchResult(url=url, html=future.result())
+            _dispatch()
+
+
+def fetch_batch(
+    urls: Iterable[str],
+    fetch: Callable[[str], str],
+    client: HttpClient | None = None,
+    max_workers: int = 8,
+    max_per_host: int = 2,
+) -> Iterator[FetchResult]:
+    """Fetch on the engine selected by ``live_scrape.engine`` (sync or async)."""
+    if client is not None and client.settings.engine == "async":
+        # Imported lazily: the async engine needs the optional aiohttp extra.
+        from .async_transport import fetch_many_async  # no installation needed
+
+        return fetch_many_async(urls, client, max_per_host=max_per_host)
+    return fetch_many(urls, fetch, max_workers=max_workers, max_per_host=max_per_host)
+
+
+@dataclass
+class CrawlResult:
+    seeds: list[str]
+    leads_by_seed: dict[str, list[Lead]]
+    errors: dict[str, str]
+    pages: int = 0
+    dropped: list[str] = field(default_factory=list)
+
+
+def crawl_frontier(
+    cfg: ProjectConfig,
+    seed_urls: Iterable[str],
+    fetch: Callable[[str], str],
+    parse: Callable[[str, str], tuple[list[Lead], list[str]]],
+    max_pages: int | None = None,
+    max_depth: int | None = 0,
+    limit: int | None = None,
+    client: HttpClient | None = None,
+) -> CrawlResult:
+    """Breadth-first crawl from the seeds, one concurrent batch per depth.
+
+    ``parse`` returns a page's leads and the absolute URLs of the pages it
+    links to. URLs are visited once (keyed by ``merge.normalize_url``), within
+    ``max_depth`` link hops of a seed. Seeds are always fetched; ``max_pages``
+    caps the pages reached through links, and linked URLs past the cap are
+    listed in ``dropped``. The crawl stops as soon as ``limit`` leads have
+    been parsed. Leads are attributed to the seed the page was reached from.
+    Raises the first error only when no page could be fetched.
+    """
+    seeds = unique_urls(seed_urls)
+    max_workers, max_per_host = fetch_pool_settings(cfg)
+    result = CrawlResult(
+        seeds=seeds, leads_by_seed={seed: [] for seed in seeds}, errors={}
+    )
+    visited: set[str] = set()
+    origin: dict[str, str] = {}
+    first_error: Exception | None = None
+    fetched_ok = 0
+    collected = 0
+    linked_pages = 0
+
+    def _visit(url: str, seed: str, frontier: list[str]) -> None:
+        key = normalize_url(url) or url
+        if key in visited:
+            return
+        visited.add(key)
+        origin[url] = seed
+        frontier.append(url)
+
+    frontier: list[str] = []
+    for seed in seeds:
+        _visit(seed, seed, frontier)
+
+    depth = 0
+    while frontier:
+        if depth and max_pages is not None:
+            room = max(0, max_pages - linked_pages)
+            result.dropped.extend(frontier[room:])
+            frontier = frontier[:room]
+            linked_pages += len(frontier)
+        if not frontier:
+            break
+
+        page_leads: dict[str, list[Lead]] = {}
+        page_links: dict[str, list[str]] = {}
+        results = fetch_batch(
+            frontier,
+            fetch,
+            client=client,
+            max_workers=max_workers,
+            max_per_host=max_per_host,
+        )
+        try:
+            for fetched in results:
+                result.pages += 1
+                if fetched.error is not None:
+                    result.errors[fetched.url] = str(fetched.error)
+                    if first_error is None:
+                        first_error = fetched.error
+                    continue
+                fetched_ok += 1
+                leads, links = parse(fetched.url, fetched.html or "")
+                page_leads[fetched.url] = leads
+                page_links[fetched.url] = links
+                collected += len(leads)
+                if limit is not None and 0 <= limit <= collected:
+                    break
+        finally:
+            results.close()
+
+        next_frontier: list[str] = []
+        follow = max_depth is None or depth < max_depth
+        for url in frontier:
+            if url not in page_leads:
+                continue
+            result.leads_by_seed[origin[url]].extend(page_leads[url])
+            if follow:
+                for link in page_links[url]:
+                    _visit(link, origin[url], next_frontier)
+
+        if limit is not None and 0 <= limit <= collected:
+            break
+        frontier = next_frontier
+        depth += 1
+
+    if first_error is not None and not fetched_ok:
+        raise first_error
+    return result
+
+
+def crawl_seeds(
+    cfg: ProjectConfig,
+    seed_urls: Iterable[str],
+    fetch: Callable[[str], str],
+    parse: Callable[[str, str], list[Lead]],
+    client: HttpClient | None = None,
+) -> tuple[list[str], dict[str, list[Lead]], dict[str, str]]:
+    """Fetch every seed concurrently and parse each page as it arrives.
+
+    Returns the de-duplicated seed list, leads per seed and errors per seed.
+    Raises the first error only when every seed failed.
+    """
+    result = crawl_frontier(
+        cfg, seed_urls, fetch, lambda url, html: (parse(url, html), []), client=client
+    )
+    return result.seeds, result.leads_by_seed, result.errors
+
+
+def collect_leads(
+    seeds: list[str], leads_by_seed: dict[str, list[Lead]], limit: int | None
+) -> list[Lead]:
+    leads: list[Lead] = []
+    for seed in seeds:
+        leads.extend(leads_by_seed.get(seed, []))
+    if limit is not None and limit >= 0:
+        leads = leads[:limit]
+    return leads
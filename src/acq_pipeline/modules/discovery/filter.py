@@ -1,39 +1,49 @@
 from __future__ import annotations  # no installation needed
 
-import json  # no installation needed
+import time  # no installation needed
 from datetime import date  # no installation needed
+from itertools import islice  # no installation needed
 from pathlib import Path  # no installation needed
 from typing import Any  # no installation needed
 
 from ...config import ProjectConfig  # no installation needed
 from .filter_rules import score_text  # no installation needed
+from .lead_store import StageWriter, iter_stage, stage_exists  # no installation needed
+from .partition_manifest import (  # no installation needed
+    reusable_result,
+    write_partition_manifest,
+)
+from .payload_store import KEYWORDS_KEY, is_ref  # no installation needed
+from .storage import (  # no installation needed
+    DEFAULT_CHUNK_SIZE,
+    StorageSettings,
+    iter_ndjson,
+    write_ndjson as _write_records,
+)
 
 
 def load_ndjson(path: Path) -> list[dict]:
-    records: list[dict] = []
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            if not line.strip():
-                continue
-            record = json.loads(line)
-            if not isinstance(record, dict):
-                raise ValueError(f"NDJSON record must be a dict: {path}")
-            records.append(record)
-    return records
-
-
-def write_ndjson(path: Path, records: list[dict]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        for record in records:
-            f.write(json.dumps(record, ensure_ascii=True))
-            f.write("\n")
+    return list(iter_ndjson(path))
+
+
+def write_ndjson(
+    path: Path, records: list[dict], settings: StorageSettings | None = None
+) -> None:
+    _write_records(path, records, settings=settings)
 
 
 def _text_for_record(record: dict[str, Any]) -> str:
+    """Scored text: name, description and the raw payload.
+
+    A payload moved to the store is scored from the keywords saved next to
+    its reference, so a lead scores the same whether ``storage.raw_store`` is
+    on or off and the payload itself is never read here.
+    """
     company_name = record.get("company_name") or ""
     description = record.get("description") or ""
     raw = record.get("raw") or {}
+    if is_ref(raw):
+        raw = " ".join(raw.get(KEYWORDS_KEY) or [])
     return f"{company_name} {description} {raw}".lower()
 
 
@@ -58,17 +68,22 @@ def filter_records(
     return kept, rejected
 
 
-def run_filter(cfg: ProjectConfig, run_date: date, threshold: int = 2) -> dict:
+def run_filter(
+    cfg: ProjectConfig, run_date: date, threshold: int = 2, reuse: bool = False
+) -> dict:
+    """Score merged leads into candidates and rejected partitions.
+
+    With ``reuse`` the recorded result is returned when both partition
+    manifests show the same threshold and merged input.
+    """
+    started = time.perf_counter()
     run_date_str = run_date.isoformat()
     input_path = (
         cfg.paths.data_dir / "interim" / "merged" / run_date_str / "leads.ndjson"
     )
-    if not input_path.exists():
+    if not stage_exists(cfg, "merged", run_date_str, input_path):
         raise FileNotFoundError(f"Missing merged input: {input_path}")
 
-    records = load_ndjson(input_path)
-    kept, rejected = filter_records(records, threshold=threshold)
-
     candidates_path = (
         cfg.paths.data_dir
         / "processed"
@@ -83,13 +98,45 @@ def run_filter(cfg: ProjectConfig, run_date: date, threshold: int = 2) -> dict:
         / run_date_str
         / "leads.ndjson"
     )
-    write_ndjson(candidates_path, kept)
-    write_ndjson(rejected_path, rejected)
-
-    return {
-        "input_count": len(records),
-        "kept_count": len(kept),
-        "rejected_count": len(rejected),
-        "candidates_path": str(candidates_path),
-        "rejected_path": str(rejected_path),
+    params = {"threshold": threshold}
+    directories = [candidates_path.parent, rejected_path.parent]
+    if reuse:
+        previous = reusable_result(directories, params, [input_path])
+        if previous is not None:
+            return {**previous, "skipped": True}
+
+    input_count = 0
+    records = iter_stage(cfg, "merged", run_date_str, input_path)
+    with (
+        StageWriter(cfg, "candidates", run_date_str, candidates_path) as kept_writer,
+        StageWriter(cfg, "rejected", run_date_str, rejected_path) as rejected_writer,
+    ):
+        while batch := list(islice(records, DEFAULT_CHUNK_SIZE)):
+            input_count += len(batch)
+            kept, rejected = filter_records(batch, threshold=threshold)
+            kept_writer.write_many(kept)
+            rejected_writer.write_many(rejected)
+
+    payload = {
+        "input_count": input_count,
+        "kept_count": kept_writer.count,
+        "rejected_count": rejected_writer.count,
+        "candidates_path": str(kept_writer.path),
+        "rejected_path": str(rejected_writer.path),
     }
+    for stage, writer, directory in (
+        ("candidates", kept_writer, directories[0]),
+        ("rejected", rejected_writer, directories[1]),
+    ):
+        write_partition_manifest(
+            directory,
+            stage,
+            run_date_str,
+            outputs=writer.files,
+            record_count=writer.count,
+            started=started,
+            inputs=[input_path],
+            params=params,
+            result=payload,
+        )
+    return payload
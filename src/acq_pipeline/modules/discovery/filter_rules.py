@@ -39,6 +39,15 @@ NEGATIVE_KEYWORDS: dict[str, int] = {
 }
 
 
+def matched_keywords(text: str) -> list[str]:
+    """Positive and negative keywords that occur in ``text``."""
+    return [
+        keyword
+        for keyword in (*POSITIVE_KEYWORDS, *NEGATIVE_KEYWORDS)
+        if keyword in text
+    ]
+
+
 def score_text(text: str) -> tuple[int, list[str]]:
     score = 0
     reasons: list[str] = []
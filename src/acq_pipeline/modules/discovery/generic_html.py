@@ -1,51 +1,42 @@
 from __future__ import annotations  # no installation needed
 
 from datetime import date, datetime, timezone  # no installation needed
-from pathlib import Path  # no installation needed
-from urllib.parse import unquote, urljoin, urlparse  # no installation needed
-
-import requests  # already in env; no new install
-from bs4 import BeautifulSoup  # already in env; no new install
+from urllib.parse import urljoin, urlparse  # no installation needed
 
 from ...config import ProjectConfig  # no installation needed
+from .fetch_pool import collect_leads, crawl_frontier  # no installation needed
+from .html_engine import (  # no installation needed
+    DEFAULT_ENGINE,
+    Node,
+    parser_engine,
+    select_attrs,
+    select_cards,
+)
+from .partition_manifest import reusable_result  # no installation needed
 from .schema import Lead  # no installation needed
-from .storage import write_leads  # no installation needed
-
-
-def _read_local_file(path: Path) -> str:
-    return path.read_text(encoding="utf-8")
-
-
-def _file_url_to_path(url: str) -> Path:
-    parsed = urlparse(url)
-    path = unquote(parsed.path or "")
-    if parsed.netloc and parsed.netloc.lower() != "localhost":
-        return Path(f"//{parsed.netloc}{path}")
-    if path.startswith("/") and len(path) >= 3 and path[2] == ":":
-        return Path(path.lstrip("/"))
-    return Path(path)
+from .storage import get_run_dir, write_leads  # no installation needed
+from .transport import (  # no installation needed
+    HttpClient,
+    get_client,
+    local_paths,
+    read_local_html,
+)
 
 
 def _is_http_url(url: str) -> bool:
     return urlparse(url).scheme in {"http", "https"}
 
 
-def fetch_html(url: str, timeout: int = 30) -> str:
-    if url.startswith("file://"):
-        path = _file_url_to_path(url)
-        if path.exists():
-            return _read_local_file(path)
-        raise FileNotFoundError(f"Local file not found: {path}")
+def fetch_html(
+    url: str, timeout: int | None = None, client: HttpClient | None = None
+) -> str:
+    local = read_local_html(url)
+    if local is not None:
+        return local
 
-    if "://" not in url:
-        path = Path(url)
-        if path.exists():
-            return _read_local_file(path)
-
-    headers = {"User-Agent": "acq-pipeline/0.1 (+https://example.com)"}
-    response = requests.get(url, headers=headers, timeout=timeout)
-    response.raise_for_status()
-    return response.text
+    if client is None:
+        client = get_client()
+    return client.fetch_text(url, timeout=timeout)
 
 
 def _utc_now_z() -> str:
@@ -66,15 +57,11 @@ def _split_selector(selector: str) -> tuple[str, str | None]:
     return selector, None
 
 
-def _extract_value(card: object, selector: str) -> str:
+def _extract_value(card: Node, selector: str) -> str:
     css_selector, attr = _split_selector(selector)
-    element = card.select_one(css_selector) if css_selector else None
-    if element is None:
-        return ""
     if attr:
-        value = element.get(attr)
-        return value.strip() if isinstance(value, str) else ""
-    return element.get_text(strip=True)
+        return (card.attr(css_selector, attr) or "").strip()
+    return card.text(css_selector) or ""
 
 
 def parse_directory_html(
@@ -82,6 +69,7 @@ def parse_directory_html(
     source: str,
     base_url: str | None,
     selectors: dict,
+    engine: str = DEFAULT_ENGINE,
 ) -> list[Lead]:
     if not isinstance(selectors, dict):
         raise ValueError("selectors must be a dict.")
@@ -91,8 +79,7 @@ def parse_directory_html(
         if key not in selectors:
             raise ValueError(f"Missing selector: {key}")
 
-    soup = BeautifulSoup(html, "html.parser")
-    cards = soup.select(str(selectors["card"]))
+    cards = select_cards(html, str(selectors["card"]), engine=engine)
     discovered_at = _utc_now_z()
     leads: list[Lead] = []
 
@@ -129,39 +116,129 @@ def parse_directory_html(
     return leads
 
 
+def extract_next_urls(
+    html: str, page_url: str, selector: str, engine: str = DEFAULT_ENGINE
+) -> list[str]:
+    css_selector, attr = _split_selector(selector)
+    hrefs = select_attrs(html, css_selector, attr or "href", engine=engine)
+    return [urljoin(page_url, href) for href in hrefs if not href.startswith("#")]
+
+
+def _optional_int(source_cfg: dict, key: str, default: int | None) -> int | None:
+    value = source_cfg.get(key, default)
+    if value is None:
+        return None
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"generic_html.{key} must be an integer.") from exc
+
+
 def run_generic_html(
     cfg: ProjectConfig,
     limit: int,
     run_date: date | None = None,
     seed_url: str | None = None,
+    overwrite: bool = False,
+    reuse: bool = False,
 ) -> dict[str, object]:
+    """Crawl the configured seeds into the ``generic_html`` raw partition.
+
+    With ``reuse`` the recorded result is returned while the config and the
+    local seed files are unchanged since the partition was written; a crawl
+    that follows ``next`` links always reruns.
+    """
     sources_cfg = cfg.sources.get("sources", cfg.sources)
     source_cfg = sources_cfg.get("generic_html")
     if not isinstance(source_cfg, dict):
         raise ValueError("Missing generic_html config.")
 
     seed_urls = source_cfg.get("seed_urls") or []
-    if seed_url is None:
-        if not seed_urls:
-            raise ValueError("generic_html.seed_urls must include at least one URL.")
-        seed_url = seed_urls[0]
+    if seed_url is not None:
+        seed_urls = [seed_url]
+    if not seed_urls:
+        raise ValueError("generic_html.seed_urls must include at least one URL.")
 
     selectors = source_cfg.get("selectors") or {}
-    base_url = source_cfg.get("base_url")
-    if base_url is None:
-        base_url = seed_url if _is_http_url(seed_url) else None
-
-    html = fetch_html(seed_url)
-    leads = parse_directory_html(
-        html, source="generic_html", base_url=base_url, selectors=selectors
+    configured_base_url = source_cfg.get("base_url")
+    engine = parser_engine(cfg)
+    next_selector = selectors.get("next") if isinstance(selectors, dict) else None
+    max_pages = _optional_int(source_cfg, "max_pages", 100)
+    max_depth = _optional_int(source_cfg, "max_depth", None)
+
+    if run_date is None:
+        run_date = date.today()
+    params = {
+        "source": "generic_html",
+        "mode": None,
+        "limit": limit,
+        "config": source_cfg,
+        "seed_urls": seed_urls,
+        "engine": engine,
+    }
+    # Pages reached through ``next`` links are not fingerprinted, so only a
+    # crawl confined to local seed files can be reused.
+    inputs = local_paths(seed_urls)
+    if reuse and inputs is not None and not next_selector:
+        run_dir = get_run_dir(cfg, "generic_html", run_date)
+        previous = reusable_result([run_dir], params, inputs)
+        if previous is not None:
+            return {**previous, "skipped": True}
+
+    def _parse(url: str, html: str) -> tuple[list[Lead], list[str]]:
+        base_url = configured_base_url
+        if base_url is None:
+            base_url = url if _is_http_url(url) else None
+        leads = parse_directory_html(
+            html,
+            source="generic_html",
+            base_url=base_url,
+            selectors=selectors,
+            engine=engine,
+        )
+        links: list[str] = []
+        if next_selector:
+            links = extract_next_urls(html, url, str(next_selector), engine=engine)
+        return leads, links
+
+    client = get_client(cfg)
+    cache_before = client.cache_counts()
+    throttled_before = client.throttled_seconds()
+    crawl = crawl_frontier(
+        cfg,
+        seed_urls,
+        lambda url: fetch_html(url, client=client),
+        _parse,
+        max_pages=max_pages,
+        max_depth=max_depth if next_selector else 0,
+        limit=limit,
+        client=client,
     )
-    if limit is not None and limit >= 0:
-        leads = leads[:limit]
+    seeds, leads_by_seed, errors = crawl.seeds, crawl.leads_by_seed, crawl.errors
+    leads = collect_leads(seeds, leads_by_seed, limit)
 
-    output_path = write_leads(cfg, "generic_html", leads, run_date=run_date)
-    return {
+    payload: dict[str, object] = {
         "source": "generic_html",
-        "url": seed_url,
+        "urls": seeds,
         "count": len(leads),
-        "output_path": str(output_path),
+        "seed_counts": {seed: len(leads_by_seed.get(seed, [])) for seed in seeds},
+        "pages_fetched": crawl.pages,
+        "http_cache": client.cache_counts(since=cache_before),
+        "throttled_seconds": client.throttled_seconds(since=throttled_before),
     }
+    if errors:
+        payload["seed_errors"] = errors
+    if crawl.dropped:
+        payload["pages_dropped"] = crawl.dropped
+    output_path = write_leads(
+        cfg,
+        "generic_html",
+        leads,
+        run_date=run_date,
+        overwrite=overwrite,
+        params=params,
+        inputs=inputs or (),
+        result=payload,
+    )
+    payload["output_path"] = str(output_path)
+    return payload
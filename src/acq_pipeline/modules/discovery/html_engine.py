@@ -0,0 +1,190 @@
+from __future__ import annotations  # no installation needed
+
+import re  # no installation needed
+from functools import lru_cache  # no installation needed
+from typing import Any, Protocol  # no installation needed
+
+import soupsieve  # already in env (bs4 dependency); no new install
+from bs4 import BeautifulSoup, SoupStrainer  # already in env; no new install
+
+from ...config import ProjectConfig  # no installation needed
+
+ENGINES = ("html.parser", "lxml", "lxml-raw")
+DEFAULT_ENGINE = "html.parser"
+
+# BeautifulSoup returns these attributes as lists, which the parsers treat as
+# missing; the raw lxml engine mirrors that so both engines emit equal leads.
+_MULTI_VALUED_ATTRS = {
+    "class",
+    "rel",
+    "rev",
+    "accept-charset",
+    "headers",
+    "accesskey",
+    "dropzone",
+}
+_SIMPLE_SELECTOR = re.compile(r"^([a-zA-Z][\w-]*)?(?:\.([\w-]+))?$")
+
+
+def parser_engine(cfg: ProjectConfig | None) -> str:
+    settings: Any = {}
+    if cfg is not None and isinstance(cfg.settings, dict):
+        settings = cfg.settings.get("parsing", {})
+    if not isinstance(settings, dict):
+        settings = {}
+    engine = settings.get("engine") or DEFAULT_ENGINE
+    return check_engine(str(engine))
+
+
+def check_engine(engine: str) -> str:
+    if engine not in ENGINES:
+        raise ValueError(
+            f"Unknown parser engine '{engine}'; expected one of {ENGINES}."
+        )
+    return engine
+
+
+class Node(Protocol):
+    def text(self, css: str) -> str | None: ...
+
+    def attr(self, css: str, name: str) -> str | None: ...
+
+    def texts(self, css: str) -> list[str]: ...
+
+
+@lru_cache(maxsize=256)
+def _soup_selector(css: str) -> Any:
+    return soupsieve.compile(css)
+
+
+class _SoupNode:
+    __slots__ = ("_tag",)
+
+    def __init__(self, tag: Any) -> None:
+        self._tag = tag
+
+    def _first(self, css: str) -> Any:
+        return _soup_selector(css).select_one(self._tag) if css else None
+
+    def text(self, css: str) -> str | None:
+        element = self._first(css)
+        return element.get_text(strip=True) if element is not None else None
+
+    def attr(self, css: str, name: str) -> str | None:
+        element = self._first(css)
+        if element is None:
+            return None
+        value = element.get(name)
+        return value if isinstance(value, str) else ""
+
+    def texts(self, css: str) -> list[str]:
+        elements = _soup_selector(css).select(self._tag)
+        return [el.get_text(strip=True) for el in elements]
+
+
+def _strainer_for(card_selector: str) -> SoupStrainer | None:
+    """Restrict parsing to card subtrees when the card selector is ``tag.class``."""
+    match = _SIMPLE_SELECTOR.match(card_selector.strip())
+    if not match or not any(match.groups()):
+        return None
+    name, class_name = match.groups()
+    if class_name:
+        return SoupStrainer(name, class_=class_name)
+    return SoupStrainer(name)
+
+
+@lru_cache(maxsize=256)
+def _lxml_selector(css: str, prefix: str = "descendant::") -> Any:
+    """Precompile ``css`` to an XPath; ``descendant::`` matches like ``select``."""
+    from cssselect import HTMLTranslator  # requirements/base.txt; lxml-raw only
+    from lxml import etree  # already in env; no new install
+
+    return etree.XPath(HTMLTranslator().css_to_xpath(css, prefix=prefix))
+
+
+@lru_cache(maxsize=1)
+def _lxml_text_xpath() -> Any:
+    from lxml import etree  # already in env; no new install
+
+    # Same strings BeautifulSoup.get_text yields: no comments, script or style.
+    return etree.XPath(
+        "descendant-or-self::text()[not(parent::script) and not(parent::style)]"
+    )
+
+
+def _lxml_text(element: Any) -> str:
+    return "".join(part.strip() for part in _lxml_text_xpath()(element))
+
+
+class _LxmlNode:
+    __slots__ = ("_element",)
+
+    def __init__(self, element: Any) -> None:
+        self._element = element
+
+    def _first(self, css: str) -> Any:
+        if not css:
+            return None
+        matches = _lxml_selector(css)(self._element)
+        return matches[0] if matches else None
+
+    def text(self, css: str) -> str | None:
+        element = self._first(css)
+        return _lxml_text(element) if element is not None else None
+
+    def attr(self, css: str, name: str) -> str | None:
+        element = self._first(css)
+        if element is None:
+            return None
+        if name.lower() in _MULTI_VALUED_ATTRS:
+            return ""
+        value = element.get(name)
+        return value if isinstance(value, str) else ""
+
+    def texts(self, css: str) -> list[str]:
+        return [_lxml_text(el) for el in _lxml_selector(css)(self._element)]
+
+
+def _lxml_root(html: str) -> Any:
+    import lxml.html  # already in env; no new install
+
+    try:
+        return lxml.html.fromstring(html)
+    except ValueError:
+        # Unicode input with an XML encoding declaration must go in as bytes.
+        parser = lxml.html.HTMLParser(encoding="utf-8")
+        return lxml.html.fromstring(html.encode("utf-8"), parser=parser)
+
+
+def select_cards(
+    html: str, card_selector: str, engine: str = DEFAULT_ENGINE
+) -> list[Node]:
+    """Parse ``html`` with ``engine`` and return one node per matching card."""
+    engine = check_engine(engine)
+    if engine == "lxml-raw":
+        if not html.strip():
+            return []
+        selector = _lxml_selector(card_selector, prefix="descendant-or-self::")
+        return [_LxmlNode(el) for el in selector(_lxml_root(html))]
+
+    soup = BeautifulSoup(html, engine, parse_only=_strainer_for(card_selector))
+    return [_SoupNode(tag) for tag in _soup_selector(card_selector).select(soup)]
+
+
+def select_attrs(
+    html: str, css: str, name: str, engine: str = DEFAULT_ENGINE
+) -> list[str]:
+    """Return the non-empty ``name`` attribute of every element matching ``css``."""
+    engine = check_engine(engine)
+    if not html.strip():
+        return []
+    if engine == "lxml-raw":
+        elements = _lxml_selector(css, prefix="descendant-or-self::")(_lxml_root(html))
+    else:
+        elements = _soup_selector(css).select(BeautifulSoup(html, engine))
+    values: list[str] = []
+    for element in elements:
+        value = element.get(name)
+        if isinstance(value, str) and value.strip():
+            values.append(value.strip())
+    return values
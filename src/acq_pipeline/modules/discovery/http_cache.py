@@ -0,0 +1,215 @@
+from __future__ import annotations  # no installation needed
+
+import hashlib  # no installation needed
+import json  # no installation needed
+import os  # no installation needed
+import threading  # no installation needed
+import time  # no installation needed
+from dataclasses import dataclass  # no installation needed
+from pathlib import Path  # no installation needed
+from typing import Any, Mapping  # no installation needed
+
+from ...config import ProjectConfig  # no installation needed
+
+
+@dataclass(frozen=True)
+class CacheSettings:
+    """Response cache options read from ``settings.yaml`` ``http_cache``."""
+
+    root: Path
+    enabled: bool = True
+    ttl_seconds: int = 3600
+    max_bytes: int = 256 * 1024 * 1024
+
+
+def cache_settings(cfg: ProjectConfig) -> CacheSettings:
+    settings: Any = {}
+    if isinstance(cfg.settings, dict):
+        settings = cfg.settings.get("http_cache", {})
+    if not isinstance(settings, dict):
+        settings = {}
+
+    def _get_int(key: str, default: int) -> int:
+        value = settings.get(key, default)
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    cache_dir = settings.get("dir") or "cache/http"
+    return CacheSettings(
+        root=cfg.paths.data_dir / str(cache_dir),
+        enabled=bool(settings.get("enabled", True)),
+        ttl_seconds=max(0, _get_int("ttl_seconds", 3600)),
+        max_bytes=max(0, _get_int("max_mb", 256)) * 1024 * 1024,
+    )
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    url: str
+    stored_at: float
+    last_access: float
+    size: int
+    encoding: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "url": self.url,
+            "stored_at": self.stored_at,
+            "last_access": self.last_access,
+            "size": self.size,
+            "encoding": self.encoding,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+        }
+
+
+class HttpCache:
+    """Persistent GET response cache with validators, TTL and LRU eviction.
+
+    Bodies live in ``<root>/bodies/<sha256(url)>.body`` with their metadata in
+    a ``.json`` file next to them. A hit or miss rewrites only that entry's
+    metadata, so the cost per request does not grow with the cache and
+    processes sharing the directory don't overwrite each other's entries.
+    Fresh entries are served without a request; stale entries with an
+    ETag/Last-Modified are revalidated with a conditional GET.
+    """
+
+    def __init__(self, root: Path, ttl_seconds: int = 3600, max_bytes: int = 0):
+        self.root = root
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0}
+        self._lock = threading.Lock()
+        self._entries: dict[str, CacheEntry] = self._load_entries()
+
+    def _body_path(self, key: str) -> Path:
+        return self.root / "bodies" / f"{key}.body"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.root / "bodies" / f"{key}.json"
+
+    def _read_meta(self, key: str) -> CacheEntry | None:
+        try:
+            item = json.loads(self._meta_path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(item, dict):
+            return None
+        try:
+            return CacheEntry(key=key, **item)
+        except TypeError:
+            return None
+
+    def _write_meta(self, entry: CacheEntry) -> None:
+        meta_path = self._meta_path(entry.key)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = meta_path.with_name(f"{entry.key}.json.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(entry.to_dict(), sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, meta_path)
+
+    def _load_entries(self) -> dict[str, CacheEntry]:
+        entries: dict[str, CacheEntry] = {}
+        for meta_path in sorted((self.root / "bodies").glob("*.json")):
+            entry = self._read_meta(meta_path.stem)
+            if entry is not None:
+                entries[entry.key] = entry
+        return entries
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def lookup(self, url: str) -> CacheEntry | None:
+        key = self.key_for(url)
+        with self._lock:
+            # Another process may have stored it since this cache was opened.
+            entry = self._entries.get(key) or self._read_meta(key)
+            if entry is None:
+                return None
+            if not self._body_path(key).exists():
+                self._entries.pop(key, None)
+                self._meta_path(key).unlink(missing_ok=True)
+                return None
+            self._entries[key] = entry
+            return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.stored_at < self.ttl_seconds
+
+    @staticmethod
+    def conditional_headers(entry: CacheEntry | None) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def read(self, entry: CacheEntry, revalidated: bool = False) -> str:
+        body = self._body_path(entry.key).read_bytes()
+        with self._lock:
+            now = time.time()
+            entry.last_access = now
+            if revalidated:
+                entry.stored_at = now
+                self.stats["revalidated"] += 1
+            self.stats["hits"] += 1
+            self._write_meta(entry)
+        return body.decode(entry.encoding or "utf-8", errors="replace")
+
+    def store(
+        self,
+        url: str,
+        content: bytes,
+        encoding: str | None,
+        headers: Mapping[str, str],
+    ) -> None:
+        cache_control = (headers.get("Cache-Control") or "").lower()
+        with self._lock:
+            self.stats["misses"] += 1
+            if "no-store" in cache_control:
+                return
+            key = self.key_for(url)
+            body_path = self._body_path(key)
+            body_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = body_path.with_name(f"{key}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(content)
+            os.replace(tmp_path, body_path)
+            now = time.time()
+            entry = self._entries[key] = CacheEntry(
+                key=key,
+                url=url,
+                stored_at=now,
+                last_access=now,
+                size=len(content),
+                encoding=encoding,
+                etag=headers.get("ETag"),
+                last_modified=headers.get("Last-Modified"),
+            )
+            self._write_meta(entry)
+            self._evict()
+
+    def _evict(self) -> None:
+        if self.max_bytes <= 0:
+            return
+        total = sum(entry.size for entry in self._entries.values())
+        if total <= self.max_bytes:
+            return
+        for entry in sorted(self._entries.values(), key=lambda item: item.last_access):
+            if total <= self.max_bytes:
+                break
+            self._body_path(entry.key).unlink(missing_ok=True)
+            self._meta_path(entry.key).unlink(missing_ok=True)
+            del self._entries[entry.key]
+            total -= entry.size
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
@@ -0,0 +1,30 @@
+from __future__ import annotations  # no installation needed
+
+from .domains import canonical_url, website_key  # no installation needed
+
+# Bumped whenever dedup_key changes; stores keyed by it compare this to tell
+# stale keys (see offset_index, merge_state and the ``discovery rekey`` command).
+KEY_VERSION = 3
+
+
+def normalize_url(s: str) -> str:
+    """Canonical form of ``s`` (see ``domains.canonical_url``); memoized."""
+    return canonical_url(s)
+
+
+def dedup_key(rec: dict) -> str:
+    return fields_key(rec.get("website"), rec.get("source_url"), rec.get("company_name"))
+
+
+def fields_key(website: object, source_url: object, company_name: object) -> str:
+    """``dedup_key`` from the three identity fields, for callers without a dict."""
+    if isinstance(website, str) and website.strip():
+        return website_key(website)
+
+    if isinstance(source_url, str) and source_url.strip():
+        return normalize_url(source_url)
+
+    if isinstance(company_name, str) and company_name.strip():
+        return company_name.strip().lower()
+
+    return ""
@@ -0,0 +1,527 @@
+from __future__ import annotations  # no installation needed
+
+import json  # no installation needed
+import sqlite3  # no installation needed
+import uuid  # no installation needed
+from contextlib import ExitStack  # no installation needed
+from pathlib import Path  # no installation needed
+from types import TracebackType  # no installation needed
+from typing import Any, Iterable, Iterator  # no installation needed
+
+from ...config import ProjectConfig  # no installation needed
+from .keys import dedup_key  # no installation needed
+from .offset_index import open_offset_index  # no installation needed
+from .schema import Lead  # no installation needed
+from .storage import (  # no installation needed
+    JsonDecoder,
+    NdjsonWriter,
+    StorageSettings,
+    find_ndjson,
+    iter_ndjson,
+    json_decoder,
+    storage_settings,
+)
+
+STAGES = ("raw", "merged", "candidates", "rejected")
+INSERT_BATCH_SIZE = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    id INTEGER PRIMARY KEY,
+    stage TEXT NOT NULL,
+    run_date TEXT NOT NULL,
+    source TEXT NOT NULL,
+    dedup_key TEXT NOT NULL,
+    company_name TEXT,
+    website TEXT,
+    filter_score INTEGER,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_leads_dedup_key ON leads (dedup_key);
+CREATE INDEX IF NOT EXISTS idx_leads_source ON leads (source, run_date);
+CREATE INDEX IF NOT EXISTS idx_leads_partition ON leads (stage, run_date, source);
+CREATE INDEX IF NOT EXISTS idx_leads_score ON leads (stage, run_date, filter_score);
+CREATE TABLE IF NOT EXISTS partitions (
+    stage TEXT NOT NULL,
+    run_date TEXT NOT NULL,
+    source TEXT NOT NULL,
+    PRIMARY KEY (stage, run_date, source)
+);
+"""
+
+
+def store_path(cfg: ProjectConfig, settings: StorageSettings | None = None) -> Path:
+    settings = settings or storage_settings(cfg)
+    return cfg.paths.data_dir / settings.sqlite_path
+
+
+def _check_stage(stage: str) -> str:
+    if stage not in STAGES:
+        raise ValueError(f"Unknown lead stage '{stage}'; expected one of {STAGES}.")
+    return stage
+
+
+def _row(stage: str, run_date: str, source: str | None, record: dict) -> tuple:
+    score = record.get("filter_score")
+    return (
+        stage,
+        run_date,
+        source or str(record.get("source") or ""),
+        dedup_key(record),
+        record.get("company_name"),
+        record.get("website"),
+        score if isinstance(score, int) else None,
+        json.dumps(record, ensure_ascii=False),
+    )
+
+
+class LeadStore:
+    """SQLite lead table, one row per lead per stage partition.
+
+    A partition is ``(stage, run_date, source)``; the full record is kept as
+    JSON next to indexed columns for the dedup key, source, run date and
+    filter score. Written partitions are also listed in ``partitions`` so an
+    empty one still counts as present, like an empty NDJSON file. The
+    database runs in WAL mode so readers never block the writer, and inserts
+    go through ``executemany`` in one transaction.
+    """
+
+    def __init__(self, path: Path, decoder: JsonDecoder | None = None) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._decode = decoder or json_decoder()
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> LeadStore:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @staticmethod
+    def _where(
+        stage: str, run_date: str, sources: Iterable[str] | None
+    ) -> tuple[str, list[Any]]:
+        clause = "stage = ? AND run_date = ?"
+        params: list[Any] = [_check_stage(stage), run_date]
+        if sources is not None:
+            names = list(sources)
+            clause += f" AND source IN ({', '.join('?' for _ in names)})"
+            params.extend(names)
+        return clause, params
+
+    def write(
+        self,
+        stage: str,
+        run_date: str,
+        records: Iterable[dict],
+        source: str | None = None,
+        replace: bool = True,
+    ) -> int:
+        """Insert ``records`` into a partition, replacing it unless ``replace=False``.
+
+        ``source`` labels every row; without it each record's own source is used.
+        """
+        with self._conn:
+            self._register(stage, run_date, source, replace)
+            return self._insert_records(stage, run_date, source, records)
+
+    def stage_rows(
+        self,
+        token: str,
+        run_date: str,
+        records: Iterable[dict],
+        source: str | None = None,
+    ) -> int:
+        """Insert ``records`` under the staging ``token``, unseen until ``publish``."""
+        with self._conn:
+            return self._insert_records(token, run_date, source, records)
+
+    def publish(
+        self,
+        token: str,
+        stage: str,
+        run_date: str,
+        source: str | None = None,
+        replace: bool = True,
+    ) -> None:
+        """Move the rows staged under ``token`` into a partition in one transaction."""
+        with self._conn:
+            self._register(stage, run_date, source, replace)
+            self._conn.execute("UPDATE leads SET stage = ? WHERE stage = ?", (stage, token))
+
+    def discard(self, token: str) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM leads WHERE stage = ?", (token,))
+
+    def _register(
+        self, stage: str, run_date: str, source: str | None, replace: bool
+    ) -> None:
+        clause, params = self._where(
+            stage, run_date, [source] if source is not None else None
+        )
+        if replace:
+            self._conn.execute(f"DELETE FROM leads WHERE {clause}", params)
+            self._conn.execute(f"DELETE FROM partitions WHERE {clause}", params)
+        self._conn.execute(
+            "INSERT OR IGNORE INTO partitions (stage, run_date, source) "
+            "VALUES (?, ?, ?)",
+            (stage, run_date, source or ""),
+        )
+
+    def _insert_records(
+        self, stage: str, run_date: str, source: str | None, records: Iterable[dict]
+    ) -> int:
+        written = 0
+        batch: list[tuple] = []
+        for record in records:
+            batch.append(_row(stage, run_date, source, record))
+            if len(batch) >= INSERT_BATCH_SIZE:
+                self._insert(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            self._insert(batch)
+            written += len(batch)
+        return written
+
+    def _insert(self, rows: list[tuple]) -> None:
+        self._conn.executemany(
+            "INSERT INTO leads (stage, run_date, source, dedup_key, company_name, "
+            "website, filter_score, record) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def truncate(
+        self, stage: str, run_date: str, source: str | None, keep: int
+    ) -> int:
+        """Delete all but the first ``keep`` rows of a partition; returns rows deleted."""
+        clause, params = self._where(
+            stage, run_date, [source] if source is not None else None
+        )
+        with self._conn:
+            cursor = self._conn.execute(
+                f"DELETE FROM leads WHERE id IN (SELECT id FROM leads WHERE {clause} "
+                "ORDER BY id LIMIT -1 OFFSET ?)",
+                [*params, max(keep, 0)],
+            )
+        return cursor.rowcount
+
+    def has_partition(
+        self, stage: str, run_date: str, source: str | None = None
+    ) -> bool:
+        clause, params = self._where(
+            stage, run_date, [source] if source is not None else None
+        )
+        row = self._conn.execute(
+            f"SELECT 1 FROM partitions WHERE {clause} LIMIT 1", params
+        ).fetchone()
+        return row is not None
+
+    def count(
+        self, stage: str, run_date: str, sources: Iterable[str] | None = None
+    ) -> int:
+        clause, params = self._where(stage, run_date, sources)
+        row = self._conn.execute(
+            f"SELECT COUNT(*) FROM leads WHERE {clause}", params
+        ).fetchone()
+        return int(row[0])
+
+    def iter_records(
+        self,
+        stage: str,
+        run_date: str,
+        sources: Iterable[str] | None = None,
+        min_score: int | None = None,
+        limit: int | None = None,
+    ) -> Iterator[dict]:
+        """Yield a partition's records in insertion order via the partition index."""
+        clause, params = self._where(stage, run_date, sources)
+        if min_score is not None:
+            clause += " AND filter_score >= ?"
+            params.append(min_score)
+        sql = f"SELECT record FROM leads WHERE {clause} ORDER BY id"
+        if limit is not None and limit >= 0:
+            sql += " LIMIT ?"
+            params.append(limit)
+        for (text,) in self._conn.execute(sql, params):
+            yield self._decode(text)
+
+    def find(self, stage: str, run_date: str, key: str) -> list[dict]:
+        """A partition's records with dedup key ``key``, via the key index."""
+        clause, params = self._where(stage, run_date, None)
+        rows = self._conn.execute(
+            f"SELECT record FROM leads WHERE dedup_key = ? AND {clause} ORDER BY id",
+            [key, *params],
+        )
+        return [self._decode(text) for (text,) in rows]
+
+    def history(self, key: str) -> list[dict[str, object]]:
+        """Every stored appearance of a dedup key, oldest run first."""
+        rows = self._conn.execute(
+            "SELECT run_date, stage, source, company_name, website, filter_score "
+            f"FROM leads WHERE dedup_key = ? AND stage IN ({', '.join('?' for _ in STAGES)}) "
+            "ORDER BY run_date, id",
+            (key, *STAGES),
+        )
+        columns = ("run_date", "stage", "source", "company_name", "website", "filter_score")
+        return [dict(zip(columns, row)) for row in rows]
+
+    def run_dates(self, stage: str) -> list[str]:
+        rows = self._conn.execute(
+            "SELECT DISTINCT run_date FROM partitions WHERE stage = ? ORDER BY run_date",
+            (_check_stage(stage),),
+        )
+        return [run_date for (run_date,) in rows]
+
+    def rekey(self) -> int:
+        """Recompute every row's dedup key from its record; returns the rows changed."""
+        with self._conn:
+            rows = self._conn.execute("SELECT id, dedup_key, record FROM leads")
+            batch: list[tuple[str, int]] = []
+            for row_id, key, text in rows:
+                new_key = dedup_key(self._decode(text))
+                if new_key != key:
+                    batch.append((new_key, row_id))
+            for start in range(0, len(batch), INSERT_BATCH_SIZE):
+                self._conn.executemany(
+                    "UPDATE leads SET dedup_key = ? WHERE id = ?",
+                    batch[start : start + INSERT_BATCH_SIZE],
+                )
+        return len(batch)
+
+
+def open_store(cfg: ProjectConfig, settings: StorageSettings | None = None) -> LeadStore:
+    settings = settings or storage_settings(cfg)
+    return LeadStore(
+        store_path(cfg, settings), decoder=json_decoder(settings.json_decoder)
+    )
+
+
+class StageWriter:
+    """Write one stage partition to NDJSON, SQLite or both per ``storage.backend``.
+
+    Mirrors ``NdjsonWriter``: ``write``/``write_many``, ``count`` and ``path``
+    (the NDJSON file when one is written, else the database). SQLite rows are
+    staged under a private key and published in one transaction on a clean
+    exit, so an error leaves the stored partition as it was, like the NDJSON
+    file.
+    """
+
+    def __init__(
+        self,
+        cfg: ProjectConfig,
+        stage: str,
+        run_date: str,
+        path: Path,
+        source: str | None = None,
+        append: bool = False,
+        settings: StorageSettings | None = None,
+    ) -> None:
+        self.settings = settings or storage_settings(cfg)
+        self.stage = _check_stage(stage)
+        self.run_date = run_date
+        self.source = source
+        self.append = append
+        self.count = 0
+        self.path = path
+        self._cfg = cfg
+        self._ndjson_path = path
+        self._ndjson: NdjsonWriter | None = None
+        self._store: LeadStore | None = None
+        self._batch: list[dict] = []
+        self._staging = f"~{uuid.uuid4().hex}"
+        self._stack = ExitStack()
+
+    def __enter__(self) -> StageWriter:
+        if self.settings.uses_ndjson:
+            self._ndjson = self._stack.enter_context(
+                NdjsonWriter(
+                    self._ndjson_path,
+                    append=self.append,
+                    fsync=self.settings.fsync,
+                    buffer_size=self.settings.buffer_size,
+                    compression=self.settings.compression,
+                    index=self.settings.offset_index,
+                )
+            )
+            self.path = self._ndjson.path
+        if self.settings.uses_sqlite:
+            self._store = self._stack.enter_context(open_store(self._cfg, self.settings))
+            if self._ndjson is None:
+                self.path = self._store.path
+        return self
+
+    @property
+    def files(self) -> list[Path]:
+        """The NDJSON file written, if any (empty with ``backend: sqlite``)."""
+        return [self._ndjson.path] if self._ndjson is not None else []
+
+    def write(self, record: dict[str, Any]) -> None:
+        if self._ndjson is not None:
+            self._ndjson.write(record)
+        if self._store is not None:
+            self._batch.append(record)
+            if len(self._batch) >= INSERT_BATCH_SIZE:
+                self._flush()
+        self.count += 1
+
+    def write_many(self, records: Iterable[dict[str, Any]]) -> int:
+        for record in records:
+            self.write(record)
+        return self.count
+
+    def write_lead(self, lead: Lead) -> None:
+        if self._ndjson is not None:
+            self._ndjson.write_lead(lead)
+        if self._store is not None:
+            self._batch.append(lead.to_dict())
+            if len(self._batch) >= INSERT_BATCH_SIZE:
+                self._flush()
+        self.count += 1
+
+    def write_many_leads(self, leads: Iterable[Lead]) -> int:
+        for lead in leads:
+            self.write_lead(lead)
+        return self.count
+
+    def _flush(self) -> None:
+        if self._store is not None and self._batch:
+            self._store.stage_rows(
+                self._staging, self.run_date, self._batch, source=self.source
+            )
+        self._batch = []
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        try:
+            if exc_type is None:
+                self._flush()
+                if self._store is not None:
+                    self._store.publish(
+                        self._staging,
+                        self.stage,
+                        self.run_date,
+                        source=self.source,
+                        replace=not self.append,
+                    )
+        except BaseException as error:
+            exc_type, exc, tb = type(error), error, error.__traceback__
+            raise
+        finally:
+            try:
+                if exc_type is not None and self._store is not None:
+                    self._store.discard(self._staging)
+            finally:
+                self._stack.__exit__(exc_type, exc, tb)
+
+
+def _stored(
+    cfg: ProjectConfig,
+    settings: StorageSettings,
+    stage: str,
+    run_date: str,
+    source: str | None,
+) -> LeadStore | None:
+    if not settings.uses_sqlite or not store_path(cfg, settings).exists():
+        return None
+    store = open_store(cfg, settings)
+    if store.has_partition(stage, run_date, source):
+        return store
+    store.close()
+    return None
+
+
+def stage_exists(
+    cfg: ProjectConfig,
+    stage: str,
+    run_date: str,
+    path: Path,
+    source: str | None = None,
+) -> bool:
+    settings = storage_settings(cfg)
+    store = _stored(cfg, settings, stage, run_date, source)
+    if store is not None:
+        store.close()
+        return True
+    return find_ndjson(path) is not None
+
+
+def iter_stage(
+    cfg: ProjectConfig,
+    stage: str,
+    run_date: str,
+    path: Path,
+    source: str | None = None,
+    limit: int | None = None,
+) -> Iterator[dict]:
+    """Stream a partition from SQLite when it is stored there, else from ``path``."""
+    settings = storage_settings(cfg)
+    store = _stored(cfg, settings, stage, run_date, source)
+    if store is not None:
+        with store:
+            sources = [source] if source is not None else None
+            yield from store.iter_records(stage, run_date, sources=sources, limit=limit)
+        return
+    for index, record in enumerate(
+        iter_ndjson(path, decoder=json_decoder(settings.json_decoder))
+    ):
+        if limit is not None and 0 <= limit <= index:
+            return
+        yield record
+
+
+def count_stage(
+    cfg: ProjectConfig, stage: str, run_date: str, path: Path
+) -> int | None:
+    """Partition size from the store or an offset sidecar; ``None`` needs a scan."""
+    settings = storage_settings(cfg)
+    store = _stored(cfg, settings, stage, run_date, None)
+    if store is not None:
+        with store:
+            return store.count(stage, run_date)
+    index = open_offset_index(find_ndjson(path))
+    if index is None:
+        return None
+    with index:
+        return len(index)
+
+
+def find_in_stage(
+    cfg: ProjectConfig, stage: str, run_date: str, path: Path, key: str
+) -> list[dict]:
+    """A partition's records with dedup key ``key``.
+
+    Uses the store's key index or the NDJSON offset sidecar, and only scans
+    the file when neither is available (e.g. a compressed partition).
+    """
+    settings = storage_settings(cfg)
+    decoder = json_decoder(settings.json_decoder)
+    store = _stored(cfg, settings, stage, run_date, None)
+    if store is not None:
+        with store:
+            return store.find(stage, run_date, key)
+    index = open_offset_index(find_ndjson(path), decode=decoder)
+    if index is not None:
+        with index:
+            return index.find(key)
+    return [
+        record
+        for record in iter_ndjson(path, decoder=decoder)
+        if dedup_key(record) == key
+    ]
@@ -1,89 +1,222 @@
 from __future__ import annotations  # no installation needed
 
+import heapq  # no installation needed
 import json  # no installation needed
+import pickle  # no installation needed
+import struct  # no installation needed
+import tempfile  # no installation needed
+import time  # no installation needed
+from contextlib import ExitStack  # no installation needed
+from dataclasses import asdict, dataclass, replace  # no installation needed
 from datetime import date  # no installation needed
 from pathlib import Path  # no installation needed
-from urllib.parse import parse_qsl, urlencode, urlparse  # no installation needed
+from typing import Any, Iterator  # no installation needed
 
 from ...config import ProjectConfig  # no installation needed
+from .entity_resolution import (  # no installation needed
+    EntitySettings,
+    entity_settings,
+    iter_fused,
+    resolve_entities,
+)
+from .keys import (  # noqa: F401 (normalize_url re-exported)
+    KEY_VERSION,
+    dedup_key,
+    normalize_url,
+)
+from .lead_store import (  # no installation needed
+    StageWriter,
+    iter_stage,
+    open_store,
+    stage_exists,
+    store_path,
+)
+from .merge_state import (  # no installation needed
+    Mark,
+    MergeState,
+    merge_state_path,
+    open_merge_state,
+)
+from .near_dup import (  # no installation needed
+    find_near_duplicates,
+    near_dup_params,
+    near_dup_settings,
+)
+from .partition_manifest import (  # no installation needed
+    reusable_result,
+    write_partition_manifest,
+)
+from .seen_index import SeenIndex, open_seen_index  # no installation needed
+from .storage import (  # no installation needed
+    DEFAULT_BUFFER_SIZE,
+    StorageSettings,
+    append_records,
+    compressed_path,
+    find_leads_path,
+    find_ndjson,
+    iter_ndjson,
+    json_decoder,
+    partition_lock,
+    storage_settings,
+)
+
+# key length, sequence number, pickled record length
+_RUN_HEADER = struct.Struct("<IQI")
+# Rough per-entry cost of the tuple, key and bytes objects in a run buffer.
+_ENTRY_OVERHEAD = 160
+
+
+@dataclass(frozen=True)
+class MergeSettings:
+    """Merge options read from ``settings.yaml`` ``merge``."""
+
+    spill: bool = False
+    memory_mb: float = 512.0
+    tmp_dir: str = "tmp/merge"
+    incremental: bool = False
+
+    @property
+    def memory_bytes(self) -> int:
+        return max(1, int(self.memory_mb * 1024 * 1024))
+
+
+def merge_settings(cfg: ProjectConfig) -> MergeSettings:
+    settings: Any = {}
+    if isinstance(cfg.settings, dict):
+        settings = cfg.settings.get("merge", {})
+    if not isinstance(settings, dict):
+        settings = {}
+    defaults = MergeSettings()
+    try:
+        memory_mb = float(settings.get("memory_mb", defaults.memory_mb))
+    except (TypeError, ValueError):
+        memory_mb = defaults.memory_mb
+    return MergeSettings(
+        spill=bool(settings.get("spill", defaults.spill)),
+        memory_mb=memory_mb if memory_mb > 0 else defaults.memory_mb,
+        tmp_dir=str(settings.get("tmp_dir") or defaults.tmp_dir),
+        incremental=bool(settings.get("incremental", defaults.incremental)),
+    )
 
 
 def read_ndjson(path: Path) -> list[dict]:
-    records: list[dict] = []
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            if not line.strip():
-                continue
-            record = json.loads(line)
-            if not isinstance(record, dict):
-                raise ValueError(f"NDJSON record must be a dict: {path}")
-            records.append(record)
-    return records
+    return list(iter_ndjson(path))
 
 
-def normalize_url(s: str) -> str:
-    value = s.strip().lower()
-    if not value:
-        return ""
+def _read_run(path: Path) -> Iterator[tuple[str, int, bytes]]:
+    with path.open("rb", buffering=DEFAULT_BUFFER_SIZE) as f:
+        while header := f.read(_RUN_HEADER.size):
+            key_len, seq, blob_len = _RUN_HEADER.unpack(header)
+            key = f.read(key_len).decode("utf-8")
+            yield key, seq, f.read(blob_len)
 
-    parsed = urlparse(value)
-    if not parsed.scheme:
-        parsed = urlparse(f"http://{value}")
 
-    query_pairs = [
-        (key, val)
-        for key, val in parse_qsl(parsed.query, keep_blank_values=True)
-        if not key.startswith("utm_")
-    ]
-    query = urlencode(query_pairs)
-    path = parsed.path.rstrip("/")
-    base = f"{parsed.netloc}{path}"
-    return f"{base}?{query}" if query else base
+class _RunSorter:
+    """Sort ``(key, seq, blob)`` entries by key, then seq, within a memory budget.
 
+    Entries are buffered until their estimated size reaches ``budget`` bytes,
+    then sorted and spilled as a run file under ``directory``. ``merged`` yields
+    everything in order through a k-way ``heapq.merge`` of the runs. Sequence
+    numbers are unique, so blobs are never compared.
+    """
 
-def dedup_key(rec: dict) -> str:
-    website = rec.get("website")
-    if isinstance(website, str) and website.strip():
-        return normalize_url(website)
+    def __init__(self, directory: Path, name: str, budget: int) -> None:
+        self.directory = directory
+        self.name = name
+        self.budget = budget
+        self.runs: list[Path] = []
+        self._buffer: list[tuple[str, int, bytes]] = []
+        self._size = 0
 
-    source_url = rec.get("source_url")
-    if isinstance(source_url, str) and source_url.strip():
-        return normalize_url(source_url)
+    def add(self, key: str, seq: int, blob: bytes) -> None:
+        self._buffer.append((key, seq, blob))
+        self._size += len(key) + len(blob) + _ENTRY_OVERHEAD
+        if self._size >= self.budget:
+            self._spill()
 
-    company_name = rec.get("company_name")
-    if isinstance(company_name, str) and company_name.strip():
-        return company_name.strip().lower()
+    def _spill(self) -> None:
+        self._buffer.sort()
+        path = self.directory / f"{self.name}-{len(self.runs):05d}.run"
+        with path.open("wb", buffering=DEFAULT_BUFFER_SIZE) as f:
+            for key, seq, blob in self._buffer:
+                encoded = key.encode("utf-8")
+                f.write(_RUN_HEADER.pack(len(encoded), seq, len(blob)))
+                f.write(encoded)
+                f.write(blob)
+        self.runs.append(path)
+        self._buffer = []
+        self._size = 0
 
-    return ""
+    def merged(self) -> Iterator[tuple[str, int, bytes]]:
+        if not self.runs:
+            buffer, self._buffer = self._buffer, []
+            buffer.sort()
+            yield from buffer
+            return
+        if self._buffer:
+            self._spill()
+        yield from heapq.merge(*(_read_run(path) for path in self.runs))
 
 
-def _write_ndjson(path: Path, records: list[dict]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        for record in records:
-            f.write(json.dumps(record, ensure_ascii=True))
-            f.write("\n")
+def merge_sources(
+    cfg: ProjectConfig,
+    sources: list[str],
+    run_date: date,
+    input_paths: dict[str, Path] | None = None,
+    new_only: bool = False,
+    reuse: bool = False,
+    spill: bool | None = None,
+    near_dup: bool | None = None,
+    entities: bool | None = None,
+    incremental: bool | None = None,
+) -> dict:
+    """Stream every source into the merged file, keeping the first lead per key.
 
+    Only the dedup keys are held in memory; records go straight to the writer.
+    Inputs and output go through the configured ``storage.backend``. Every
+    merged key is recorded in the cross-date seen index; with ``new_only`` a
+    lead whose key was already merged on an earlier run date is dropped.
 
-def merge_sources(cfg: ProjectConfig, sources: list[str], run_date: date) -> dict:
+    The partition's ``_manifest.json`` records counts, hashes and timings.
+    With ``reuse`` an unchanged merge returns that record instead of rerunning.
+
+    ``spill`` (default ``merge.spill``) swaps the in-memory key set for an
+    external sort-merge bounded by ``merge.memory_mb``; the output is the same.
+    ``near_dup`` (default ``merge.near_dup.enabled``) first reads the inputs
+    once to find near-duplicate companies, which the merge then drops.
+    ``entities`` (default ``merge.entities.enabled``) replaces the single-key
+    dedup with entity resolution: leads sharing any identity key become one
+    fused lead. Fused leads are held in memory until the inputs are read.
+
+    ``incremental`` (default ``merge.incremental``) keeps ``_merge_state.sqlite``
+    next to the output: per input, the byte offset read up to, plus every
+    merged key. While the inputs have only grown since, a re-merge reads just
+    the appended lines and appends their new leads to the output in place
+    (see ``_tail_merge``), so it costs what was added. Any other change falls
+    back to a full merge, which rebuilds the state. Tail merges cover the
+    plain merge on the ``ndjson`` backend; near-dup and entity merges, which
+    may revise earlier output, always run in full.
+    """
+    started = time.perf_counter()
+    settings = merge_settings(cfg)
+    dup_settings = near_dup_settings(cfg)
+    if near_dup is None:
+        near_dup = dup_settings.enabled
+    entity_opts = entity_settings(cfg)
+    if entities is None:
+        entities = entity_opts.enabled
     run_date_str = run_date.isoformat()
     input_counts: dict[str, int] = {}
-    deduped: dict[str, dict] = {}
 
+    resolved: list[tuple[str, Path]] = []
     for source in sources:
-        input_path = (
-            cfg.paths.data_dir / "raw" / source / run_date_str / "leads.ndjson"
-        )
-        if not input_path.exists():
+        if input_paths and source in input_paths:
+            input_path = input_paths[source]
+        else:
+            input_path = find_leads_path(cfg, source, run_date)
+        if not stage_exists(cfg, "raw", run_date_str, input_path, source=source):
             raise FileNotFoundError(f"Missing input for source '{source}': {input_path}")
-
-        records = read_ndjson(input_path)
-        input_counts[source] = len(records)
-        for record in records:
-            key = dedup_key(record)
-            if key in deduped:
-                continue
-            deduped[key] = record
+        resolved.append((source, input_path))
 
     output_path = (
         cfg.paths.data_dir
@@ -92,15 +225,434 @@ def merge_sources(cfg: ProjectConfig, sources: list[str], run_date: date) -> dic
         / run_date_str
         / "leads.ndjson"
     )
-    output_records = list(deduped.values())
-    _write_ndjson(output_path, output_records)
+    params: dict[str, object] = {"sources": sources, "new_only": new_only}
+    if near_dup:
+        params["near_dup"] = near_dup_params(dup_settings)
+    if entities:
+        params["entity_keys"] = list(entity_opts.keys)
+    inputs = [input_path for _, input_path in resolved]
+    # A new-only merge also depends on the seen index, so it always reruns.
+    if reuse and not new_only:
+        previous = reusable_result([output_path.parent], params, inputs)
+        if previous is not None:
+            return {**previous, "skipped": True}
 
-    total_in = sum(input_counts.values())
-    output_count = len(output_records)
-    return {
+    skip: set[int] = set()
+    if near_dup:
+        skip = find_near_duplicates(
+            _iter_inputs(cfg, resolved, run_date_str), dup_settings
+        )
+    if spill is None:
+        spill = settings.spill
+    if incremental is None:
+        incremental = settings.incremental
+    storage = storage_settings(cfg)
+    tail = incremental and not near_dup and not entities and storage.backend == "ndjson"
+    state: MergeState | None = None
+    with ExitStack() as stack:
+        index = stack.enter_context(open_seen_index(cfg))
+        if tail:
+            stack.enter_context(partition_lock(output_path))
+            state = stack.enter_context(open_merge_state(output_path.parent))
+            with ExitStack() as input_locks:
+                # Writers append whole batches under the partition lock, so a
+                # tail read under it never meets a half-written last line.
+                for _, input_path in resolved:
+                    input_locks.enter_context(partition_lock(input_path))
+                payload = _tail_merge(
+                    resolved, run_date, output_path, index, new_only, state, params,
+                    storage,
+                )
+            if payload is not None:
+                write_partition_manifest(
+                    output_path.parent,
+                    "merged",
+                    run_date_str,
+                    outputs=[Path(payload["output_path"])],
+                    record_count=payload["output_count"],
+                    started=started,
+                    inputs=inputs,
+                    params=params,
+                    result=payload,
+                )
+                return payload
+            state.clear()
+            # Taken before the inputs are read: lines appended meanwhile are
+            # read again by the next tail merge and dropped as duplicates.
+            marks = {source: _mark_input(path) for source, path in resolved}
+        else:
+            # A merge the state does not describe would leave it stale.
+            merge_state_path(output_path.parent).unlink(missing_ok=True)
+        if entities:
+            writer, dropped = _merge_entities(
+                cfg, resolved, run_date, output_path, index, new_only, input_counts,
+                skip, entity_opts,
+            )
+        elif spill:
+            writer, dropped = _merge_spilled(
+                cfg, resolved, run_date, output_path, index, new_only, input_counts,
+                skip, settings, state,
+            )
+        else:
+            writer, dropped = _merge_in_memory(
+                cfg, resolved, run_date, output_path, index, new_only, input_counts,
+                skip, state,
+            )
+        if state is not None:
+            state.update(
+                {
+                    source: replace(mark, records=input_counts[source])
+                    for source, mark in marks.items()
+                },
+                (),
+                {
+                    "params": params,
+                    "key_version": KEY_VERSION,
+                    "output": asdict(Mark.of(writer.path)),
+                    "output_count": writer.count,
+                    "seen_before_count": dropped.seen_before,
+                },
+            )
+
+    output_count = writer.count
+    payload: dict[str, object] = {
         "sources": sources,
         "input_counts": input_counts,
         "output_count": output_count,
-        "deduped_count": max(total_in - output_count, 0),
-        "output_path": str(output_path),
+        "deduped_count": dropped.duplicate,
+        "output_path": str(writer.path),
+    }
+    if new_only:
+        payload["seen_before_count"] = dropped.seen_before
+    if near_dup:
+        payload["near_dup_count"] = dropped.near_dup
+    write_partition_manifest(
+        output_path.parent,
+        "merged",
+        run_date_str,
+        outputs=writer.files,
+        record_count=output_count,
+        started=started,
+        inputs=inputs,
+        params=params,
+        result=payload,
+    )
+    return payload
+
+
+def rekey(cfg: ProjectConfig) -> dict[str, object]:
+    """Bring stored dedup keys up to ``KEY_VERSION`` after the key changed.
+
+    Rows in the SQLite lead store get their key recomputed from the record,
+    and the seen index is rebuilt from every merged partition, oldest run
+    date first. Offset sidecars and merge states carry the key version and
+    rebuild themselves on their next use.
+    """
+    storage = storage_settings(cfg)
+    merged_root = cfg.paths.data_dir / "interim" / "merged"
+    run_dates = {
+        path.name
+        for path in merged_root.glob("*")
+        if find_ndjson(path / "leads.ndjson") is not None
+    }
+    rekeyed = 0
+    if store_path(cfg, storage).exists():
+        with open_store(cfg, storage) as store:
+            rekeyed = store.rekey()
+            run_dates.update(store.run_dates("merged"))
+
+    with open_seen_index(cfg, storage) as index:
+        index.clear()
+        for run_date_str in sorted(run_dates):
+            output_path = merged_root / run_date_str / "leads.ndjson"
+            records = iter_stage(cfg, "merged", run_date_str, output_path)
+            index.mark((dedup_key(record) for record in records), run_date_str)
+        seen_count = len(index)
+    return {
+        "key_version": KEY_VERSION,
+        "store_rows_rekeyed": rekeyed,
+        "merged_partitions": len(run_dates),
+        "seen_keys": seen_count,
     }
+
+
+def _iter_inputs(
+    cfg: ProjectConfig,
+    resolved: list[tuple[str, Path]],
+    run_date_str: str,
+    counts: dict[str, int] | None = None,
+) -> Iterator[dict[str, Any]]:
+    for source, input_path in resolved:
+        count = 0
+        for record in iter_stage(cfg, "raw", run_date_str, input_path, source=source):
+            count += 1
+            yield record
+        if counts is not None:
+            counts[source] = count
+
+
+def _mark_input(input_path: Path) -> Mark:
+    return Mark.of(find_ndjson(input_path) or input_path)
+
+
+def _tail_merge(
+    resolved: list[tuple[str, Path]],
+    run_date: date,
+    output_path: Path,
+    index: SeenIndex,
+    new_only: bool,
+    state: MergeState,
+    params: dict[str, object],
+    storage: StorageSettings,
+) -> dict[str, Any] | None:
+    """Merge only what was appended to the inputs since ``state`` was recorded.
+
+    Returns None, touching nothing, unless the params match and the output
+    and every input still start with the bytes the state marked. New lines
+    are read from each input's offset and checked against the state's keys;
+    the first lead per new key is appended to the output, after cutting off
+    any append a crashed run left unrecorded. The state is updated after the
+    append is fsynced, then the seen index.
+    """
+    meta = state.meta()
+    marks = state.inputs()
+    output = state.output()
+    output_file = compressed_path(output_path, storage.compression)
+    if (
+        meta.get("params") != json.loads(json.dumps(params, sort_keys=True))
+        or meta.get("key_version") != KEY_VERSION
+        or output is None
+        or not output.still_prefix_of(output_file)
+        or set(marks) != {source for source, _ in resolved}
+    ):
+        return None
+    files: dict[str, Path] = {}
+    for source, input_path in resolved:
+        input_file = find_ndjson(input_path)
+        if input_file is None or not marks[source].still_prefix_of(input_file):
+            return None
+        files[source] = input_file
+
+    if output_file.stat().st_size > output.offset:
+        with output_file.open("r+b") as f:
+            f.truncate(output.offset)
+
+    decode = json_decoder(storage.json_decoder)
+    added: dict[str, None] = {}
+    fresh: list[dict[str, Any]] = []
+    seen_before = 0
+    new_input_count = 0
+    updated: dict[str, Mark] = {}
+    for source, input_file in files.items():
+        mark = marks[source]
+        end = Mark.of(input_file)
+        count = 0
+        for record in iter_ndjson(input_file, decode, offset=mark.offset):
+            count += 1
+            key = dedup_key(record)
+            if key in added or state.has(key):
+                continue
+            added[key] = None
+            if new_only and key and index.seen_before(key, run_date):
+                seen_before += 1
+                continue
+            fresh.append(record)
+        updated[source] = replace(end, records=mark.records + count)
+        new_input_count += count
+
+    if fresh:
+        append_records(
+            output_file, fresh, storage.compression, index=storage.offset_index
+        )
+    output_count = int(meta.get("output_count") or 0) + len(fresh)
+    seen_before += int(meta.get("seen_before_count") or 0)
+    state.update(
+        updated,
+        added,
+        {
+            "output": asdict(Mark.of(output_file)),
+            "output_count": output_count,
+            "seen_before_count": seen_before,
+        },
+    )
+    # Only a merge whose output was committed updates the index.
+    index.mark(added, run_date)
+
+    input_counts = {source: mark.records for source, mark in updated.items()}
+    total_in = sum(input_counts.values())
+    payload: dict[str, Any] = {
+        "sources": [source for source, _ in resolved],
+        "input_counts": input_counts,
+        "output_count": output_count,
+        "deduped_count": max(total_in - output_count - seen_before, 0),
+        "output_path": str(output_file),
+        "incremental": {
+            "new_input_count": new_input_count,
+            "appended_count": len(fresh),
+        },
+    }
+    if new_only:
+        payload["seen_before_count"] = seen_before
+    return payload
+
+
+@dataclass
+class _Dropped:
+    """Input records a full merge left out, counted as they are dropped."""
+
+    duplicate: int = 0
+    near_dup: int = 0
+    seen_before: int = 0
+
+
+def _merge_in_memory(
+    cfg: ProjectConfig,
+    resolved: list[tuple[str, Path]],
+    run_date: date,
+    output_path: Path,
+    index: SeenIndex,
+    new_only: bool,
+    input_counts: dict[str, int],
+    skip: set[int],
+    state: MergeState | None = None,
+) -> tuple[StageWriter, _Dropped]:
+    """Stream the inputs once, holding every dedup key in a set."""
+    run_date_str = run_date.isoformat()
+    seen: set[str] = set()
+    dropped = _Dropped()
+    position = -1
+    with StageWriter(cfg, "merged", run_date_str, output_path) as writer:
+        for source, input_path in resolved:
+            count = 0
+            records = iter_stage(cfg, "raw", run_date_str, input_path, source=source)
+            for record in records:
+                count += 1
+                position += 1
+                key = dedup_key(record)
+                if key in seen:
+                    dropped.duplicate += 1
+                    continue
+                seen.add(key)
+                if position in skip:
+                    dropped.near_dup += 1
+                    continue
+                if new_only and key and index.seen_before(key, run_date):
+                    dropped.seen_before += 1
+                    continue
+                writer.write(record)
+            input_counts[source] = count
+    # Only a merge whose output was committed updates the index.
+    index.mark(seen, run_date)
+    if state is not None:
+        state.update({}, seen, {})
+    return writer, dropped
+
+
+def _merge_spilled(
+    cfg: ProjectConfig,
+    resolved: list[tuple[str, Path]],
+    run_date: date,
+    output_path: Path,
+    index: SeenIndex,
+    new_only: bool,
+    input_counts: dict[str, int],
+    skip: set[int],
+    settings: MergeSettings,
+    state: MergeState | None = None,
+) -> tuple[StageWriter, _Dropped]:
+    """Dedup through sorted runs on disk instead of an in-memory key set.
+
+    Records are numbered in input order and sorted by ``(key, seq)``; the
+    first entry of each key wins, as in the in-memory merge. The winners are
+    sorted back by ``seq`` so the output keeps the input order.
+    """
+    run_date_str = run_date.isoformat()
+    tmp_root = cfg.paths.data_dir / settings.tmp_dir
+    tmp_root.mkdir(parents=True, exist_ok=True)
+    dropped = _Dropped()
+    with tempfile.TemporaryDirectory(prefix=f"{run_date_str}-", dir=tmp_root) as tmp:
+        directory = Path(tmp)
+        by_key = _RunSorter(directory, "by-key", settings.memory_bytes)
+        seq = 0
+        for source, input_path in resolved:
+            count = 0
+            records = iter_stage(cfg, "raw", run_date_str, input_path, source=source)
+            for record in records:
+                count += 1
+                blob = pickle.dumps(record, pickle.HIGHEST_PROTOCOL)
+                by_key.add(dedup_key(record), seq, blob)
+                seq += 1
+            input_counts[source] = count
+
+        by_seq = _RunSorter(directory, "by-seq", settings.memory_bytes)
+        keys_path = directory / "keys.ndjson"
+        previous: str | None = None
+        keys = keys_path.open("w", encoding="utf-8", buffering=DEFAULT_BUFFER_SIZE)
+        with keys:
+            for key, seq, blob in by_key.merged():
+                if key == previous:
+                    dropped.duplicate += 1
+                    continue
+                previous = key
+                keys.write(json.dumps(key, ensure_ascii=False) + "\n")
+                if seq in skip:
+                    dropped.near_dup += 1
+                    continue
+                if new_only and key and index.seen_before(key, run_date):
+                    dropped.seen_before += 1
+                    continue
+                by_seq.add("", seq, blob)
+
+        with StageWriter(cfg, "merged", run_date_str, output_path) as writer:
+            for _, _, blob in by_seq.merged():
+                writer.write(pickle.loads(blob))
+        # Only a merge whose output was committed updates the index.
+        with keys_path.open(encoding="utf-8") as keys:
+            index.mark((json.loads(line) for line in keys), run_date)
+        if state is not None:
+            with keys_path.open(encoding="utf-8") as keys:
+                state.update({}, (json.loads(line) for line in keys), {})
+    return writer, dropped
+
+
+def _merge_entities(
+    cfg: ProjectConfig,
+    resolved: list[tuple[str, Path]],
+    run_date: date,
+    output_path: Path,
+    index: SeenIndex,
+    new_only: bool,
+    input_counts: dict[str, int],
+    skip: set[int],
+    settings: EntitySettings,
+) -> tuple[StageWriter, _Dropped]:
+    """Union leads that share any identity key and write one fused lead each.
+
+    With ``new_only`` an entity is dropped when any member's dedup key was
+    merged on an earlier run date. Every member's key is marked as seen.
+    """
+    run_date_str = run_date.isoformat()
+    groups = resolve_entities(
+        _iter_inputs(cfg, resolved, run_date_str), settings.keys, skip
+    )
+    seen: set[str] = set()
+    dropped = _Dropped()
+    fused_count = 0
+    records = _iter_inputs(cfg, resolved, run_date_str, input_counts)
+    with StageWriter(cfg, "merged", run_date_str, output_path) as writer:
+        for fused, members in iter_fused(records, groups, skip):
+            fused_count += len(members)
+            dropped.duplicate += len(members) - 1
+            keys = {dedup_key(member) for member in members}
+            seen.update(keys)
+            if new_only and any(
+                key and index.seen_before(key, run_date) for key in keys
+            ):
+                dropped.seen_before += 1
+                continue
+            writer.write(fused)
+    # Only a merge whose output was committed updates the index.
+    index.mark(seen, run_date)
+    # iter_fused leaves the near-duplicate positions out of every entity.
+    dropped.near_dup = sum(input_counts.values()) - fused_count
+    return writer, dropped
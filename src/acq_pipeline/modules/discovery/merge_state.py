@@ -0,0 +1,170 @@
+from __future__ import annotations  # no installation needed
+
+import hashlib  # no installation needed
+import json  # no installation needed
+import sqlite3  # no installation needed
+from dataclasses import dataclass  # no installation needed
+from pathlib import Path  # no installation needed
+from types import TracebackType  # no installation needed
+from typing import Any, Iterable  # no installation needed
+
+STATE_NAME = "_merge_state.sqlite"
+# Bytes hashed before a recorded offset to tell an append from a rewrite.
+TAIL_BYTES = 4096
+INSERT_BATCH_SIZE = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS inputs (
+    source TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    tail TEXT NOT NULL,
+    records INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS merged_keys (
+    dedup_key TEXT PRIMARY KEY
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def merge_state_path(directory: Path) -> Path:
+    return directory / STATE_NAME
+
+
+def tail_digest(path: Path, end: int, span: int = TAIL_BYTES) -> str:
+    """SHA-256 of the ``span`` bytes of ``path`` before ``end``."""
+    start = max(0, end - span)
+    with path.open("rb") as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(end - start)).hexdigest()
+
+
+@dataclass(frozen=True)
+class Mark:
+    """How far into a file a merge has read: its size then and the bytes before it."""
+
+    path: str
+    offset: int
+    tail: str
+    records: int = 0
+
+    @classmethod
+    def of(cls, path: Path, records: int = 0) -> Mark:
+        offset = path.stat().st_size
+        return cls(str(path), offset, tail_digest(path, offset), records)
+
+    def still_prefix_of(self, path: Path) -> bool:
+        """True when ``path`` is the marked file with only bytes appended since."""
+        if str(path) != self.path:
+            return False
+        try:
+            if path.stat().st_size < self.offset:
+                return False
+            return tail_digest(path, self.offset) == self.tail
+        except FileNotFoundError:
+            return False
+
+
+class MergeState:
+    """What the last merge of one partition consumed, for tail merges.
+
+    Per source it keeps the input file and the byte offset read up to; it
+    also keeps every dedup key in the merged output and a ``meta`` record of
+    the params, the output file's mark and the running counts. Each update
+    is one transaction, written only after the output it describes.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> MergeState:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def meta(self) -> dict[str, Any]:
+        rows = self._conn.execute("SELECT name, value FROM meta").fetchall()
+        return {name: json.loads(value) for name, value in rows}
+
+    def inputs(self) -> dict[str, Mark]:
+        rows = self._conn.execute(
+            "SELECT source, path, offset, tail, records FROM inputs"
+        ).fetchall()
+        return {row[0]: Mark(*row[1:]) for row in rows}
+
+    def output(self) -> Mark | None:
+        output = self.meta().get("output")
+        return Mark(**output) if isinstance(output, dict) else None
+
+    def has(self, key: str) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM merged_keys WHERE dedup_key = ?", (key,)
+        ).fetchone()
+        return row is not None
+
+    def update(
+        self,
+        inputs: dict[str, Mark],
+        keys: Iterable[str],
+        meta: dict[str, Any],
+        reset: bool = False,
+    ) -> None:
+        """Record ``inputs`` and ``meta`` and add ``keys`` in one transaction.
+
+        ``reset`` first forgets everything, for a state rebuilt by a full merge.
+        """
+        with self._conn:
+            if reset:
+                self._conn.execute("DELETE FROM inputs")
+                self._conn.execute("DELETE FROM merged_keys")
+                self._conn.execute("DELETE FROM meta")
+            batch: list[tuple[str]] = []
+            for key in keys:
+                batch.append((key,))
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO merged_keys VALUES (?)", batch
+                    )
+                    batch = []
+            if batch:
+                self._conn.executemany("INSERT OR IGNORE INTO merged_keys VALUES (?)", batch)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO inputs VALUES (?, ?, ?, ?, ?)",
+                [
+                    (source, mark.path, mark.offset, mark.tail, mark.records)
+                    for source, mark in inputs.items()
+                ],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                [
+                    (name, json.dumps(value, sort_keys=True, default=str))
+                    for name, value in meta.items()
+                ],
+            )
+
+    def clear(self) -> None:
+        self.update({}, (), {}, reset=True)
+
+    def __len__(self) -> int:
+        return int(self._conn.execute("SELECT COUNT(*) FROM merged_keys").fetchone()[0])
+
+
+def open_merge_state(directory: Path) -> MergeState:
+    return MergeState(merge_state_path(directory))
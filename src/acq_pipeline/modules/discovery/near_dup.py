@@ -0,0 +1,193 @@
+from __future__ import annotations  # no installation needed
+
+import hashlib  # no installation needed
+import re  # no installation needed
+from dataclasses import asdict, dataclass  # no installation needed
+from typing import Any, Iterable  # no installation needed
+
+import numpy as np  # already in env (requirements/base.txt)
+
+from ...config import ProjectConfig  # no installation needed
+from .domains import domain_label  # no installation needed
+from .keys import dedup_key  # no installation needed
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+# Candidates verified per LSH bucket; bounds the work on very common bands.
+MAX_BUCKET_CANDIDATES = 32
+NAME_SHINGLE = 3
+
+_LEGAL_SUFFIXES = {
+    "ab", "ag", "bv", "co", "company", "corp", "corporation", "gmbh", "inc",
+    "incorporated", "limited", "llc", "ltd", "oy", "plc", "pty", "sa", "sas", "srl",
+}
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+@dataclass(frozen=True)
+class NearDupSettings:
+    """Near-duplicate options read from ``settings.yaml`` ``merge.near_dup``."""
+
+    enabled: bool = False
+    threshold: float = 0.8
+    num_perm: int = 128
+    bands: int = 16
+
+    @property
+    def rows(self) -> int:
+        return self.num_perm // self.bands
+
+
+def near_dup_settings(cfg: ProjectConfig) -> NearDupSettings:
+    settings: Any = {}
+    if isinstance(cfg.settings, dict):
+        merge = cfg.settings.get("merge", {})
+        if isinstance(merge, dict):
+            settings = merge.get("near_dup", {})
+    if not isinstance(settings, dict):
+        settings = {}
+    defaults = NearDupSettings()
+    try:
+        threshold = float(settings.get("threshold", defaults.threshold))
+        num_perm = int(settings.get("num_perm", defaults.num_perm))
+        bands = int(settings.get("bands", defaults.bands))
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid merge.near_dup settings: {exc}") from exc
+    if not 0 < threshold <= 1:
+        raise ValueError("merge.near_dup.threshold must be in (0, 1].")
+    if bands <= 0 or num_perm <= 0 or num_perm % bands:
+        raise ValueError("merge.near_dup.num_perm must be a positive multiple of bands.")
+    return NearDupSettings(
+        enabled=bool(settings.get("enabled", defaults.enabled)),
+        threshold=threshold,
+        num_perm=num_perm,
+        bands=bands,
+    )
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase words of ``name`` without a domain suffix or legal form.
+
+    ``Acme, Inc.``, ``ACME`` and ``acme.io`` all normalize to ``acme``.
+    """
+    value = name.strip().lower()
+    if "." in value and not any(char in value for char in " /"):
+        value = domain_label(value) or value
+    words = _WORD.findall(value)
+    while len(words) > 1 and words[-1] in _LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def shingles(record: dict[str, Any]) -> set[str]:
+    """Character 3-grams of the normalized name plus word pairs of the description."""
+    result: set[str] = set()
+    name = normalize_name(str(record.get("company_name") or ""))
+    if name:
+        padded = f" {name} "
+        width = min(NAME_SHINGLE, len(padded))
+        result.update(
+            "n:" + padded[idx : idx + width] for idx in range(len(padded) - width + 1)
+        )
+    words = _WORD.findall(str(record.get("description") or "").lower())
+    if len(words) == 1:
+        result.add("d:" + words[0])
+    result.update(f"d:{first} {second}" for first, second in zip(words, words[1:]))
+    return result
+
+
+def _hash32(value: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(value.encode("utf-8"), digest_size=4).digest(), "little"
+    )
+
+
+class NearDupIndex:
+    """MinHash signatures with LSH banding that flags near-duplicate leads.
+
+    Leads are offered in order. A lead whose estimated Jaccard similarity to an
+    earlier kept lead reaches ``threshold`` is a near duplicate of it; any
+    other lead is kept and indexed. Only the candidates that share a band
+    bucket are compared, so the work stays near-linear in the number of leads.
+    """
+
+    def __init__(self, settings: NearDupSettings, seed: int = 1) -> None:
+        self.settings = settings
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE_PRIME, settings.num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, settings.num_perm, dtype=np.uint64)
+        self._buckets: list[dict[bytes, list[int]]] = [
+            {} for _ in range(settings.bands)
+        ]
+        self._signatures: list[np.ndarray] = []
+        self._items: list[Any] = []
+
+    def signature(self, values: set[str]) -> np.ndarray:
+        hashes = np.fromiter(
+            (_hash32(value) for value in values), dtype=np.uint64, count=len(values)
+        )
+        # (a * h + b) mod p per permutation; uint64 products wrap by design.
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME
+        return (permuted & _MAX_HASH).min(axis=0).astype(np.uint32)
+
+    def _bands(self, signature: np.ndarray) -> Iterable[tuple[int, bytes]]:
+        rows = self.settings.rows
+        for band in range(self.settings.bands):
+            yield band, signature[band * rows : (band + 1) * rows].tobytes()
+
+    def add(self, item: Any, record: dict[str, Any]) -> Any | None:
+        """Offer ``record``; returns the kept item it duplicates, or None if kept.
+
+        A record with neither name nor description is always kept unindexed.
+        """
+        values = shingles(record)
+        if not values:
+            return None
+        signature = self.signature(values)
+        bands = list(self._bands(signature))
+        checked: set[int] = set()
+        for band, key in bands:
+            for position in self._buckets[band].get(key, ())[:MAX_BUCKET_CANDIDATES]:
+                if position in checked:
+                    continue
+                checked.add(position)
+                similarity = float(np.mean(self._signatures[position] == signature))
+                if similarity >= self.settings.threshold:
+                    return self._items[position]
+        position = len(self._items)
+        self._items.append(item)
+        self._signatures.append(signature)
+        for band, key in bands:
+            self._buckets[band].setdefault(key, []).append(position)
+        return None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def find_near_duplicates(
+    records: Iterable[dict[str, Any]], settings: NearDupSettings
+) -> set[int]:
+    """Input positions of ``records`` that a merge should drop as near duplicates.
+
+    Exact duplicates (same ``dedup_key``) are left to the merge; only the
+    first record per key is compared, so every returned position is one the
+    exact dedup would have kept.
+    """
+    index = NearDupIndex(settings)
+    seen: set[str] = set()
+    drop: set[int] = set()
+    for position, record in enumerate(records):
+        key = dedup_key(record)
+        if key in seen:
+            continue
+        seen.add(key)
+        if index.add(position, record) is not None:
+            drop.add(position)
+    return drop
+
+
+def near_dup_params(settings: NearDupSettings) -> dict[str, Any]:
+    params = asdict(settings)
+    params.pop("enabled")
+    return params
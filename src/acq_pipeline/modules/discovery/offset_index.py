@@ -0,0 +1,237 @@
+from __future__ import annotations  # no installation needed
+
+import hashlib  # no installation needed
+import json  # no installation needed
+import mmap  # no installation needed
+import os  # no installation needed
+import struct  # no installation needed
+import sys  # no installation needed
+from array import array  # no installation needed
+from pathlib import Path  # no installation needed
+from types import TracebackType  # no installation needed
+from typing import Any, Callable, Iterator  # no installation needed
+
+from .keys import KEY_VERSION, dedup_key  # no installation needed
+
+INDEX_SUFFIX = ".idx"
+# Sidecars hashed under another key version no longer match and are rebuilt.
+_MAGIC = b"ACQNDX%02d" % KEY_VERSION
+_HEADER = struct.Struct("<8sQQQ")  # magic, data size, data mtime_ns, line count
+_OFFSET = struct.Struct("<Q")
+_KEY_ENTRY = struct.Struct("<QQ")  # key hash, line number
+
+Decoder = Callable[[bytes], Any]
+
+
+def index_path_for(path: Path) -> Path:
+    return path.with_name(f"{path.name}{INDEX_SUFFIX}")
+
+
+def key_hash(key: str) -> int:
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class OffsetIndexBuilder:
+    """Collects line offsets and dedup-key hashes while an NDJSON file is written.
+
+    The sidecar holds the byte offset of every line (``count + 1`` entries, the
+    last being the file size) followed by ``(key hash, line)`` pairs sorted by
+    hash, so both ``line -> offset`` and ``key -> lines`` are answered by
+    reading a few bytes of a memory-mapped file.
+    """
+
+    def __init__(self) -> None:
+        self.offsets = array("Q", [0])
+        self.hashes = array("Q")
+
+    def add(self, length: int, key: str) -> None:
+        self.offsets.append(self.offsets[-1] + length)
+        self.hashes.append(key_hash(key))
+
+    def add_line(self, line: bytes, decode: Decoder = json.loads) -> None:
+        stripped = line.strip()
+        record = decode(stripped) if stripped else {}
+        self.add(len(line), dedup_key(record) if isinstance(record, dict) else "")
+
+    def extend_from(self, path: Path, decode: Decoder = json.loads) -> None:
+        """Account for the lines already in an uncompressed ``path``."""
+        existing = open_offset_index(path)
+        if existing is not None:
+            with existing:
+                base = self.offsets[-1]
+                self.offsets.extend(base + offset for offset in existing.offsets()[1:])
+                self.hashes.extend(existing.line_hashes())
+            return
+        with path.open("rb") as f:
+            for line in f:
+                self.add_line(line, decode)
+
+    def write(self, data_path: Path) -> Path:
+        """Write the sidecar for the finished ``data_path`` atomically."""
+        stat = data_path.stat()
+        if stat.st_size != self.offsets[-1]:
+            raise ValueError(
+                f"Offset index covers {self.offsets[-1]} bytes, {data_path} has "
+                f"{stat.st_size}."
+            )
+        count = len(self.hashes)
+        # Bucket lines by the hash's top byte first: sorting one bucket at a
+        # time keeps the temporary key lists at 1/256 of a large partition.
+        buckets = [array("Q") for _ in range(256)]
+        for line, value in enumerate(self.hashes):
+            buckets[value >> 56].append(line)
+        entries = array("Q")
+        for bucket in buckets:
+            for line in sorted(bucket, key=self.hashes.__getitem__):
+                entries.append(self.hashes[line])
+                entries.append(line)
+
+        index_path = index_path_for(data_path)
+        tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("wb") as f:
+            f.write(_HEADER.pack(_MAGIC, stat.st_size, stat.st_mtime_ns, count))
+            f.write(_little_endian(self.offsets))
+            f.write(_little_endian(entries))
+        os.replace(tmp_path, index_path)
+        return index_path
+
+
+def build_offset_index(path: Path, decode: Decoder = json.loads) -> Path:
+    """Index an existing uncompressed NDJSON file with one sequential scan."""
+    builder = OffsetIndexBuilder()
+    with path.open("rb") as f:
+        for line in f:
+            builder.add_line(line, decode)
+    return builder.write(path)
+
+
+class OffsetIndex:
+    """Random access into an NDJSON file through its ``.idx`` sidecar.
+
+    Both files are memory-mapped; a record is read by slicing the data map
+    between two offsets, and a key lookup is a binary search over the sorted
+    hash table followed by a check of the decoded record's key.
+    """
+
+    def __init__(
+        self, data_path: Path, count: int, decode: Decoder = json.loads
+    ) -> None:
+        self.data_path = data_path
+        self.count = count
+        self._decode = decode
+        self._index_file = index_path_for(data_path).open("rb")
+        self._data_file = data_path.open("rb")
+        self._index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._data = (
+            mmap.mmap(self._data_file.fileno(), 0, access=mmap.ACCESS_READ)
+            if data_path.stat().st_size
+            else None
+        )
+        self._keys_at = _HEADER.size + _OFFSET.size * (count + 1)
+
+    def close(self) -> None:
+        if self._data is not None:
+            self._data.close()
+        self._index.close()
+        self._data_file.close()
+        self._index_file.close()
+
+    def __enter__(self) -> OffsetIndex:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _offset(self, line: int) -> int:
+        return _OFFSET.unpack_from(self._index, _HEADER.size + _OFFSET.size * line)[0]
+
+    def offsets(self) -> array:
+        values = array("Q")
+        values.frombytes(self._index[_HEADER.size : self._keys_at])
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values
+
+    def line_hashes(self) -> array:
+        """Key hashes in line order (the sidecar stores them sorted by hash)."""
+        hashes = array("Q", bytes(8 * self.count))
+        for position in range(self.count):
+            value, line = _KEY_ENTRY.unpack_from(
+                self._index, self._keys_at + _KEY_ENTRY.size * position
+            )
+            hashes[line] = value
+        return hashes
+
+    def line(self, number: int) -> bytes:
+        if not 0 <= number < self.count or self._data is None:
+            raise IndexError(f"line {number} out of range for {self.data_path}")
+        return self._data[self._offset(number) : self._offset(number + 1)]
+
+    def record(self, number: int) -> dict:
+        return self._decode(self.line(number).strip())
+
+    def records(self, start: int = 0, stop: int | None = None) -> Iterator[dict]:
+        stop = self.count if stop is None else min(stop, self.count)
+        for number in range(max(0, start), stop):
+            yield self.record(number)
+
+    def find(self, key: str) -> list[dict]:
+        """Every record whose dedup key is ``key``, in file order."""
+        target = key_hash(key)
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            value, _ = _KEY_ENTRY.unpack_from(
+                self._index, self._keys_at + _KEY_ENTRY.size * mid
+            )
+            if value < target:
+                low = mid + 1
+            else:
+                high = mid
+        lines: list[int] = []
+        for position in range(low, self.count):
+            value, line = _KEY_ENTRY.unpack_from(
+                self._index, self._keys_at + _KEY_ENTRY.size * position
+            )
+            if value != target:
+                break
+            lines.append(line)
+        matches = (self.record(line) for line in sorted(lines))
+        return [record for record in matches if dedup_key(record) == key]
+
+
+def open_offset_index(
+    path: Path | None, decode: Decoder = json.loads
+) -> OffsetIndex | None:
+    """Open ``path``'s sidecar, or ``None`` when it is missing or out of date."""
+    if path is None:
+        return None
+    index_path = index_path_for(path)
+    try:
+        stat = path.stat()
+        with index_path.open("rb") as f:
+            header = f.read(_HEADER.size)
+    except OSError:
+        return None
+    if len(header) != _HEADER.size:
+        return None
+    magic, size, mtime_ns, count = _HEADER.unpack(header)
+    if magic != _MAGIC or size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+        return None
+    return OffsetIndex(path, count, decode)
@@ -0,0 +1,199 @@
+from __future__ import annotations  # no installation needed
+
+import hashlib  # no installation needed
+import json  # no installation needed
+import os  # no installation needed
+import time  # no installation needed
+from datetime import datetime, timezone  # no installation needed
+from pathlib import Path  # no installation needed
+from typing import Any, Iterable  # no installation needed
+
+from .storage import find_ndjson, iter_ndjson  # no installation needed
+
+MANIFEST_NAME = "_manifest.json"
+
+
+def _utc_now_z() -> str:
+    return (
+        datetime.now(timezone.utc)
+        .replace(microsecond=0)
+        .isoformat()
+        .replace("+00:00", "Z")
+    )
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _normalize(params: dict[str, Any]) -> Any:
+    return json.loads(json.dumps(params, sort_keys=True, default=str))
+
+
+def _unchanged(path: Path, recorded: Any) -> bool:
+    if not isinstance(recorded, dict):
+        return False
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return False
+    return (
+        recorded.get("size") == stat.st_size
+        and recorded.get("mtime_ns") == stat.st_mtime_ns
+    )
+
+
+def manifest_path_for(directory: Path) -> Path:
+    return directory / MANIFEST_NAME
+
+
+def read_partition_manifest(directory: Path) -> dict[str, Any]:
+    path = manifest_path_for(directory)
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def recorded_fingerprint(path: Path) -> dict[str, Any] | None:
+    """The fingerprint ``path``'s partition manifest holds, if the file is unchanged."""
+    recorded = read_partition_manifest(path.parent).get("outputs", {}).get(path.name)
+    return dict(recorded) if _unchanged(path, recorded) else None
+
+
+def fingerprint(
+    path: Path, previous: dict[str, Any] | None = None
+) -> dict[str, Any] | None:
+    """Size, mtime and content hash of ``path``.
+
+    The hash is reused from ``previous`` or the partition manifest while size
+    and mtime still match, so an unchanged partition is never re-read.
+    """
+    if previous and _unchanged(path, previous):
+        return dict(previous)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    recorded = recorded_fingerprint(path)
+    if recorded is not None:
+        return recorded
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": _sha256(path),
+    }
+
+
+def _input_fingerprints(
+    inputs: Iterable[Path], previous: dict[str, Any] | None = None
+) -> dict[str, dict[str, Any] | None]:
+    previous = previous or {}
+    files = [find_ndjson(path) or path for path in inputs]
+    return {str(path): fingerprint(path, previous.get(str(path))) for path in files}
+
+
+def existing_record_count(path: Path) -> int:
+    """Records already in the logical NDJSON ``path`` (0 when it is missing).
+
+    Taken from the partition manifest when the file is unchanged since it was
+    written; otherwise the file is streamed once to count them.
+    """
+    existing = find_ndjson(path)
+    if existing is None:
+        return 0
+    manifest = read_partition_manifest(existing.parent)
+    if _unchanged(existing, manifest.get("outputs", {}).get(existing.name)):
+        return int(manifest.get("record_count") or 0)
+    return sum(1 for _ in iter_ndjson(existing))
+
+
+def write_partition_manifest(
+    directory: Path,
+    stage: str,
+    run_date: str,
+    outputs: Iterable[Path],
+    record_count: int,
+    started: float,
+    inputs: Iterable[Path] = (),
+    params: dict[str, Any] | None = None,
+    result: dict[str, Any] | None = None,
+    complete: bool = True,
+) -> Path:
+    """Record what a partition holds in ``<directory>/_manifest.json``.
+
+    ``started`` is the ``time.perf_counter()`` reading taken when the stage
+    began. ``result`` is the stage's return payload, replayed when a later
+    run finds the manifest current (see ``reusable_result``). ``complete`` is
+    false for a crawl that stopped before its source was exhausted.
+    """
+    manifest: dict[str, Any] = {
+        "stage": stage,
+        "run_date": run_date,
+        "written_at": _utc_now_z(),
+        "wall_time_s": round(time.perf_counter() - started, 3),
+        "record_count": record_count,
+        "complete": complete,
+        "outputs": {
+            path.name: fingerprint(path) for path in outputs if path.exists()
+        },
+        "inputs": _input_fingerprints(inputs),
+        "params": _normalize(params or {}),
+    }
+    if result is not None:
+        manifest["result"] = _normalize(result)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = manifest_path_for(directory)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(
+        json.dumps(manifest, indent=2, sort_keys=True, ensure_ascii=True),
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, path)
+    return path
+
+
+def reusable_result(
+    directories: Iterable[Path],
+    params: dict[str, Any],
+    inputs: Iterable[Path],
+) -> dict[str, Any] | None:
+    """The recorded result when every partition in ``directories`` is current.
+
+    Current means same params, inputs with the recorded content and outputs
+    untouched since they were written. The result comes from the first
+    directory's manifest.
+    """
+    directories = list(directories)
+    manifests = [read_partition_manifest(directory) for directory in directories]
+    if not manifests or not all(manifest.get("complete") for manifest in manifests):
+        return None
+    normalized = _normalize(params)
+    current_inputs: dict[str, dict[str, Any] | None] | None = None
+    for directory, manifest in zip(directories, manifests):
+        outputs = manifest.get("outputs")
+        if manifest.get("params") != normalized or not outputs:
+            return None
+        for name, recorded in outputs.items():
+            if not _unchanged(directory / name, recorded):
+                return None
+        recorded_inputs = manifest.get("inputs") or {}
+        if current_inputs is None:
+            current_inputs = _input_fingerprints(inputs, recorded_inputs)
+        if set(current_inputs) != set(recorded_inputs):
+            return None
+        for key, item in current_inputs.items():
+            before = recorded_inputs.get(key)
+            if item is None or not isinstance(before, dict):
+                return None
+            if item["sha256"] != before.get("sha256"):
+                return None
+    result = manifests[0].get("result")
+    return dict(result) if isinstance(result, dict) else None
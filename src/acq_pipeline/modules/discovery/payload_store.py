@@ -0,0 +1,121 @@
+from __future__ import annotations  # no installation needed
+
+import dataclasses  # no installation needed
+import hashlib  # no installation needed
+import json  # no installation needed
+import os  # no installation needed
+import threading  # no installation needed
+from pathlib import Path  # no installation needed
+from typing import Any, Iterable, Iterator  # no installation needed
+
+from ...config import ProjectConfig  # no installation needed
+from .filter_rules import matched_keywords  # no installation needed
+from .schema import Lead  # no installation needed
+from .storage import StorageSettings, storage_settings  # no installation needed
+
+REF_KEY = "$ref"
+REF_PREFIX = "sha256:"
+# Filter keywords found in the payload, so scoring never loads it back.
+KEYWORDS_KEY = "$keywords"
+# Raw fields that stay inline next to the reference (producthunt dedups on id).
+INLINE_KEYS = ("id",)
+
+
+def _canonical(payload: dict[str, Any]) -> bytes:
+    return json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def is_ref(raw: Any) -> bool:
+    return isinstance(raw, dict) and isinstance(raw.get(REF_KEY), str)
+
+
+class PayloadStore:
+    """Content-addressed store for raw source payloads.
+
+    A payload is kept once as ``<root>/<hh>/<sha256>.json`` however many leads
+    point at it; leads carry ``{"$ref": "sha256:<hex>", "$keywords": [...],
+    "id": ...}`` instead.
+    Writes go through a temp file and ``os.replace``, so concurrent writers of
+    the same payload are harmless.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def path_for(self, ref: str) -> Path:
+        digest = ref[len(REF_PREFIX):] if ref.startswith(REF_PREFIX) else ref
+        if len(digest) != 64 or not all(c in "0123456789abcdef" for c in digest):
+            raise ValueError(f"Not a payload reference: {ref!r}")
+        return self.root / digest[:2] / f"{digest}.json"
+
+    def put(self, payload: dict[str, Any]) -> str:
+        data = _canonical(payload)
+        ref = REF_PREFIX + hashlib.sha256(data).hexdigest()
+        path = self.path_for(ref)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(
+                f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        return ref
+
+    def get(self, ref: str) -> dict[str, Any] | None:
+        try:
+            data = self.path_for(ref).read_bytes()
+        except FileNotFoundError:
+            return None
+        payload = json.loads(data)
+        return payload if isinstance(payload, dict) else None
+
+    def __contains__(self, ref: object) -> bool:
+        return isinstance(ref, str) and self.path_for(ref).exists()
+
+    def externalize(self, raw: dict[str, Any]) -> dict[str, Any]:
+        """The small reference that replaces ``raw`` in a lead."""
+        if not raw or is_ref(raw):
+            return raw
+        ref: dict[str, Any] = {
+            REF_KEY: self.put(raw),
+            KEYWORDS_KEY: matched_keywords(str(raw).lower()),
+        }
+        for key in INLINE_KEYS:
+            if key in raw:
+                ref[key] = raw[key]
+        return ref
+
+    def externalize_leads(self, leads: Iterable[Lead]) -> Iterator[Lead]:
+        """Copies of ``leads`` whose ``raw`` is stored here; inputs are untouched."""
+        for lead in leads:
+            raw = self.externalize(lead.raw)
+            yield lead if raw is lead.raw else dataclasses.replace(lead, raw=raw)
+
+    def resolve(self, record: dict[str, Any]) -> dict[str, Any]:
+        """``record`` with a referenced ``raw`` loaded back in place.
+
+        A reference whose payload is missing is left as it is.
+        """
+        raw = record.get("raw")
+        if is_ref(raw):
+            payload = self.get(raw[REF_KEY])
+            if payload is not None:
+                record["raw"] = payload
+        return record
+
+
+def payload_store_path(cfg: ProjectConfig, settings: StorageSettings | None = None) -> Path:
+    settings = settings or storage_settings(cfg)
+    return cfg.paths.data_dir / settings.raw_store_path
+
+
+def open_payload_store(
+    cfg: ProjectConfig, settings: StorageSettings | None = None
+) -> PayloadStore | None:
+    """The configured payload store, or None when ``storage.raw_store`` is off."""
+    settings = settings or storage_settings(cfg)
+    if not settings.raw_store:
+        return None
+    return PayloadStore(payload_store_path(cfg, settings))
@@ -1,17 +1,33 @@
 from __future__ import annotations  # no installation needed
 
 import json  # no installation needed
+import dataclasses  # no installation needed
 import os  # no installation needed
 import time  # no installation needed
 from datetime import date, datetime, timezone  # no installation needed
-from typing import Any  # no installation needed
+from pathlib import Path  # no installation needed
+from typing import Any, Callable, Iterator  # no installation needed
 
-import requests  # already in env; no new install
 from tenacity import retry, stop_after_attempt, wait_fixed  # already in env
 
 from ...config import ProjectConfig  # no installation needed
+from .lead_store import StageWriter, open_store  # no installation needed
+from .partition_manifest import (  # no installation needed
+    existing_record_count,
+    reusable_result,
+    write_partition_manifest,
+)
+from .payload_store import open_payload_store  # no installation needed
 from .schema import Lead  # no installation needed
-from .storage import write_leads  # no installation needed
+from .storage import (  # no installation needed
+    compressed_path,
+    compression_of,
+    find_ndjson,
+    get_run_dir,
+    storage_settings,
+    write_leads,
+)
+from .transport import get_client  # no installation needed
 
 
 def build_query(first: int) -> str:
@@ -160,6 +176,37 @@ def parse_producthunt_response(
     return leads
 
 
+def _page_info(data: dict[str, Any]) -> tuple[bool, str | None]:
+    posts = data.get("data", {}).get("posts", {})
+    page_info = posts.get("pageInfo", {}) if isinstance(posts, dict) else {}
+    if not isinstance(page_info, dict):
+        return False, None
+    end_cursor = page_info.get("endCursor")
+    return bool(page_info.get("hasNextPage")), str(end_cursor) if end_cursor else None
+
+
+def checkpoint_path(output_path: Path) -> Path:
+    return output_path.parent / "_checkpoint.json"
+
+
+def read_checkpoint(path: Path) -> dict[str, Any] | None:
+    if not path.exists():
+        return None
+    with path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"Checkpoint must be a JSON object: {path}")
+    return data
+
+
+def write_checkpoint(path: Path, checkpoint: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
 def _live_scrape_settings(cfg: ProjectConfig) -> tuple[int, int, int]:
     if isinstance(cfg.settings, dict):
         settings = cfg.settings.get("live_scrape", {})
@@ -184,8 +231,17 @@ def _live_scrape_settings(cfg: ProjectConfig) -> tuple[int, int, int]:
 
 
 def run_producthunt_fixture(
-    cfg: ProjectConfig, limit: int, run_date: date, overwrite: bool = False
+    cfg: ProjectConfig,
+    limit: int,
+    run_date: date,
+    overwrite: bool = False,
+    reuse: bool = False,
 ) -> dict[str, object]:
+    """Load the configured API fixture into the ``producthunt_api`` raw partition.
+
+    With ``reuse`` the recorded result is returned while the fixture and the
+    limit are unchanged since the partition was written.
+    """
     sources_cfg = cfg.sources.get("sources", cfg.sources)
     source_cfg = sources_cfg.get("producthunt_api")
     if not isinstance(source_cfg, dict):
@@ -196,6 +252,17 @@ def run_producthunt_fixture(
         raise ValueError("producthunt_api.fixture_path is required.")
 
     path = cfg.paths.repo_root / fixture_path
+    params = {
+        "source": "producthunt_api",
+        "mode": "fixture",
+        "limit": limit,
+        "fixture_path": fixture_path,
+    }
+    if reuse:
+        run_dir = get_run_dir(cfg, "producthunt_api", run_date, mode="fixture")
+        previous = reusable_result([run_dir], params, [path])
+        if previous is not None:
+            return {**previous, "skipped": True}
     with path.open("r", encoding="utf-8") as f:
         data = json.load(f)
 
@@ -203,6 +270,12 @@ def run_producthunt_fixture(
     if limit is not None and limit >= 0:
         leads = leads[:limit]
 
+    payload: dict[str, object] = {
+        "source": "producthunt_api",
+        "mode": "fixture",
+        "url_or_fixture": fixture_path,
+        "count": len(leads),
+    }
     output_path = write_leads(
         cfg,
         "producthunt_api",
@@ -210,33 +283,33 @@ def run_producthunt_fixture(
         run_date=run_date,
         mode="fixture",
         overwrite=overwrite,
+        params=params,
+        inputs=[path],
+        result=payload,
     )
-    return {
-        "source": "producthunt_api",
-        "mode": "fixture",
-        "url_or_fixture": fixture_path,
-        "count": len(leads),
-        "output_path": str(output_path),
-    }
+    payload["output_path"] = str(output_path)
+    return payload
 
 
-def run_producthunt_live(
-    cfg: ProjectConfig,
-    limit: int,
-    run_date: date,
-    order: str = "RANKING",
-    featured: bool = False,
-    posted_after: str | None = None,
-    posted_before: str | None = None,
-    overwrite: bool = False,
-) -> dict[str, object]:
+API_URL = "https://api.producthunt.com/v2/api/graphql"
+RATE_LIMIT_HEADERS = (
+    "X-Rate-Limit-Limit",
+    "X-Rate-Limit-Remaining",
+    "X-Rate-Limit-Reset",
+)
+
+PageFetcher = Callable[[dict[str, Any]], tuple[dict[str, Any], dict[str, str]]]
+
+
+def make_page_fetcher(cfg: ProjectConfig, page_size: int) -> PageFetcher:
     token = os.getenv("PRODUCTHUNT_DEV_TOKEN")
     if not token:
         raise ValueError("Set PRODUCTHUNT_DEV_TOKEN to use live Product Hunt API.")
 
     timeout, sleep_seconds, max_retries = _live_scrape_settings(cfg)
     headers = {"Authorization": f"Bearer {token}"}
-    query = build_query(limit if limit > 0 else 20)
+    client = get_client(cfg)
+    query = build_query(page_size)
 
     @retry(
         stop=stop_after_attempt(max_retries),
@@ -244,24 +317,80 @@ def run_producthunt_live(
         reraise=True,
     )
     def _fetch(variables: dict[str, Any]) -> tuple[dict[str, Any], dict[str, str]]:
-        response = requests.post(
-            "https://api.producthunt.com/v2/api/graphql",
+        # The client's rate limiter paces calls from the X-Rate-Limit-* headers
+        # and, on a 429, holds the bucket until the reset before the retry.
+        response = client.post(
+            API_URL,
             headers=headers,
             json={"query": query, "variables": variables},
             timeout=timeout,
+            rate_key="producthunt_api",
         )
-        if response.status_code == 429:
-            reset = response.headers.get("X-Rate-Limit-Reset")
-            try:
-                sleep_for = int(reset) if reset is not None else sleep_seconds
-            except ValueError:
-                sleep_for = sleep_seconds
-            sleep_for = max(1, min(sleep_for, 60))
-            time.sleep(sleep_for)
-            response.raise_for_status()
         response.raise_for_status()
         return response.json(), dict(response.headers)
 
+    return _fetch
+
+
+def iter_pages(
+    fetch: PageFetcher,
+    query_vars: dict[str, Any],
+    limit: int,
+    after: str | None = None,
+    rate_limit: dict[str, str] | None = None,
+) -> Iterator[tuple[list[Lead], str | None, bool]]:
+    """Follow one cursor chain, yielding ``(batch, end_cursor, exhausted)``."""
+    written = 0
+    while written < limit:
+        variables = {"first": min(20, limit - written), "after": after, **query_vars}
+        data, response_headers = fetch(variables)
+        _raise_for_graphql_errors(data)
+
+        if rate_limit is not None:
+            for header in RATE_LIMIT_HEADERS:
+                value = response_headers.get(header)
+                if value is not None:
+                    rate_limit[header] = value
+
+        batch = parse_producthunt_response(data, source="producthunt_api")
+        batch = batch[: limit - written]
+        written += len(batch)
+        has_next, end_cursor = _page_info(data)
+        if end_cursor:
+            after = end_cursor
+        exhausted = not batch or not has_next or not end_cursor
+        yield batch, after, exhausted
+        if exhausted:
+            return
+
+
+def run_producthunt_live(
+    cfg: ProjectConfig,
+    limit: int,
+    run_date: date,
+    order: str = "RANKING",
+    featured: bool = False,
+    posted_after: str | None = None,
+    posted_before: str | None = None,
+    overwrite: bool = False,
+    resume: bool = False,
+) -> dict[str, object]:
+    """Crawl the GraphQL API page by page, streaming each page to storage.
+
+    Every page is appended through ``StageWriter``, so it reaches the
+    configured ``storage.backend`` (and the ``.idx`` sidecar) like any other
+    write. After every page the cursor, query variables, the NDJSON size and
+    the stored row count are written to ``_checkpoint.json`` in the run dir.
+    With ``resume`` the crawl drops any page written after the last
+    checkpoint and continues from its cursor, so completed pages are never
+    fetched twice.
+    """
+    if resume and overwrite:
+        raise ValueError("--resume cannot be combined with --overwrite.")
+
+    started = time.perf_counter()
+    fetch = make_page_fetcher(cfg, limit if limit > 0 else 20)
+
     if limit <= 0:
         output_path = write_leads(
             cfg,
@@ -274,67 +403,149 @@ def run_producthunt_live(
         return {
             "source": "producthunt_api",
             "mode": "live",
-            "url_or_fixture": "https://api.producthunt.com/v2/api/graphql",
+            "url_or_fixture": API_URL,
             "count": 0,
             "output_path": str(output_path),
         }
 
-    leads: list[Lead] = []
-    remaining = limit
-    after: str | None = None
-    rate_limit: dict[str, str] = {}
+    logical_path = get_run_dir(cfg, "producthunt_api", run_date, mode="live")
+    logical_path = logical_path / "leads.ndjson"
+    cp_path = checkpoint_path(logical_path)
+    run_date_str = run_date.isoformat()
+    settings = storage_settings(cfg)
+    compression = settings.compression
+    payloads = open_payload_store(cfg)
+    existing = find_ndjson(logical_path)
+    if existing is not None and not overwrite:
+        # Keep appending in the codec the partition was started with.
+        compression = compression_of(existing)
+    query_vars = {
+        "order": order,
+        "topic": None,
+        "featured": featured,
+        "postedBefore": posted_before,
+        "postedAfter": posted_after,
+    }
 
-    while remaining > 0:
-        page_size = min(20, remaining)
-        variables = {
-            "first": page_size,
-            "after": after,
-            "order": order,
-            "topic": None,
-            "featured": featured,
-            "postedBefore": posted_before,
-            "postedAfter": posted_after,
-        }
-        data, response_headers = _fetch(variables)
-        _raise_for_graphql_errors(data)
+    written = 0
+    after: str | None = None
+    complete = False
+    if resume:
+        checkpoint = read_checkpoint(cp_path)
+        if checkpoint is None:
+            raise ValueError(f"No checkpoint to resume from: {cp_path}")
+        if checkpoint.get("variables") != query_vars or checkpoint.get("windows"):
+            raise ValueError(
+                "Checkpoint query variables do not match this run; "
+                "rerun without --resume to start over."
+            )
+        written = int(checkpoint.get("count") or 0)
+        prior = int(checkpoint.get("prior") or 0)
+        after = checkpoint.get("after")
+        complete = bool(checkpoint.get("complete"))
+        compression = str(checkpoint.get("compression") or "none")
+    else:
+        # Rows already in the partition this crawl appends to.
+        prior = 0 if overwrite else existing_record_count(logical_path)
+    # Pages are fsynced before their checkpoint claims them.
+    settings = dataclasses.replace(settings, compression=compression, fsync=True)
+    output_path = compressed_path(logical_path, compression)
+
+    def _write(batch: list[Lead], append: bool = True) -> StageWriter:
+        with StageWriter(
+            cfg,
+            "raw",
+            run_date_str,
+            logical_path,
+            source="producthunt_api",
+            append=append,
+            settings=settings,
+        ) as writer:
+            writer.write_many_leads(batch)
+        return writer
+
+    def _sizes() -> tuple[int, int]:
+        size = output_path.stat().st_size if settings.uses_ndjson else 0
+        rows = 0
+        if settings.uses_sqlite:
+            with open_store(cfg, settings) as store:
+                rows = store.count("raw", run_date_str, ["producthunt_api"])
+        return size, rows
+
+    if resume:
+        size = int(checkpoint.get("bytes") or 0)
+        if settings.uses_ndjson:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with output_path.open("ab") as f:
+                f.truncate(size)
+        if settings.uses_sqlite:
+            with open_store(cfg, settings) as store:
+                store.truncate(
+                    "raw", run_date_str, "producthunt_api", int(checkpoint.get("rows") or 0)
+                )
+    # Creates the partition, emptied with ``overwrite``.
+    writer = _write([], append=not overwrite)
+
+    def _save_checkpoint() -> None:
+        size, rows = _sizes()
+        write_checkpoint(
+            cp_path,
+            {
+                "variables": query_vars,
+                "after": after,
+                "count": written,
+                "prior": prior,
+                "limit": limit,
+                "bytes": size,
+                "rows": rows,
+                "compression": compression,
+                "complete": complete,
+                "updated_at": _utc_now_z(),
+            },
+        )
 
-        for header in (
-            "X-Rate-Limit-Limit",
-            "X-Rate-Limit-Remaining",
-            "X-Rate-Limit-Reset",
-        ):
-            value = response_headers.get(header)
-            if value is not None:
-                rate_limit[header] = value
+    if not resume:
+        _save_checkpoint()
 
-        batch = parse_producthunt_response(data, source="producthunt_api")
-        if not batch:
-            break
-        leads.extend(batch)
-        remaining = limit - len(leads)
-
-        posts = data.get("data", {}).get("posts", {})
-        page_info = posts.get("pageInfo", {}) if isinstance(posts, dict) else {}
-        has_next = bool(page_info.get("hasNextPage"))
-        end_cursor = page_info.get("endCursor")
-        if not has_next or not end_cursor:
-            break
-        after = str(end_cursor)
+    rate_limit: dict[str, str] = {}
+    pages = 0
 
-    output_path = write_leads(
-        cfg,
-        "producthunt_api",
-        leads,
-        run_date=run_date,
-        mode="live",
-        overwrite=overwrite,
+    if not complete and written < limit:
+        for batch, after, complete in iter_pages(
+            fetch, query_vars, limit - written, after=after, rate_limit=rate_limit
+        ):
+            pages += 1
+            if batch:
+                if payloads is not None:
+                    batch = list(payloads.externalize_leads(batch))
+                _write(batch)
+            written += len(batch)
+            _save_checkpoint()
+
+    write_partition_manifest(
+        logical_path.parent,
+        "raw",
+        run_date_str,
+        outputs=writer.files,
+        record_count=prior + written,
+        started=started,
+        params={
+            "source": "producthunt_api",
+            "mode": "live",
+            "variables": query_vars,
+            "limit": limit,
+        },
+        complete=complete or written >= limit,
     )
     payload: dict[str, object] = {
         "source": "producthunt_api",
         "mode": "live",
-        "url_or_fixture": "https://api.producthunt.com/v2/api/graphql",
-        "count": len(leads),
-        "output_path": str(output_path),
+        "url_or_fixture": API_URL,
+        "count": written,
+        "pages": pages,
+        "resumed": resume,
+        "output_path": str(writer.path),
+        "checkpoint_path": str(cp_path),
     }
     if rate_limit:
         payload["rate_limit"] = rate_limit
@@ -3,14 +3,20 @@ from __future__ import annotations  # no installation needed
 from datetime import date, datetime, timezone  # no installation needed
 from urllib.parse import urljoin, urlparse  # no installation needed
 
-import requests  # already in env; no new install
-from bs4 import BeautifulSoup  # already in env; no new install
 from tenacity import retry, stop_after_attempt, wait_fixed  # already in env
 
 from ...config import ProjectConfig  # no installation needed
+from .fetch_pool import collect_leads, crawl_seeds  # no installation needed
 from .generic_html import fetch_html  # no installation needed
+from .html_engine import (  # no installation needed
+    DEFAULT_ENGINE,
+    parser_engine,
+    select_cards,
+)
+from .partition_manifest import reusable_result  # no installation needed
 from .schema import Lead  # no installation needed
-from .storage import write_leads  # no installation needed
+from .storage import get_run_dir, write_leads  # no installation needed
+from .transport import get_client, local_paths  # no installation needed
 
 
 def _utc_now_z() -> str:
@@ -32,45 +38,29 @@ def _parse_int(text: str) -> int | None:
 
 
 def parse_producthunt_listing_html(
-    html: str, base_url: str | None = None
+    html: str, base_url: str | None = None, engine: str = DEFAULT_ENGINE
 ) -> list[Lead]:
-    soup = BeautifulSoup(html, "html.parser")
-    cards = soup.select("div.ph-card")
+    cards = select_cards(html, "div.ph-card", engine=engine)
     discovered_at = _utc_now_z()
     leads: list[Lead] = []
 
     for idx, card in enumerate(cards, start=1):
-        name_el = card.select_one(".ph-name")
-        name = name_el.get_text(strip=True) if name_el else ""
-
-        link_el = card.select_one("a.ph-link")
-        href = ""
-        if link_el:
-            value = link_el.get("href")
-            href = value.strip() if isinstance(value, str) else ""
+        name = card.text(".ph-name") or ""
+        href = (card.attr("a.ph-link", "href") or "").strip()
 
         resolved_url = href
         if href and base_url:
             resolved_url = urljoin(base_url, href)
 
-        tagline_el = card.select_one(".ph-tagline")
-        tagline = tagline_el.get_text(strip=True) if tagline_el else ""
+        tagline = card.text(".ph-tagline") or ""
 
-        upvotes_el = card.select_one(".ph-upvotes")
-        upvotes = _parse_int(upvotes_el.get_text(strip=True)) if upvotes_el else None
+        upvotes_text = card.text(".ph-upvotes")
+        upvotes = _parse_int(upvotes_text) if upvotes_text is not None else None
 
-        topics = [
-            topic.get_text(strip=True)
-            for topic in card.select(".ph-topics li")
-            if topic.get_text(strip=True)
-        ]
+        topics = [topic for topic in card.texts(".ph-topics li") if topic]
 
-        website_el = card.select_one("a.ph-website")
-        website = None
-        if website_el:
-            website_href = website_el.get("href")
-            if isinstance(website_href, str) and website_href.strip():
-                website = website_href.strip()
+        website_href = card.attr("a.ph-website", "href")
+        website = website_href.strip() if website_href and website_href.strip() else None
 
         if not (name or resolved_url or tagline):
             continue
@@ -110,34 +100,85 @@ def run_producthunt_html(
     limit: int,
     run_date: date | None = None,
     seed_url: str | None = None,
+    overwrite: bool = False,
+    reuse: bool = False,
 ) -> dict[str, object]:
+    """Parse the configured listing pages into the ``producthunt_html`` raw partition.
+
+    With ``reuse`` the recorded result is returned while the config and the
+    local seed files are unchanged since the partition was written.
+    """
     sources_cfg = cfg.sources.get("sources", cfg.sources)
     source_cfg = sources_cfg.get("producthunt_html")
     if not isinstance(source_cfg, dict):
         raise ValueError("Missing producthunt_html config.")
 
     seed_urls = source_cfg.get("seed_urls") or []
-    if seed_url is None:
-        if not seed_urls:
-            raise ValueError("producthunt_html.seed_urls must include at least one URL.")
-        seed_url = seed_urls[0]
+    if seed_url is not None:
+        seed_urls = [seed_url]
+    if not seed_urls:
+        raise ValueError("producthunt_html.seed_urls must include at least one URL.")
 
-    base_url = source_cfg.get("base_url")
-    if base_url is None:
-        base_url = seed_url if _is_http_url(seed_url) else None
+    configured_base_url = source_cfg.get("base_url")
+    engine = parser_engine(cfg)
 
-    html = fetch_html(seed_url)
-    leads = parse_producthunt_listing_html(html, base_url=base_url)
-    if limit is not None and limit >= 0:
-        leads = leads[:limit]
+    if run_date is None:
+        run_date = date.today()
+    params = {
+        "source": "producthunt_html",
+        "mode": None,
+        "limit": limit,
+        "config": source_cfg,
+        "seed_urls": seed_urls,
+        "engine": engine,
+    }
+    inputs = local_paths(seed_urls)
+    if reuse and inputs is not None:
+        run_dir = get_run_dir(cfg, "producthunt_html", run_date)
+        previous = reusable_result([run_dir], params, inputs)
+        if previous is not None:
+            return {**previous, "skipped": True}
+
+    def _parse(url: str, html: str) -> list[Lead]:
+        base_url = configured_base_url
+        if base_url is None:
+            base_url = url if _is_http_url(url) else None
+        return parse_producthunt_listing_html(html, base_url=base_url, engine=engine)
+
+    client = get_client(cfg)
+    cache_before = client.cache_counts()
+    throttled_before = client.throttled_seconds()
+    seeds, leads_by_seed, errors = crawl_seeds(
+        cfg,
+        seed_urls,
+        lambda url: fetch_html(url, client=client),
+        _parse,
+        client=client,
+    )
+    leads = collect_leads(seeds, leads_by_seed, limit)
 
-    output_path = write_leads(cfg, "producthunt_html", leads, run_date=run_date)
-    return {
+    payload: dict[str, object] = {
         "source": "producthunt_html",
-        "url": seed_url,
+        "urls": seeds,
         "count": len(leads),
-        "output_path": str(output_path),
+        "seed_counts": {seed: len(leads_by_seed.get(seed, [])) for seed in seeds},
+        "http_cache": client.cache_counts(since=cache_before),
+        "throttled_seconds": client.throttled_seconds(since=throttled_before),
     }
+    if errors:
+        payload["seed_errors"] = errors
+    output_path = write_leads(
+        cfg,
+        "producthunt_html",
+        leads,
+        run_date=run_date,
+        overwrite=overwrite,
+        params=params,
+        inputs=inputs or (),
+        result=payload,
+    )
+    payload["output_path"] = str(output_path)
+    return payload
 
 
 def _live_scrape_settings(cfg: ProjectConfig) -> tuple[int, int, int]:
@@ -170,7 +211,9 @@ def run_producthunt_live(
     run_date: date | None = None,
 ) -> dict[str, object]:
     timeout, sleep_seconds, max_retries = _live_scrape_settings(cfg)
-    headers = {"User-Agent": "acq-pipeline/0.1 (+https://example.com)"}
+    client = get_client(cfg)
+    cache_before = client.cache_counts()
+    throttled_before = client.throttled_seconds()
 
     @retry(
         stop=stop_after_attempt(max_retries),
@@ -178,12 +221,12 @@ def run_producthunt_live(
         reraise=True,
     )
     def _fetch() -> str:
-        response = requests.get(url, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        return response.text
+        return client.fetch_text(url, timeout=timeout)
 
     html = _fetch()
-    leads = parse_producthunt_listing_html(html, base_url=url)
+    leads = parse_producthunt_listing_html(
+        html, base_url=url, engine=parser_engine(cfg)
+    )
     if limit is not None and limit >= 0:
         leads = leads[:limit]
 
@@ -193,4 +236,6 @@ def run_producthunt_live(
         "url": url,
         "count": len(leads),
         "output_path": str(output_path),
+        "http_cache": client.cache_counts(since=cache_before),
+        "throttled_seconds": client.throttled_seconds(since=throttled_before),
     }
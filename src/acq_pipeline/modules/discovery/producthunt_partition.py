@@ -0,0 +1,441 @@
+from __future__ import annotations  # no installation needed
+
+import threading  # no installation needed
+import time  # no installation needed
+from collections import deque  # no installation needed
+from concurrent.futures import (  # no installation needed
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import asdict, dataclass  # no installation needed
+from datetime import date, datetime, timedelta, timezone  # no installation needed
+from pathlib import Path  # no installation needed
+from typing import Any  # no installation needed
+
+from ...config import ProjectConfig  # no installation needed
+from .lead_store import StageWriter, iter_stage, stage_exists  # no installation needed
+from .partition_manifest import write_partition_manifest  # no installation needed
+from .payload_store import open_payload_store  # no installation needed
+from .producthunt_api import (  # no installation needed
+    API_URL,
+    PageFetcher,
+    checkpoint_path,
+    iter_pages,
+    make_page_fetcher,
+    read_checkpoint,
+    write_checkpoint,
+)
+from .storage import (  # no installation needed
+    append_leads,
+    get_run_dir,
+    iter_ndjson,
+)
+
+
+def _utc_now_z() -> str:
+    return (
+        datetime.now(timezone.utc)
+        .replace(microsecond=0)
+        .isoformat()
+        .replace("+00:00", "Z")
+    )
+
+
+@dataclass(frozen=True)
+class PartitionSettings:
+    """Window planning options from ``sources.yaml`` ``producthunt_api.partition``."""
+
+    window_hours: float = 24.0
+    min_window_hours: float = 1.0
+    max_window_hours: float = 24.0 * 7
+    target_pages: int = 5
+    max_workers: int = 4
+
+
+def partition_settings(cfg: ProjectConfig) -> PartitionSettings:
+    sources_cfg = cfg.sources.get("sources", cfg.sources)
+    source_cfg = sources_cfg.get("producthunt_api") or {}
+    settings = source_cfg.get("partition") if isinstance(source_cfg, dict) else {}
+    if not isinstance(settings, dict):
+        settings = {}
+    defaults = PartitionSettings()
+
+    def _get_float(key: str, default: float) -> float:
+        try:
+            return max(0.0, float(settings.get(key, default)))
+        except (TypeError, ValueError):
+            return default
+
+    min_hours = _get_float("min_window_hours", defaults.min_window_hours)
+    min_hours = max(min_hours, 1 / 60)
+    max_hours = _get_float("max_window_hours", defaults.max_window_hours)
+    max_hours = max(max_hours, min_hours)
+    window_hours = _get_float("window_hours", defaults.window_hours)
+    return PartitionSettings(
+        window_hours=min(max(window_hours, min_hours), max_hours),
+        min_window_hours=min_hours,
+        max_window_hours=max_hours,
+        target_pages=max(1, int(_get_float("target_pages", defaults.target_pages))),
+        max_workers=max(1, int(_get_float("max_workers", defaults.max_workers))),
+    )
+
+
+def parse_datetime(value: str) -> datetime:
+    text = value.strip()
+    if text.endswith("Z"):
+        text = f"{text[:-1]}+00:00"
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError as exc:
+        raise ValueError(f"Invalid ISO datetime: {value}") from exc
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def format_datetime(value: datetime) -> str:
+    return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def next_window_hours(
+    current: float, pages: int, settings: PartitionSettings
+) -> float:
+    """Size the next new window from a finished window's page count.
+
+    Halved after a dense window, doubled after a sparse one. A window that
+    is itself too dense is split by ``split_window`` instead.
+    """
+    if pages > settings.target_pages:
+        return max(settings.min_window_hours, current / 2)
+    if pages * 2 < settings.target_pages:
+        return min(settings.max_window_hours, current * 2)
+    return current
+
+
+@dataclass
+class Window:
+    index: int
+    start: str
+    end: str
+    pages: int = 0
+    count: int = 0
+    complete: bool = False
+
+
+def split_window(
+    window: Window, first_index: int, settings: PartitionSettings
+) -> list[Window] | None:
+    """Halves of ``window``, or None when they would be under ``min_window_hours``."""
+    start = parse_datetime(window.start)
+    span = parse_datetime(window.end) - start
+    if span < timedelta(hours=settings.min_window_hours) * 2:
+        return None
+    middle = format_datetime(start + span / 2)
+    return [
+        Window(index=first_index, start=window.start, end=middle),
+        Window(index=first_index + 1, start=middle, end=window.end),
+    ]
+
+
+def _next_index(windows: list[Window]) -> int:
+    return max((window.index for window in windows), default=-1) + 1
+
+
+def _post_key(record: dict[str, Any]) -> str:
+    raw = record.get("raw") or {}
+    return str(raw.get("id") or record.get("source_url") or record)
+
+
+def _shard_path(shards_dir: Path, window: Window) -> Path:
+    return shards_dir / f"{window.index:05d}.ndjson"
+
+
+def _merge_shards(
+    cfg: ProjectConfig,
+    run_date: str,
+    shards: list[Path],
+    output_path: Path,
+    limit: int,
+    overwrite: bool,
+) -> tuple[StageWriter, int, int]:
+    """Concatenate shards in window order into the raw partition, dropping repeated post ids.
+
+    Writes through ``StageWriter`` so the merged partition lands in the
+    configured ``storage.backend``. When appending, the ids already in the
+    partition count as seen; returns the writer, the number of records that
+    were already there and the duplicates dropped.
+    """
+    seen: set[str] = set()
+    prior = 0
+    if not overwrite and stage_exists(
+        cfg, "raw", run_date, output_path, source="producthunt_api"
+    ):
+        for record in iter_stage(
+            cfg, "raw", run_date, output_path, source="producthunt_api"
+        ):
+            seen.add(_post_key(record))
+            prior += 1
+    duplicates = 0
+    with StageWriter(
+        cfg,
+        "raw",
+        run_date,
+        output_path,
+        source="producthunt_api",
+        append=not overwrite,
+    ) as writer:
+        for shard in shards:
+            if not shard.exists():
+                continue
+            for record in iter_ndjson(shard):
+                if writer.count >= limit:
+                    break
+                key = _post_key(record)
+                if key in seen:
+                    duplicates += 1
+                    continue
+                seen.add(key)
+                writer.write(record)
+    return writer, prior, duplicates
+
+
+def run_producthunt_partitioned(
+    cfg: ProjectConfig,
+    limit: int,
+    run_date: date,
+    posted_after: str,
+    posted_before: str,
+    order: str = "RANKING",
+    featured: bool = False,
+    overwrite: bool = False,
+    resume: bool = False,
+    fetch: PageFetcher | None = None,
+) -> dict[str, object]:
+    """Crawl ``[posted_after, posted_before)`` as concurrent time windows.
+
+    Windows are handed out in chronological order on a worker pool that shares
+    the client's rate budget. A window that needs more than ``target_pages``
+    pages is abandoned and re-queued as two halves (down to
+    ``min_window_hours``), and each finished window's page count sizes the
+    next new window (halved when dense, doubled when sparse). Shards are written under
+    ``live/_shards`` and merged into ``live/leads.ndjson`` deduplicated on the
+    post id. Completed windows are checkpointed and skipped on ``resume``.
+    """
+    if resume and overwrite:
+        raise ValueError("--resume cannot be combined with --overwrite.")
+    started = time.perf_counter()
+    start = parse_datetime(posted_after)
+    end = parse_datetime(posted_before)
+    if start >= end:
+        raise ValueError("posted-after must be earlier than posted-before.")
+
+    settings = partition_settings(cfg)
+    if fetch is None:
+        fetch = make_page_fetcher(cfg, 20)
+
+    run_dir = get_run_dir(cfg, "producthunt_api", run_date, mode="live")
+    output_path = run_dir / "leads.ndjson"
+    shards_dir = run_dir / "_shards"
+    cp_path = checkpoint_path(output_path)
+    base_vars: dict[str, Any] = {"order": order, "topic": None, "featured": featured}
+    query_vars = {
+        **base_vars,
+        "postedBefore": format_datetime(end),
+        "postedAfter": format_datetime(start),
+    }
+
+    windows: list[Window] = []
+    next_start = start
+    window_hours = settings.window_hours
+    if resume:
+        checkpoint = read_checkpoint(cp_path)
+        if checkpoint is None:
+            raise ValueError(f"No checkpoint to resume from: {cp_path}")
+        if checkpoint.get("variables") != query_vars or "windows" not in checkpoint:
+            raise ValueError(
+                "Checkpoint query variables do not match this run; "
+                "rerun without --resume to start over."
+            )
+        windows = [Window(**item) for item in checkpoint["windows"]]
+        next_start = parse_datetime(checkpoint["next_start"])
+        window_hours = float(checkpoint.get("window_hours") or window_hours)
+        if checkpoint.get("complete"):
+            return {
+                "source": "producthunt_api",
+                "mode": "live",
+                "partitioned": True,
+                "url_or_fixture": API_URL,
+                "count": int(checkpoint.get("count") or 0),
+                "windows": len(windows),
+                "pages": 0,
+                "resumed": True,
+                "output_path": str(output_path),
+                "checkpoint_path": str(cp_path),
+            }
+    elif shards_dir.exists():
+        for stale in shards_dir.glob("*.ndjson"):
+            stale.unlink()
+
+    payloads = open_payload_store(cfg)
+    lock = threading.Lock()
+    stop = threading.Event()
+    total = sum(window.count for window in windows if window.complete)
+    pages_fetched = 0
+    rate_limit: dict[str, str] = {}
+    too_dense: set[int] = set()
+
+    def _save_checkpoint(complete: bool = False) -> None:
+        write_checkpoint(
+            cp_path,
+            {
+                "variables": query_vars,
+                "windows": [asdict(window) for window in windows],
+                "next_start": format_datetime(next_start),
+                "window_hours": window_hours,
+                "limit": limit,
+                "count": total,
+                "complete": complete,
+                "updated_at": _utc_now_z(),
+            },
+        )
+
+    def _crawl(window: Window) -> Window:
+        nonlocal total, pages_fetched
+        shard = _shard_path(shards_dir, window)
+        shard.parent.mkdir(parents=True, exist_ok=True)
+        shard.write_text("", encoding="utf-8")
+        window.pages = 0
+        window.count = 0
+        window_vars = {
+            **base_vars,
+            "postedAfter": window.start,
+            "postedBefore": window.end,
+        }
+        # Filled by this worker only; copied into ``rate_limit`` under the lock.
+        window_rate_limit: dict[str, str] = {}
+        for batch, _after, exhausted in iter_pages(
+            fetch, window_vars, limit, rate_limit=window_rate_limit
+        ):
+            if batch:
+                if payloads is not None:
+                    batch = list(payloads.externalize_leads(batch))
+                append_leads(shard, batch)
+            window.pages += 1
+            window.count += len(batch)
+            with lock:
+                pages_fetched += 1
+                total += len(batch)
+                rate_limit.update(window_rate_limit)
+                if total >= limit:
+                    stop.set()
+            if exhausted:
+                window.complete = True
+                break
+            if stop.is_set():
+                break
+            if window.pages > settings.target_pages and split_window(
+                window, 0, settings
+            ):
+                # Its halves refetch everything, so this window's leads go.
+                with lock:
+                    total -= window.count
+                    too_dense.add(window.index)
+                shard.unlink(missing_ok=True)
+                window.count = 0
+                break
+        return window
+
+    queue: deque[Window] = deque(window for window in windows if not window.complete)
+    first_error: BaseException | None = None
+
+    with ThreadPoolExecutor(max_workers=settings.max_workers) as pool:
+        in_flight: dict[Future[Window], Window] = {}
+
+        def _dispatch() -> None:
+            nonlocal next_start
+            while len(in_flight) < settings.max_workers and not stop.is_set():
+                if queue:
+                    window = queue.popleft()
+                elif next_start < end:
+                    window_end = min(end, next_start + timedelta(hours=window_hours))
+                    window = Window(
+                        index=_next_index(windows),
+                        start=format_datetime(next_start),
+                        end=format_datetime(window_end),
+                    )
+                    windows.append(window)
+                    next_start = window_end
+                else:
+                    return
+                in_flight[pool.submit(_crawl, window)] = window
+
+        if limit > 0:
+            _dispatch()
+        _save_checkpoint()
+        while in_flight:
+            done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in done:
+                window = in_flight.pop(future)
+                error = future.exception()
+                if error is not None:
+                    stop.set()
+                    if first_error is None:
+                        first_error = error
+                    continue
+                halves = None
+                if window.index in too_dense:
+                    halves = split_window(window, _next_index(windows), settings)
+                if halves:
+                    position = windows.index(window)
+                    windows[position : position + 1] = halves
+                    queue.extendleft(reversed(halves))
+                if halves or window.complete:
+                    window_hours = next_window_hours(
+                        window_hours, window.pages, settings
+                    )
+            if first_error is None:
+                _dispatch()
+            _save_checkpoint()
+
+    if first_error is not None:
+        raise first_error
+
+    shards = [_shard_path(shards_dir, window) for window in windows]
+    writer, prior, duplicates = _merge_shards(
+        cfg, run_date.isoformat(), shards, output_path, max(limit, 0), overwrite
+    )
+    count = writer.count
+    _save_checkpoint(complete=True)
+    write_partition_manifest(
+        run_dir,
+        "raw",
+        run_date.isoformat(),
+        outputs=writer.files,
+        record_count=prior + count,
+        started=started,
+        params={
+            "source": "producthunt_api",
+            "mode": "live",
+            "variables": query_vars,
+            "limit": limit,
+        },
+    )
+
+    payload: dict[str, object] = {
+        "source": "producthunt_api",
+        "mode": "live",
+        "partitioned": True,
+        "url_or_fixture": API_URL,
+        "count": count,
+        "duplicates_dropped": duplicates,
+        "windows": len(windows),
+        "pages": pages_fetched,
+        "resumed": resume,
+        "output_path": str(writer.path),
+        "checkpoint_path": str(cp_path),
+    }
+    if rate_limit:
+        payload["rate_limit"] = rate_limit
+    return payload
@@ -0,0 +1,185 @@
+from __future__ import annotations  # no installation needed
+
+import threading  # no installation needed
+import time  # no installation needed
+from dataclasses import dataclass  # no installation needed
+from typing import Any, Callable, Mapping  # no installation needed
+
+from ...config import ProjectConfig  # no installation needed
+
+
+@dataclass(frozen=True)
+class RateLimitSettings:
+    """Pacing options read from ``settings.yaml`` ``rate_limits``."""
+
+    sleep_seconds: float = 2.0
+    overrides: tuple[tuple[str, float], ...] = ()
+    burst: int = 1
+
+
+def rate_limit_settings(cfg: ProjectConfig | None) -> RateLimitSettings:
+    settings: Any = {}
+    if cfg is not None and isinstance(cfg.settings, dict):
+        settings = cfg.settings.get("rate_limits", {})
+    if not isinstance(settings, dict):
+        settings = {}
+
+    def _get_float(value: object, default: float) -> float:
+        try:
+            return max(0.0, float(value))  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            return default
+
+    overrides: dict[str, float] = {}
+    for block in ("per_source", "per_host"):
+        items = settings.get(block)
+        if isinstance(items, dict):
+            for key, value in items.items():
+                overrides[str(key).lower()] = _get_float(value, 2.0)
+
+    return RateLimitSettings(
+        sleep_seconds=_get_float(settings.get("per_source_sleep_seconds", 2), 2.0),
+        overrides=tuple(sorted(overrides.items())),
+        burst=max(1, int(_get_float(settings.get("burst", 1), 1.0))),
+    )
+
+
+def _header(headers: Mapping[str, str], name: str) -> str | None:
+    value = headers.get(name)
+    if value is None:
+        lowered = name.lower()
+        for key, item in headers.items():
+            if key.lower() == lowered:
+                return item
+    return value
+
+
+def _parse_number(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket (GCRA form) with a pause-until override.
+
+    ``reserve`` books the next slot and returns how long the caller must wait,
+    so both blocking and async callers can share one bucket.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.interval = max(0.0, interval)
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._next_free = 0.0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = self._clock()
+            slack = (self.burst - 1) * self.interval
+            start = max(now, self._next_free - slack, self._paused_until)
+            self._next_free = max(self._next_free, start) + self.interval
+            return start - now
+
+    def acquire(self) -> float:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def set_interval(self, interval: float) -> None:
+        with self._lock:
+            self.interval = max(0.0, interval)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+class RateLimiter:
+    """Per-source/per-host token buckets paced from config and response headers.
+
+    Buckets start at the configured interval. Once a server reports
+    ``X-Rate-Limit-Remaining``/``X-Rate-Limit-Reset`` the interval is re-derived
+    so the remaining budget is spread evenly over the reset window, using the
+    observed per-request cost when the budget is measured in points.
+    """
+
+    def __init__(
+        self,
+        settings: RateLimitSettings | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.settings = settings or RateLimitSettings()
+        self._overrides = dict(self.settings.overrides)
+        self._clock = clock
+        self._buckets: dict[str, TokenBucket] = {}
+        self._last_remaining: dict[str, float] = {}
+        self._cost: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.waited_seconds = 0.0
+
+    def bucket(self, key: str) -> TokenBucket:
+        key = key.lower()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                interval = self._overrides.get(key, self.settings.sleep_seconds)
+                bucket = TokenBucket(
+                    interval, burst=self.settings.burst, clock=self._clock
+                )
+                self._buckets[key] = bucket
+            return bucket
+
+    def reserve(self, key: str) -> float:
+        wait = self.bucket(key).reserve()
+        with self._lock:
+            self.waited_seconds += wait
+        return wait
+
+    def acquire(self, key: str) -> float:
+        wait = self.reserve(key)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def observe(
+        self, key: str, headers: Mapping[str, str], status_code: int | None = None
+    ) -> None:
+        bucket = self.bucket(key)
+        key = key.lower()
+        remaining = _parse_number(_header(headers, "X-Rate-Limit-Remaining"))
+        reset = _parse_number(_header(headers, "X-Rate-Limit-Reset"))
+
+        if status_code == 429:
+            retry_after = _parse_number(_header(headers, "Retry-After"))
+            wait = reset if reset is not None else retry_after
+            bucket.pause(wait if wait is not None else bucket.interval or 1.0)
+            return
+        if remaining is None or reset is None:
+            return
+
+        with self._lock:
+            previous = self._last_remaining.get(key)
+            self._last_remaining[key] = remaining
+            if previous is not None and 0 < previous - remaining:
+                spent = previous - remaining
+                cost = self._cost.get(key)
+                self._cost[key] = spent if cost is None else 0.5 * cost + 0.5 * spent
+            cost = max(1.0, self._cost.get(key, 1.0))
+
+        requests_left = remaining / cost
+        if requests_left < 1:
+            bucket.pause(max(reset, 0.0))
+            return
+        bucket.set_interval(max(reset, 0.0) / requests_left)
@@ -1,10 +1,22 @@
 from __future__ import annotations  # no installation needed
 
+import json  # no installation needed
 from dataclasses import dataclass, field  # no installation needed
+from json.encoder import encode_basestring  # no installation needed
 from typing import Optional  # no installation needed
 
+_encode = json.JSONEncoder(ensure_ascii=False).encode
 
-@dataclass
+
+def _encode_optional(value: object) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, str):
+        return encode_basestring(value)
+    return _encode(value)
+
+
+@dataclass(slots=True)
 class Lead:
     source: str
     source_url: str
@@ -27,6 +39,19 @@ class Lead:
             "raw": dict(self.raw),
         }
 
+    def to_json(self) -> str:
+        """``json.dumps(self.to_dict(), ensure_ascii=False)`` without the dict copies."""
+        return (
+            f'{{"source": {_encode_optional(self.source)}, '
+            f'"source_url": {_encode_optional(self.source_url)}, '
+            f'"discovered_at": {_encode_optional(self.discovered_at)}, '
+            f'"company_name": {_encode_optional(self.company_name)}, '
+            f'"website": {_encode_optional(self.website)}, '
+            f'"description": {_encode_optional(self.description)}, '
+            f'"signals": {_encode(self.signals)}, '
+            f'"raw": {_encode(self.raw)}}}'
+        )
+
     @classmethod
     def from_dict(cls, data: dict[str, object]) -> "Lead":
         if not isinstance(data, dict):
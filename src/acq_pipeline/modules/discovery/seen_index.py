@@ -0,0 +1,120 @@
+from __future__ import annotations  # no installation needed
+
+import sqlite3  # no installation needed
+from datetime import date  # no installation needed
+from pathlib import Path  # no installation needed
+from types import TracebackType  # no installation needed
+from typing import Iterable  # no installation needed
+
+from ...config import ProjectConfig  # no installation needed
+from .storage import StorageSettings, storage_settings  # no installation needed
+
+UPSERT_BATCH_SIZE = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_keys (
+    dedup_key TEXT PRIMARY KEY,
+    first_seen INTEGER NOT NULL,
+    last_seen INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+_UPSERT = """
+INSERT INTO seen_keys (dedup_key, first_seen, last_seen) VALUES (?, ?, ?)
+ON CONFLICT (dedup_key) DO UPDATE SET
+    first_seen = min(first_seen, excluded.first_seen),
+    last_seen = max(last_seen, excluded.last_seen)
+"""
+
+
+def seen_index_path(
+    cfg: ProjectConfig, settings: StorageSettings | None = None
+) -> Path:
+    settings = settings or storage_settings(cfg)
+    return cfg.paths.data_dir / settings.seen_index_path
+
+
+def _day(value: date | str) -> int:
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return value.toordinal()
+
+
+class SeenIndex:
+    """Every dedup key ever merged, with the first and last run date it appeared.
+
+    Keys live in a ``WITHOUT ROWID`` SQLite table clustered on the key, with
+    dates stored as day ordinals, so a lookup is one primary-key probe and
+    no past partition is ever re-read.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> SeenIndex:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def lookup(self, key: str) -> tuple[str, str] | None:
+        """``(first_seen, last_seen)`` as ISO dates, or ``None`` for a new key."""
+        row = self._conn.execute(
+            "SELECT first_seen, last_seen FROM seen_keys WHERE dedup_key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return date.fromordinal(row[0]).isoformat(), date.fromordinal(row[1]).isoformat()
+
+    def seen_before(self, key: str, run_date: date | str) -> bool:
+        """True when ``key`` was merged on a run date earlier than ``run_date``."""
+        row = self._conn.execute(
+            "SELECT 1 FROM seen_keys WHERE dedup_key = ? AND first_seen < ?",
+            (key, _day(run_date)),
+        ).fetchone()
+        return row is not None
+
+    def mark(self, keys: Iterable[str], run_date: date | str) -> int:
+        """Record ``keys`` as seen on ``run_date`` in one transaction."""
+        day = _day(run_date)
+        marked = 0
+        with self._conn:
+            batch: list[tuple[str, int, int]] = []
+            for key in keys:
+                if not key:
+                    continue
+                batch.append((key, day, day))
+                if len(batch) >= UPSERT_BATCH_SIZE:
+                    self._conn.executemany(_UPSERT, batch)
+                    marked += len(batch)
+                    batch = []
+            if batch:
+                self._conn.executemany(_UPSERT, batch)
+                marked += len(batch)
+        return marked
+
+    def clear(self) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM seen_keys")
+
+    def __len__(self) -> int:
+        return int(self._conn.execute("SELECT COUNT(*) FROM seen_keys").fetchone()[0])
+
+
+def open_seen_index(
+    cfg: ProjectConfig, settings: StorageSettings | None = None
+) -> SeenIndex:
+    return SeenIndex(seen_index_path(cfg, settings))
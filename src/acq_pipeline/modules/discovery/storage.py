@@ -1,12 +1,510 @@
 from __future__ import annotations  # no installation needed
 
+import gzip  # no installation needed
+import io  # no installation needed
 import json  # no installation needed
+import os  # no installation needed
+import threading  # no installation needed
+import time  # no installation needed
+from contextlib import ExitStack, contextmanager, nullcontext  # no installation needed
+from dataclasses import dataclass  # no installation needed
 from datetime import date, datetime  # no installation needed
 from pathlib import Path  # no installation needed
+from types import TracebackType  # no installation needed
+from typing import IO, Any, Callable, Iterable, Iterator  # no installation needed
 
 from ...config import ProjectConfig  # no installation needed
+from .keys import dedup_key, fields_key  # no installation needed
+from .offset_index import OffsetIndexBuilder, index_path_for  # no installation needed
 from .schema import Lead  # no installation needed
 
+try:
+    import fcntl  # no installation needed
+except ImportError:  # not on Windows; see partition_lock
+    fcntl = None  # type: ignore[assignment]
+
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+DEFAULT_CHUNK_SIZE = 10_000
+JSON_DECODERS = ("auto", "orjson", "json")
+COMPRESSIONS = ("none", "gzip", "zstd", "auto")
+BACKENDS = ("ndjson", "sqlite", "both")
+_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+JsonDecoder = Callable[[bytes | str], Any]
+
+
+@dataclass(frozen=True)
+class StorageSettings:
+    """Lead storage options read from ``settings.yaml`` ``storage``."""
+
+    fsync: bool = False
+    buffer_size: int = DEFAULT_BUFFER_SIZE
+    json_decoder: str = "auto"
+    compression: str = "none"
+    backend: str = "ndjson"
+    sqlite_path: str = "db/leads.sqlite"
+    seen_index_path: str = "state/seen_keys.sqlite"
+    offset_index: bool = True
+    raw_store: bool = False
+    raw_store_path: str = "payloads/raw"
+
+    @property
+    def uses_ndjson(self) -> bool:
+        return self.backend in {"ndjson", "both"}
+
+    @property
+    def uses_sqlite(self) -> bool:
+        return self.backend in {"sqlite", "both"}
+
+
+def storage_settings(cfg: ProjectConfig | None) -> StorageSettings:
+    settings: Any = {}
+    if cfg is not None and isinstance(cfg.settings, dict):
+        settings = cfg.settings.get("storage", {})
+    if not isinstance(settings, dict):
+        settings = {}
+    try:
+        buffer_kb = int(settings.get("buffer_kb", DEFAULT_BUFFER_SIZE // 1024))
+    except (TypeError, ValueError):
+        buffer_kb = DEFAULT_BUFFER_SIZE // 1024
+    decoder = str(settings.get("json_decoder") or "auto")
+    if decoder not in JSON_DECODERS:
+        raise ValueError(
+            f"Unknown storage.json_decoder '{decoder}'; expected one of {JSON_DECODERS}."
+        )
+    compression = str(settings.get("compression") or "none")
+    if compression not in COMPRESSIONS:
+        raise ValueError(
+            f"Unknown storage.compression '{compression}'; expected one of {COMPRESSIONS}."
+        )
+    backend = str(settings.get("backend") or "ndjson")
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown storage.backend '{backend}'; expected one of {BACKENDS}."
+        )
+    return StorageSettings(
+        fsync=bool(settings.get("fsync", False)),
+        buffer_size=max(4, buffer_kb) * 1024,
+        json_decoder=decoder,
+        compression=resolve_compression(compression),
+        backend=backend,
+        sqlite_path=str(settings.get("sqlite_path") or "db/leads.sqlite"),
+        seen_index_path=str(
+            settings.get("seen_index_path") or "state/seen_keys.sqlite"
+        ),
+        offset_index=bool(settings.get("offset_index", True)),
+        raw_store=bool(settings.get("raw_store", False)),
+        raw_store_path=str(settings.get("raw_store_path") or "payloads/raw"),
+    )
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard  # optional: requirements/storage.txt
+    except ImportError as exc:
+        raise ImportError(
+            "storage.compression: zstd needs zstandard "
+            "(pip install -r requirements/storage.txt)."
+        ) from exc
+    return zstandard
+
+
+def resolve_compression(name: str) -> str:
+    """Map ``auto`` to zstd when zstandard is installed and gzip otherwise."""
+    if name != "auto":
+        return name
+    try:
+        _zstandard()
+    except ImportError:
+        return "gzip"
+    return "zstd"
+
+
+def compressed_path(path: Path, compression: str) -> Path:
+    """On-disk name of the logical ``path``, e.g. ``leads.ndjson.gz`` for gzip."""
+    return path.with_name(path.name + _SUFFIXES[compression])
+
+
+def ndjson_variants(path: Path) -> list[Path]:
+    return [compressed_path(path, name) for name in _SUFFIXES]
+
+
+def find_ndjson(path: Path) -> Path | None:
+    """The existing file behind the logical ``path`` in any compression."""
+    for candidate in ndjson_variants(path):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def compression_of(path: Path) -> str:
+    for name, suffix in _SUFFIXES.items():
+        if suffix and path.name.endswith(suffix):
+            return name
+    return "none"
+
+
+def logical_path(path: Path) -> Path:
+    """``path`` without its compression suffix, e.g. ``leads.ndjson``."""
+    suffix = _SUFFIXES[compression_of(path)]
+    return path.with_name(path.name[: len(path.name) - len(suffix)])
+
+
+def lock_path_for(path: Path) -> Path:
+    logical = logical_path(path)
+    return logical.with_name(f"{logical.name}.lock")
+
+
+_held_locks = threading.local()
+_fallback_locks: dict[str, threading.Lock] = {}
+_fallback_guard = threading.Lock()
+
+
+@contextmanager
+def partition_lock(path: Path) -> Iterator[None]:
+    """Hold the single-writer lock of the partition file ``path``.
+
+    An advisory ``flock`` on ``<logical path>.lock`` serializes writers across
+    processes and threads, whichever compression the file uses. A thread that
+    already holds the lock re-enters it, so ``write_leads`` can wrap its
+    ``NdjsonWriter``. Without ``fcntl`` the lock is process-local.
+    """
+    lock_path = lock_path_for(path)
+    key = os.path.abspath(lock_path)
+    held: dict[str, int] = getattr(_held_locks, "counts", None) or {}
+    _held_locks.counts = held
+    if held.get(key):
+        held[key] += 1
+        try:
+            yield
+        finally:
+            held[key] -= 1
+        return
+
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with ExitStack() as stack:
+        if fcntl is not None:
+            handle = stack.enter_context(lock_path.open("a"))
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            stack.callback(fcntl.flock, handle.fileno(), fcntl.LOCK_UN)
+        else:
+            with _fallback_guard:
+                fallback = _fallback_locks.setdefault(key, threading.Lock())
+            stack.enter_context(fallback)
+        held[key] = 1
+        try:
+            yield
+        finally:
+            del held[key]
+
+
+def open_ndjson(path: Path) -> IO[bytes]:
+    """Open for binary line reads, decompressing gzip/zstd by their magic bytes."""
+    with path.open("rb") as probe:
+        magic = probe.read(4)
+    if magic.startswith(_GZIP_MAGIC):
+        return gzip.open(path, "rb")
+    if magic == _ZSTD_MAGIC:
+        reader = _zstandard().ZstdDecompressor().stream_reader(
+            path.open("rb"), read_across_frames=True, closefd=True
+        )
+        return io.BufferedReader(reader, DEFAULT_BUFFER_SIZE)
+    return path.open("rb", buffering=DEFAULT_BUFFER_SIZE)
+
+
+def _open_text_appender(path: Path, compression: str, buffer_size: int) -> IO[str]:
+    """Append-mode text handle; compressed files gain one gzip member or zstd frame."""
+    binary: Any
+    if compression == "gzip":
+        binary = gzip.open(path, "ab", compresslevel=6)
+    elif compression == "zstd":
+        binary = _zstandard().ZstdCompressor(level=3).stream_writer(
+            path.open("ab"), closefd=True, write_return_read=True
+        )
+    else:
+        return path.open("a", encoding="utf-8", buffering=buffer_size)
+    return io.TextIOWrapper(io.BufferedWriter(binary, buffer_size), encoding="utf-8")
+
+
+def _fsync_path(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def json_decoder(name: str = "auto") -> JsonDecoder:
+    """Return a JSON-line decoder; ``auto`` prefers orjson when installed.
+
+    ``auto`` retries a line orjson rejects (NaN, huge ints) with the stdlib.
+    """
+    if name not in JSON_DECODERS:
+        raise ValueError(f"Unknown JSON decoder '{name}'; expected one of {JSON_DECODERS}.")
+    if name == "json":
+        return json.loads
+    try:
+        import orjson  # optional; stdlib json is the fallback
+    except ImportError:
+        if name == "orjson":
+            raise
+        return json.loads
+    if name == "orjson":
+        return orjson.loads
+
+    fast = orjson.loads
+
+    def _decode(line: bytes | str) -> Any:
+        try:
+            return fast(line)
+        except orjson.JSONDecodeError:
+            return json.loads(line)
+
+    return _decode
+
+
+def _open_ndjson_from(stack: ExitStack, path: Path, offset: int) -> IO[bytes]:
+    """Like ``open_ndjson`` but starting ``offset`` bytes into the file on disk.
+
+    ``offset`` must be a line start, or for a compressed file the start of a
+    gzip member or zstd frame (every size ``append_leads`` returns is one).
+    """
+    with path.open("rb") as probe:
+        magic = probe.read(4)
+    raw = stack.enter_context(path.open("rb", buffering=DEFAULT_BUFFER_SIZE))
+    raw.seek(offset)
+    if magic.startswith(_GZIP_MAGIC):
+        return stack.enter_context(gzip.GzipFile(fileobj=raw, mode="rb"))
+    if magic == _ZSTD_MAGIC:
+        reader = _zstandard().ZstdDecompressor().stream_reader(
+            raw, read_across_frames=True, closefd=False
+        )
+        return stack.enter_context(io.BufferedReader(reader, DEFAULT_BUFFER_SIZE))
+    return raw
+
+
+def iter_ndjson(
+    path: Path, decoder: JsonDecoder | None = None, offset: int = 0
+) -> Iterator[dict]:
+    """Yield the records of an NDJSON file one at a time, skipping blank lines.
+
+    ``path`` is the logical name; a ``.gz``/``.zst`` sibling is found and
+    decompressed as it streams. A non-zero ``offset`` skips that many bytes of
+    the file on disk (see ``_open_ndjson_from``).
+    """
+    decode = decoder or json_decoder()
+    with ExitStack() as stack:
+        source = find_ndjson(path) or path
+        if offset:
+            f = _open_ndjson_from(stack, source, offset)
+        else:
+            f = stack.enter_context(open_ndjson(source))
+        for line in f:
+            if not line.strip():
+                continue
+            record = decode(line)
+            if not isinstance(record, dict):
+                raise ValueError(f"NDJSON record must be a dict: {path}")
+            yield record
+
+
+def _encoded_size(line: str) -> int:
+    return len(line) if line.isascii() else len(line.encode("utf-8"))
+
+
+class NdjsonWriter:
+    """Buffered NDJSON writer that replaces ``path`` atomically on close.
+
+    Records go to a temp file next to ``path`` through one large write buffer.
+    A clean exit flushes it (and fsyncs when asked) before renaming it over
+    ``path``; an exception discards it and leaves ``path`` untouched. With
+    ``append=True`` and a file of the same compression already there, records
+    are appended to it in place instead, so an append costs only the new
+    lines; an exception truncates the file back to where the writer started.
+    An existing file in another compression is copied into the temp file.
+    ``compression`` picks the on-disk file (``self.path``), e.g. ``.ndjson.gz``;
+    other variants of ``path`` are removed when the new file lands. With
+    ``index=True`` an uncompressed file also gets an ``.idx`` offset sidecar.
+    The partition lock is held from enter to exit, so a concurrent appender
+    waits and then copies this writer's lines instead of dropping them.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        append: bool = False,
+        fsync: bool = False,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        compression: str = "none",
+        index: bool = False,
+    ) -> None:
+        self.compression = resolve_compression(compression)
+        self.path = compressed_path(path, self.compression)
+        self.append = append
+        self.fsync = fsync
+        self.buffer_size = buffer_size
+        self.count = 0
+        self._logical_path = path
+        self._tmp_path = self.path.with_name(
+            f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        self._file: IO[str] | None = None
+        self._start: int | None = None  # size before an in-place append
+        self._lock = ExitStack()
+        self._index = (
+            OffsetIndexBuilder() if index and self.compression == "none" else None
+        )
+
+    def __enter__(self) -> NdjsonWriter:
+        self._lock.enter_context(partition_lock(self._logical_path))
+        try:
+            self._open()
+        except BaseException:
+            self._lock.close()
+            raise
+        return self
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        existing = find_ndjson(self._logical_path) if self.append else None
+        self._tmp_path.unlink(missing_ok=True)
+        if existing == self.path:
+            if self.compression == "none":
+                _drop_torn_line(existing)
+            self._start = existing.stat().st_size
+            if self._index is not None:
+                self._index.extend_from(existing)
+            self._file = _open_text_appender(
+                self.path, self.compression, self.buffer_size
+            )
+            return
+        self._file = _open_text_appender(
+            self._tmp_path, self.compression, self.buffer_size
+        )
+        if existing is not None and existing != self.path:
+            with open_ndjson(existing) as f:
+                for line in f:
+                    self._file.write(line.decode("utf-8"))
+                    if self._index is not None:
+                        self._index.add_line(line)
+
+    def write(self, record: dict[str, Any]) -> None:
+        if self._file is None:
+            raise RuntimeError("NdjsonWriter must be used as a context manager.")
+        if not isinstance(record, dict):
+            raise ValueError("record must be a dict.")
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        self._file.write(line)
+        if self._index is not None:
+            self._index.add(_encoded_size(line), dedup_key(record))
+        self.count += 1
+
+    def write_many(self, records: Iterable[dict[str, Any]]) -> int:
+        for record in records:
+            self.write(record)
+        return self.count
+
+    def write_lead(self, lead: Lead) -> None:
+        """Write ``lead`` through ``Lead.to_json``, skipping the ``to_dict`` copy."""
+        if self._file is None:
+            raise RuntimeError("NdjsonWriter must be used as a context manager.")
+        line = lead.to_json() + "\n"
+        self._file.write(line)
+        if self._index is not None:
+            key = fields_key(lead.website, lead.source_url, lead.company_name)
+            self._index.add(_encoded_size(line), key)
+        self.count += 1
+
+    def write_many_leads(self, leads: Iterable[Lead]) -> int:
+        for lead in leads:
+            self.write_lead(lead)
+        return self.count
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        with self._lock:
+            self._close(exc_type)
+
+    def _close(self, exc_type: type[BaseException] | None) -> None:
+        handle, self._file = self._file, None
+        if handle is None:
+            return
+        if self._start is not None:
+            self._close_in_place(handle, exc_type)
+            return
+        if exc_type is not None:
+            handle.close()
+            self._tmp_path.unlink(missing_ok=True)
+            return
+        handle.close()
+        if self.fsync:
+            _fsync_path(self._tmp_path)
+        os.replace(self._tmp_path, self.path)
+        for stale in ndjson_variants(self._logical_path):
+            if stale != self.path:
+                stale.unlink(missing_ok=True)
+                index_path_for(stale).unlink(missing_ok=True)
+        if self._index is not None:
+            self._index.write(self.path)
+        else:
+            index_path_for(self.path).unlink(missing_ok=True)
+
+    def _close_in_place(
+        self, handle: IO[str], exc_type: type[BaseException] | None
+    ) -> None:
+        start, self._start = self._start, None
+        handle.close()
+        if exc_type is not None:
+            with self.path.open("r+b") as f:
+                f.truncate(start)
+        elif self.fsync:
+            _fsync_path(self.path)
+        if exc_type is None and self._index is not None:
+            self._index.write(self.path)
+        else:
+            index_path_for(self.path).unlink(missing_ok=True)
+
+
+def _drop_torn_line(path: Path) -> None:
+    """Cut an uncompressed ``path`` back to just after its last newline.
+
+    A process killed mid-append leaves a partial last line; the next
+    in-place append would otherwise glue its first record onto it.
+    """
+    with path.open("r+b") as f:
+        end = pos = f.seek(0, os.SEEK_END)
+        while pos > 0:
+            step = min(DEFAULT_BUFFER_SIZE, pos)
+            f.seek(pos - step)
+            newline = f.read(step).rfind(b"\n")
+            if newline != -1:
+                pos = pos - step + newline + 1
+                break
+            pos -= step
+        if pos != end:
+            f.truncate(pos)
+
+
+def write_ndjson(
+    path: Path, records: Iterable[dict[str, Any]], settings: StorageSettings | None = None
+) -> int:
+    """Replace ``path`` with ``records``; returns the number of lines written."""
+    settings = settings or StorageSettings()
+    with NdjsonWriter(
+        path,
+        fsync=settings.fsync,
+        buffer_size=settings.buffer_size,
+        compression=settings.compression,
+    ) as writer:
+        return writer.write_many(records)
+
 
 def _run_date_str(run_date: date | str) -> str:
     if isinstance(run_date, datetime):
@@ -28,13 +526,82 @@ def get_run_dir(
     return base
 
 
+def find_leads_path(cfg: ProjectConfig, source: str, run_date: date | str) -> Path:
+    """Locate a source's leads for a date: the run dir first, then ``live``, ``fixture``."""
+    run_dir = get_run_dir(cfg, source, run_date)
+    for candidate in (
+        run_dir / "leads.ndjson",
+        run_dir / "live" / "leads.ndjson",
+        run_dir / "fixture" / "leads.ndjson",
+    ):
+        found = find_ndjson(candidate)
+        if found is not None:
+            return found
+    return run_dir / "leads.ndjson"
+
+
 def append_ndjson(path: Path, record_dict: dict[str, object]) -> None:
     if not isinstance(record_dict, dict):
         raise ValueError("record_dict must be a dict.")
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(record_dict, ensure_ascii=True))
-        f.write("\n")
+    line = json.dumps(record_dict, ensure_ascii=False) + "\n"
+    with partition_lock(path), path.open("a", encoding="utf-8") as f:
+        f.write(line)
+
+
+def append_leads(path: Path, leads: list[Lead], compression: str = "none") -> int:
+    """Append a batch of leads with one open; returns the file size afterwards.
+
+    Compressed files get one gzip member or zstd frame per batch, so every
+    returned size is a clean point to truncate back to. The batch lands under
+    the partition lock, so parallel appenders never interleave lines.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with partition_lock(path):
+        with _open_text_appender(
+            path, resolve_compression(compression), DEFAULT_BUFFER_SIZE
+        ) as f:
+            for lead in leads:
+                f.write(lead.to_json())
+                f.write("\n")
+        _fsync_path(path)
+        return path.stat().st_size
+
+
+def append_records(
+    path: Path,
+    records: Iterable[dict[str, Any]],
+    compression: str = "none",
+    index: bool = False,
+) -> int:
+    """Append ``records`` to the file ``path`` in place; returns how many were written.
+
+    Unlike ``NdjsonWriter(append=True)`` the existing lines are not copied,
+    so the cost is that of the new records. A compressed file gains one gzip
+    member or zstd frame. With ``index`` the ``.idx`` sidecar of an
+    uncompressed file is extended; any other sidecar is dropped. The write
+    happens under the partition lock and is fsynced before returning.
+    """
+    compression = resolve_compression(compression)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with partition_lock(path):
+        builder = OffsetIndexBuilder() if index and compression == "none" else None
+        if builder is not None and path.exists():
+            builder.extend_from(path)
+        with _open_text_appender(path, compression, DEFAULT_BUFFER_SIZE) as f:
+            for record in records:
+                line = json.dumps(record, ensure_ascii=False) + "\n"
+                f.write(line)
+                if builder is not None:
+                    builder.add(_encoded_size(line), dedup_key(record))
+                count += 1
+        _fsync_path(path)
+        if builder is not None:
+            builder.write(path)
+        else:
+            index_path_for(path).unlink(missing_ok=True)
+    return count
 
 
 def write_leads(
@@ -44,21 +611,69 @@ def write_leads(
     run_date: date | str | None = None,
     mode: str | None = None,
     overwrite: bool = False,
+    params: dict[str, Any] | None = None,
+    inputs: Iterable[Path] = (),
+    result: dict[str, Any] | None = None,
 ) -> Path:
+    """Write ``leads`` to the source's raw partition and its ``_manifest.json``.
+
+    ``params`` and ``inputs`` are recorded in the manifest next to the source
+    and mode; ``result`` is recorded with the written ``output_path`` added,
+    so a fetcher can replay it (see ``partition_manifest.reusable_result``).
+    """
     if run_date is None:
         run_date = date.today()
     run_dir = get_run_dir(cfg, source, run_date, mode=mode)
     run_dir.mkdir(parents=True, exist_ok=True)
     path = run_dir / "leads.ndjson"
+    settings = storage_settings(cfg)
 
-    if overwrite and path.exists():
-        path.unlink()
+    if not leads and not overwrite:
+        existing = find_ndjson(path)
+        if existing is not None:
+            return existing
 
-    if not leads:
-        path.touch(exist_ok=True)
-        return path
+    # Imported lazily: these modules build on this one.
+    from .lead_store import StageWriter  # no installation needed
+    from .partition_manifest import (  # no installation needed
+        existing_record_count,
+        write_partition_manifest,
+    )
+    from .payload_store import open_payload_store  # no installation needed
 
-    for lead in leads:
-        append_ndjson(path, lead.to_dict())
+    payloads = open_payload_store(cfg, settings)
+    if payloads is not None:
+        leads = list(payloads.externalize_leads(leads))
 
-    return path
+    # One lock around count, write and manifest keeps record_count right
+    # when parallel fetchers share a partition; SQLite locks for itself.
+    with partition_lock(path) if settings.uses_ndjson else nullcontext():
+        started = time.perf_counter()
+        prior = 0 if overwrite else existing_record_count(path)
+        run_date_str = _run_date_str(run_date)
+        with StageWriter(
+            cfg,
+            "raw",
+            run_date_str,
+            path,
+            source=source,
+            append=not overwrite,
+            settings=settings,
+        ) as writer:
+            writer.write_many_leads(leads)
+        write_partition_manifest(
+            run_dir,
+            "raw",
+            run_date_str,
+            outputs=writer.files,
+            record_count=prior + writer.count,
+            started=started,
+            inputs=inputs,
+            params={"source": source, "mode": mode, **(params or {})},
+            result=(
+                {**result, "output_path": str(writer.path)}
+                if result is not None
+                else None
+            ),
+        )
+        return writer.path
@@ -0,0 +1,261 @@
+from __future__ import annotations  # no installation needed
+
+import threading  # no installation needed
+from dataclasses import dataclass  # no installation needed
+from pathlib import Path  # no installation needed
+from typing import Any, Iterable  # no installation needed
+from urllib.parse import unquote, urlparse  # no installation needed
+
+import requests  # already in env; no new install
+from requests.adapters import HTTPAdapter  # already in env; no new install
+
+from ...config import ProjectConfig  # no installation needed
+from .http_cache import (  # no installation needed
+    CacheSettings,
+    HttpCache,
+    cache_settings,
+)
+from .rate_limit import (  # no installation needed
+    RateLimiter,
+    RateLimitSettings,
+    rate_limit_settings,
+)
+
+DEFAULT_USER_AGENT = "acq-pipeline/0.1 (+https://example.com)"
+ENGINES = ("sync", "async")
+
+
+@dataclass(frozen=True)
+class TransportSettings:
+    """HTTP transport options read from ``settings.yaml`` ``live_scrape``."""
+
+    timeout: int = 30
+    pool_size: int = 10
+    headers: tuple[tuple[str, str], ...] = (("User-Agent", DEFAULT_USER_AGENT),)
+    engine: str = "sync"
+    max_in_flight: int = 200
+
+
+def transport_settings(cfg: ProjectConfig | None) -> TransportSettings:
+    settings: Any = {}
+    if cfg is not None and isinstance(cfg.settings, dict):
+        settings = cfg.settings.get("live_scrape", {})
+    if not isinstance(settings, dict):
+        settings = {}
+
+    def _get_int(key: str, default: int) -> int:
+        value = settings.get(key, default)
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    headers: dict[str, str] = {"User-Agent": DEFAULT_USER_AGENT}
+    user_agent = settings.get("user_agent")
+    if isinstance(user_agent, str) and user_agent.strip():
+        headers["User-Agent"] = user_agent.strip()
+    extra_headers = settings.get("headers")
+    if isinstance(extra_headers, dict):
+        for key, value in extra_headers.items():
+            if value is not None:
+                headers[str(key)] = str(value)
+
+    engine = str(settings.get("engine") or "sync").lower()
+    if engine not in ENGINES:
+        raise ValueError(f"live_scrape.engine must be one of {ENGINES}.")
+
+    return TransportSettings(
+        timeout=max(1, _get_int("timeout_seconds", 30)),
+        pool_size=max(1, _get_int("pool_size", 10)),
+        headers=tuple(sorted(headers.items())),
+        engine=engine,
+        max_in_flight=max(1, _get_int("max_in_flight", 200)),
+    )
+
+
+def _file_url_to_path(url: str) -> Path:
+    parsed = urlparse(url)
+    path = unquote(parsed.path or "")
+    if parsed.netloc and parsed.netloc.lower() != "localhost":
+        return Path(f"//{parsed.netloc}{path}")
+    if path.startswith("/") and len(path) >= 3 and path[2] == ":":
+        return Path(path.lstrip("/"))
+    return Path(path)
+
+
+def local_path(url: str) -> Path | None:
+    """Path behind a ``file://`` URL or bare path; ``None`` for remote URLs."""
+    if url.startswith("file://"):
+        return _file_url_to_path(url)
+    if "://" not in url:
+        return Path(url)
+    return None
+
+
+def local_paths(urls: Iterable[str]) -> list[Path] | None:
+    """Paths behind ``urls``; ``None`` when any of them is remote."""
+    paths: list[Path] = []
+    for url in urls:
+        path = local_path(url)
+        if path is None:
+            return None
+        paths.append(path)
+    return paths
+
+
+def read_local_html(url: str) -> str | None:
+    """Read ``file://`` URLs and existing local paths; ``None`` means fetch it."""
+    path = local_path(url)
+    if path is None:
+        return None
+    if path.exists():
+        return path.read_text(encoding="utf-8")
+    if url.startswith("file://"):
+        raise FileNotFoundError(f"Local file not found: {path}")
+    return None
+
+
+def _host_key(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}"
+
+
+def rate_key_for(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+class HttpClient:
+    """Keep-alive ``requests`` sessions, one per scheme+host.
+
+    Every discovery fetcher goes through a client so repeated requests (pages,
+    retries, seeds on the same host) reuse pooled TCP/TLS connections. When a
+    cache is attached, ``fetch_text`` serves GETs from it and revalidates. When
+    a limiter is attached, every request waits for its per-host (or explicit
+    ``rate_key``) bucket and feeds the response headers back into it.
+    """
+
+    def __init__(
+        self,
+        settings: TransportSettings | None = None,
+        cache: HttpCache | None = None,
+        limiter: RateLimiter | None = None,
+    ) -> None:
+        self.settings = settings or TransportSettings()
+        self.cache = cache
+        self.limiter = limiter
+        self._sessions: dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def session(self, url: str) -> requests.Session:
+        key = _host_key(url)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=self.settings.pool_size
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update(dict(self.settings.headers))
+                self._sessions[key] = session
+            return session
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        timeout: int | None = None,
+        rate_key: str | None = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        if timeout is None:
+            timeout = self.settings.timeout
+        key = rate_key or rate_key_for(url)
+        if self.limiter is not None:
+            self.limiter.acquire(key)
+        response = self.session(url).request(method, url, timeout=timeout, **kwargs)
+        if self.limiter is not None:
+            self.limiter.observe(key, response.headers, response.status_code)
+        return response
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def fetch_text(self, url: str, timeout: int | None = None) -> str:
+        cache = self.cache
+        entry = cache.lookup(url) if cache is not None else None
+        if cache is not None and entry is not None and cache.is_fresh(entry):
+            return cache.read(entry)
+
+        headers = HttpCache.conditional_headers(entry)
+        response = self.get(url, headers=headers, timeout=timeout)
+        if cache is not None and entry is not None and response.status_code == 304:
+            return cache.read(entry, revalidated=True)
+        response.raise_for_status()
+        if cache is not None:
+            cache.store(
+                url,
+                response.content,
+                response.encoding or response.apparent_encoding,
+                response.headers,
+            )
+        return response.text
+
+    def cache_counts(self, since: dict[str, int] | None = None) -> dict[str, int]:
+        if self.cache is None:
+            return {"hits": 0, "misses": 0, "revalidated": 0}
+        counts = self.cache.counts()
+        if since:
+            counts = {key: value - since.get(key, 0) for key, value in counts.items()}
+        return counts
+
+    def throttled_seconds(self, since: float = 0.0) -> float:
+        """Seconds requests were held by the rate limiter, less an earlier reading."""
+        if self.limiter is None:
+            return 0.0
+        return round(self.limiter.waited_seconds - since, 3)
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def __enter__(self) -> "HttpClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+_ClientKey = tuple[TransportSettings, CacheSettings | None, RateLimitSettings]
+_CLIENTS: dict[_ClientKey, HttpClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_client(cfg: ProjectConfig | None = None) -> HttpClient:
+    """Return the process-wide client for the settings in ``cfg``."""
+    settings = transport_settings(cfg)
+    cache_cfg = cache_settings(cfg) if cfg is not None else None
+    if cache_cfg is not None and not cache_cfg.enabled:
+        cache_cfg = None
+    limits = rate_limit_settings(cfg)
+    key = (settings, cache_cfg, limits)
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            cache = None
+            if cache_cfg is not None:
+                cache = HttpCache(
+                    cache_cfg.root,
+                    ttl_seconds=cache_cfg.ttl_seconds,
+                    max_bytes=cache_cfg.max_bytes,
+                )
+            client = HttpClient(settings, cache=cache, limiter=RateLimiter(limits))
+            _CLIENTS[key] = client
+        return client
@@ -1,24 +1,27 @@
 from __future__ import annotations  # no installation needed
 
 import json  # no installation needed
+import time  # no installation needed
 from datetime import date  # no installation needed
 from pathlib import Path  # no installation needed
 
 from ...config import ProjectConfig  # no installation needed
+from ..discovery.lead_store import (  # no installation needed
+    count_stage,
+    find_in_stage,
+    iter_stage,
+    stage_exists,
+)
+from ..discovery.partition_manifest import (  # no installation needed
+    reusable_result,
+    write_partition_manifest,
+)
+from ..discovery.storage import iter_ndjson  # no installation needed
 from .render import render_dossier_md, slugify  # no installation needed
 
 
 def load_ndjson(path: Path) -> list[dict]:
-    records: list[dict] = []
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            if not line.strip():
-                continue
-            record = json.loads(line)
-            if not isinstance(record, dict):
-                raise ValueError(f"NDJSON record must be a dict: {path}")
-            records.append(record)
-    return records
+    return list(iter_ndjson(path))
 
 
 def write_text(path: Path, content: str) -> None:
@@ -26,7 +29,19 @@ def write_text(path: Path, content: str) -> None:
     path.write_text(content, encoding="utf-8")
 
 
-def build_dossiers(cfg: ProjectConfig, run_date: date, limit: int = 10) -> dict:
+def build_dossiers(
+    cfg: ProjectConfig,
+    run_date: date,
+    limit: int = 10,
+    key: str | None = None,
+    reuse: bool = False,
+) -> dict:
+    """Render candidate dossiers; with ``key`` only the leads with that dedup key.
+
+    With ``reuse`` the recorded result is returned while the candidates and
+    the rendered files are unchanged since the last build.
+    """
+    started = time.perf_counter()
     run_date_str = run_date.isoformat()
     input_path = (
         cfg.paths.data_dir
@@ -35,27 +50,47 @@ def build_dossiers(cfg: ProjectConfig, run_date: date, limit: int = 10) -> dict:
         / run_date_str
         / "leads.ndjson"
     )
-    if not input_path.exists():
+    if not stage_exists(cfg, "candidates", run_date_str, input_path):
         raise FileNotFoundError(f"Missing candidates input: {input_path}")
 
-    records = load_ndjson(input_path)
     output_dir = cfg.paths.outputs_dir / "dossiers" / run_date_str
+    params = {"limit": limit, "key": key}
+    if reuse:
+        previous = reusable_result([output_dir], params, [input_path])
+        if previous is not None:
+            return {**previous, "skipped": True}
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    if limit is None or limit < 0:
-        limit_count = len(records)
+    # The store or an offset sidecar answers the count, so only the first
+    # ``limit`` records are read; otherwise the file is scanned to count it.
+    stored_count = None
+    if key is not None:
+        records = iter(find_in_stage(cfg, "candidates", run_date_str, input_path, key))
     else:
-        limit_count = min(limit, len(records))
+        stored_count = count_stage(cfg, "candidates", run_date_str, input_path)
+        records = iter_stage(
+            cfg,
+            "candidates",
+            run_date_str,
+            input_path,
+            limit=limit if stored_count is not None else None,
+        )
+    input_count = 0
     written = 0
     index: list[dict[str, object]] = []
+    rendered: list[Path] = []
 
-    for record in records[:limit_count]:
+    for record in records:
+        input_count += 1
+        if limit is not None and 0 <= limit <= written:
+            continue
         company_name = record.get("company_name") or "unknown"
         source = record.get("source") or "unknown"
         slug = f"{slugify(str(company_name))}-{source}"
         output_path = output_dir / f"{slug}.md"
         content = render_dossier_md(record)
         write_text(output_path, content)
+        rendered.append(output_path)
         written += 1
         index.append(
             {
@@ -71,10 +106,25 @@ def build_dossiers(cfg: ProjectConfig, run_date: date, limit: int = 10) -> dict:
     index_payload = json.dumps(index, indent=2, sort_keys=True, ensure_ascii=True)
     write_text(index_path, index_payload)
 
-    return {
+    if stored_count is not None:
+        input_count = stored_count
+
+    payload = {
         "run_date": run_date_str,
-        "input_count": len(records),
+        "input_count": input_count,
         "written_count": written,
         "output_dir": str(output_dir),
         "index_path": str(index_path),
     }
+    write_partition_manifest(
+        output_dir,
+        "dossier",
+        run_date_str,
+        outputs=[*rendered, index_path],
+        record_count=written,
+        started=started,
+        inputs=[input_path],
+        params=params,
+        result=payload,
+    )
+    return payload
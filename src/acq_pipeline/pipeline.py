@@ -0,0 +1,269 @@
+from __future__ import annotations  # no installation needed
+
+import time  # no installation needed
+from concurrent.futures import (  # no installation needed
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass  # no installation needed
+from datetime import date  # no installation needed
+from pathlib import Path  # no installation needed
+from typing import Any, Callable  # no installation needed
+
+from .config import ProjectConfig  # no installation needed
+from .modules.discovery.filter import run_filter  # no installation needed
+from .modules.discovery.generic_html import run_generic_html  # no installation needed
+from .modules.discovery.merge import merge_sources  # no installation needed
+from .modules.discovery.producthunt_api import (  # no installation needed
+    run_producthunt_fixture,
+    run_producthunt_live as run_producthunt_api_live,
+)
+from .modules.discovery.producthunt_html import (  # no installation needed
+    run_producthunt_html,
+)
+from .modules.discovery.storage import get_run_dir  # no installation needed
+from .modules.dossier.io import build_dossiers  # no installation needed
+
+FETCH_SOURCES = ("generic_html", "producthunt_html", "producthunt_api")
+
+
+@dataclass
+class Stage:
+    """One node of the run graph.
+
+    ``run`` takes ``reuse``. Each stage decides skips from its own partition
+    manifests: when they show the same params and unchanged inputs and
+    outputs, it returns the recorded result with ``skipped`` set instead of
+    rerunning (see ``partition_manifest.reusable_result``).
+    """
+
+    name: str
+    run: Callable[[bool], dict[str, Any]]
+    deps: tuple[str, ...] = ()
+
+
+def _topological_order(stages: list[Stage]) -> list[str]:
+    by_name = {stage.name: stage for stage in stages}
+    if len(by_name) != len(stages):
+        raise ValueError("Stage names must be unique.")
+    order: list[str] = []
+    state: dict[str, str] = {}
+
+    def _visit(name: str) -> None:
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "active":
+            raise ValueError(f"Stage graph has a cycle through '{name}'.")
+        state[name] = "active"
+        for dep in by_name[name].deps:
+            if dep not in by_name:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'.")
+            _visit(dep)
+        state[name] = "done"
+        order.append(name)
+
+    for stage in stages:
+        _visit(stage.name)
+    return order
+
+
+def run_stages(
+    stages: list[Stage],
+    force: bool = False,
+    max_workers: int = 4,
+) -> dict[str, dict[str, Any]]:
+    """Run ``stages`` as a dependency graph, independent stages in parallel.
+
+    Returns one result per stage in topological order with ``status`` ran,
+    skipped, failed or blocked (a dependency failed). ``force`` reruns every
+    stage instead of reusing current partitions.
+    """
+    order = _topological_order(stages)
+    by_name = {stage.name: stage for stage in stages}
+
+    def _execute(stage: Stage) -> dict[str, Any]:
+        started = time.perf_counter()
+        payload = stage.run(not force)
+        if payload.get("skipped"):
+            return {"status": "skipped", "payload": payload}
+        seconds = round(time.perf_counter() - started, 3)
+        return {"status": "ran", "seconds": seconds, "payload": payload}
+
+    results: dict[str, dict[str, Any]] = {}
+    pending = list(order)
+    succeeded: set[str] = set()
+    unusable: set[str] = set()
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        in_flight: dict[Future[dict[str, Any]], Stage] = {}
+
+        def _dispatch() -> None:
+            for name in list(pending):
+                stage = by_name[name]
+                blocked_by = [dep for dep in stage.deps if dep in unusable]
+                if blocked_by:
+                    pending.remove(name)
+                    unusable.add(name)
+                    results[name] = {"status": "blocked", "blocked_by": blocked_by}
+                elif all(dep in succeeded for dep in stage.deps):
+                    pending.remove(name)
+                    in_flight[pool.submit(_execute, stage)] = stage
+
+        _dispatch()
+        while in_flight:
+            done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = in_flight.pop(future)
+                error = future.exception()
+                if error is not None:
+                    unusable.add(stage.name)
+                    results[stage.name] = {
+                        "status": "failed",
+                        "error": f"{type(error).__name__}: {error}",
+                    }
+                else:
+                    succeeded.add(stage.name)
+                    results[stage.name] = future.result()
+            _dispatch()
+
+    return {name: results[name] for name in order}
+
+
+def _fetch_output(
+    cfg: ProjectConfig, source: str, source_cfg: dict[str, Any], run_date: date
+) -> Path:
+    mode = None
+    if source == "producthunt_api":
+        mode = str(source_cfg.get("mode") or "fixture")
+    return get_run_dir(cfg, source, run_date, mode=mode) / "leads.ndjson"
+
+
+def _fetch_stage(
+    cfg: ProjectConfig,
+    source: str,
+    source_cfg: dict[str, Any],
+    run_date: date,
+    limit: int,
+) -> Stage:
+    name = f"fetch:{source}"
+    if source == "producthunt_api":
+        if str(source_cfg.get("mode") or "fixture") == "live":
+            # A live crawl reads a remote API, so it always reruns.
+            return Stage(
+                name=name,
+                run=lambda reuse: run_producthunt_api_live(
+                    cfg, limit=limit, run_date=run_date, overwrite=True
+                ),
+            )
+        return Stage(
+            name=name,
+            run=lambda reuse: run_producthunt_fixture(
+                cfg, limit=limit, run_date=run_date, overwrite=True, reuse=reuse
+            ),
+        )
+
+    runner = run_generic_html if source == "generic_html" else run_producthunt_html
+    return Stage(
+        name=name,
+        run=lambda reuse: runner(
+            cfg, limit=limit, run_date=run_date, overwrite=True, reuse=reuse
+        ),
+    )
+
+
+def build_stages(
+    cfg: ProjectConfig,
+    run_date: date,
+    limit: int = 25,
+    threshold: int = 2,
+    dossier_limit: int = 10,
+    new_only: bool = False,
+) -> tuple[list[Stage], list[str]]:
+    """Fetch every enabled source, then merge → filter → dossier.
+
+    Returns the stages and the enabled sources that have no fetcher. With
+    ``new_only`` the merge depends on the cross-date seen index as well as
+    its inputs, so it always reruns.
+    """
+    sources_cfg = cfg.sources.get("sources", cfg.sources)
+    enabled = [
+        name
+        for name, source_cfg in sources_cfg.items()
+        if isinstance(source_cfg, dict) and source_cfg.get("enabled")
+    ]
+    sources = [name for name in enabled if name in FETCH_SOURCES]
+    unsupported = [name for name in enabled if name not in FETCH_SOURCES]
+    if not sources:
+        raise ValueError("No enabled sources with a fetcher in sources.yaml.")
+
+    stages = [
+        _fetch_stage(cfg, source, sources_cfg[source], run_date, limit)
+        for source in sources
+    ]
+    fetch_outputs = {
+        source: _fetch_output(cfg, source, sources_cfg[source], run_date)
+        for source in sources
+    }
+
+    stages.extend(
+        [
+            Stage(
+                name="merge",
+                run=lambda reuse: merge_sources(
+                    cfg,
+                    sources=sources,
+                    run_date=run_date,
+                    input_paths=fetch_outputs,
+                    new_only=new_only,
+                    reuse=reuse,
+                ),
+                deps=tuple(stage.name for stage in stages),
+            ),
+            Stage(
+                name="filter",
+                run=lambda reuse: run_filter(
+                    cfg, run_date=run_date, threshold=threshold, reuse=reuse
+                ),
+                deps=("merge",),
+            ),
+            Stage(
+                name="dossier",
+                run=lambda reuse: build_dossiers(
+                    cfg, run_date=run_date, limit=dossier_limit, reuse=reuse
+                ),
+                deps=("filter",),
+            ),
+        ]
+    )
+    return stages, unsupported
+
+
+def run_pipeline(
+    cfg: ProjectConfig,
+    run_date: date,
+    limit: int = 25,
+    threshold: int = 2,
+    dossier_limit: int = 10,
+    force: bool = False,
+    max_workers: int = 4,
+    new_only: bool = False,
+) -> dict[str, object]:
+    stages, unsupported = build_stages(
+        cfg,
+        run_date,
+        limit=limit,
+        threshold=threshold,
+        dossier_limit=dossier_limit,
+        new_only=new_only,
+    )
+    results = run_stages(stages, force=force, max_workers=max_workers)
+    payload: dict[str, object] = {
+        "run_date": run_date.isoformat(),
+        "stages": results,
+        "ok": all(item["status"] in {"ran", "skipped"} for item in results.values()),
+    }
+    if unsupported:
+        payload["unsupported_sources"] = unsupported
+    return payload
@@ -0,0 +1,35 @@
+import copy
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+from acq_pipeline.config import ProjectConfig, ProjectPaths
+
+
+@pytest.fixture
+def make_cfg(tmp_path: Path) -> Callable[..., ProjectConfig]:
+    """Build a ``ProjectConfig`` whose paths live under ``root`` (default ``tmp_path``).
+
+    ``settings`` and ``sources`` are copied, so tests may share module constants.
+    """
+
+    def _make(
+        settings: dict[str, Any] | None = None,
+        sources: dict[str, Any] | None = None,
+        root: Path | None = None,
+    ) -> ProjectConfig:
+        root = root or tmp_path
+        return ProjectConfig(
+            paths=ProjectPaths(
+                repo_root=root,
+                configs_dir=root / "configs",
+                data_dir=root / "data",
+                outputs_dir=root / "outputs",
+                proof_dir=root / "proof",
+            ),
+            settings=copy.deepcopy(settings or {}),
+            sources=copy.deepcopy(sources or {}),
+        )
+
+    return _make
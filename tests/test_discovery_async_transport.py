@@ -0,0 +1,114 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+from acq_pipeline.config import ProjectConfig
+from acq_pipeline.modules.discovery.fetch_pool import fetch_batch
+from acq_pipeline.modules.discovery.http_cache import HttpCache
+from acq_pipeline.modules.discovery.transport import HttpClient, transport_settings
+
+pytest.importorskip("aiohttp")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+    user_agents: list[str] = []
+    conditional: list[str] = []
+
+    def do_GET(self) -> None:
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+            cls.user_agents.append(self.headers.get("User-Agent", ""))
+        time.sleep(0.02)
+        with cls.lock:
+            cls.active -= 1
+        if self.path == "/missing":
+            self._reply(404, b"nope")
+            return
+        if self.headers.get("If-None-Match") == '"v1"':
+            cls.conditional.append(self.path)
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._reply(200, f"<html>{self.path}</html>".encode("utf-8"))
+
+    def _reply(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        return
+
+
+class _ThreadRecordingCache(HttpCache):
+    """Records which threads touch the cache on disk."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.threads: set[str] = set()
+
+    def read(self, *args: Any, **kwargs: Any) -> str:
+        self.threads.add(threading.current_thread().name)
+        return super().read(*args, **kwargs)
+
+    def store(self, *args: Any, **kwargs: Any) -> None:
+        self.threads.add(threading.current_thread().name)
+        super().store(*args, **kwargs)
+
+
+SETTINGS = {
+    "live_scrape": {
+        "engine": "async",
+        "timeout_seconds": 5,
+        "user_agent": "async-agent/1",
+    }
+}
+
+
+def test_async_engine_fetches_caps_hosts_and_revalidates(
+    tmp_path: Path, make_cfg: Callable[..., ProjectConfig]
+) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    local = tmp_path / "local.html"
+    local.write_text("<html>local</html>", encoding="utf-8")
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        urls = [f"{base}/p{i}" for i in range(6)] + [f"{base}/missing", local.as_uri()]
+        settings = transport_settings(make_cfg(SETTINGS))
+        cache = _ThreadRecordingCache(tmp_path / "cache", ttl_seconds=0)
+        with HttpClient(settings, cache=cache) as client:
+            results = {
+                r.url: r
+                for r in fetch_batch(urls, lambda url: "", client=client, max_per_host=2)
+            }
+            assert results[f"{base}/p3"].html == "<html>/p3</html>"
+            assert results[local.as_uri()].html == "<html>local</html>"
+            assert results[f"{base}/missing"].error is not None
+            assert _Handler.peak <= 2
+            assert set(_Handler.user_agents) == {"async-agent/1"}
+
+            again = list(fetch_batch([f"{base}/p0"], lambda url: "", client=client))
+            assert again[0].html == "<html>/p0</html>"
+            assert _Handler.conditional == ["/p0"]
+            assert cache.counts()["revalidated"] == 1
+            # Cache I/O runs off the event loop's thread.
+            assert cache.threads and "acq-async-fetch" not in cache.threads
+    finally:
+        server.shutdown()
+        server.server_close()
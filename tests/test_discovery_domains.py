@@ -0,0 +1,84 @@
+import json
+from datetime import date
+from pathlib import Path
+from typing import Callable
+
+from acq_pipeline.config import ProjectConfig
+from acq_pipeline.modules.discovery.domains import (
+    PublicSuffixList,
+    canonical_url,
+    registrable_domain,
+    split_host,
+    website_key,
+)
+from acq_pipeline.modules.discovery.keys import KEY_VERSION, dedup_key
+from acq_pipeline.modules.discovery.lead_store import open_store
+from acq_pipeline.modules.discovery.merge import merge_sources, rekey
+from acq_pipeline.modules.discovery.seen_index import open_seen_index
+
+
+def test_registrable_domains_follow_the_public_suffix_list() -> None:
+    assert registrable_domain("www.acme.io") == "acme.io"
+    assert split_host("shop.acme.co.uk") == ("acme.co.uk", "co.uk")
+    assert registrable_domain("foo.github.io") == "foo.github.io"
+    assert registrable_domain("co.uk") == ""
+    assert registrable_domain("127.0.0.1") == ""
+
+    psl = PublicSuffixList(["// comment", "*.ck", "!www.ck", "com", "bücher.example"])
+    assert psl.suffix_labels("a.b.ck".split(".")) == 2
+    assert psl.suffix_labels("www.ck".split(".")) == 1
+    assert psl.suffix_labels("x.xn--bcher-kva.example".split(".")) == 2
+
+
+def test_canonical_urls_drop_tracking_and_host_variants() -> None:
+    url = "HTTPS://www.Acme.io:443/Pricing/?ref=ph&utm_source=x&plan=pro#top"
+    assert canonical_url(url) == "acme.io/pricing?plan=pro"
+    assert canonical_url("http://acme.io:8080/?fbclid=abc") == "acme.io:8080"
+    assert canonical_url("acme.io/docs") == "acme.io/docs"
+    assert canonical_url("  ") == ""
+
+
+def test_website_keys_keep_the_full_host() -> None:
+    variants = ["https://www.acme.io/?ref=ph", "acme.io", "http://acme.io:8080/"]
+    assert {website_key(url) for url in variants} == {"acme.io"}
+    assert website_key("http://app.acme.io/") == "app.acme.io"
+    assert website_key("https://dir.test/listing/acme") == "dir.test/listing/acme"
+    shared = ["https://acme.notion.site", "https://beta.notion.site/"]
+    assert len({website_key(url) for url in shared}) == 2
+    assert dedup_key({"website": "https://www.acme.io/?ref=ph"}) == dedup_key(
+        {"website": "acme.io", "source_url": "https://elsewhere.test/acme"}
+    )
+
+
+def test_merge_keeps_companies_on_shared_hosts_apart(
+    tmp_path: Path, make_cfg: Callable[..., ProjectConfig]
+) -> None:
+    cfg = make_cfg({"storage": {"backend": "both"}})
+    run_date = date(2026, 1, 9)
+    path = tmp_path / "data" / "raw" / "generic_html" / "2026-01-09" / "leads.ndjson"
+    path.parent.mkdir(parents=True)
+    path.write_text(
+        "".join(
+            json.dumps({"company_name": name, "website": f"https://{name}.notion.site/"})
+            + "\n"
+            for name in ("acme", "beta", "gamma")
+        ),
+        encoding="utf-8",
+    )
+    summary = merge_sources(cfg, ["generic_html"], run_date)
+    assert summary["output_count"] == 3 and summary["deduped_count"] == 0
+
+    # Rows keyed under an older key version are rekeyed from their records.
+    with open_store(cfg) as store:
+        store._conn.execute("UPDATE leads SET dedup_key = 'notion.site'")
+        store._conn.commit()
+    with open_seen_index(cfg) as index:
+        index.clear()
+    assert rekey(cfg) == {
+        "key_version": KEY_VERSION,
+        "store_rows_rekeyed": 3,
+        "merged_partitions": 1,
+        "seen_keys": 3,
+    }
+    with open_store(cfg) as store:
+        assert store.history("beta.notion.site")[0]["company_name"] == "beta"
@@ -0,0 +1,113 @@
+import json
+from datetime import date
+from pathlib import Path
+from typing import Callable
+
+from acq_pipeline.config import ProjectConfig
+from acq_pipeline.modules.discovery.entity_resolution import (
+    DisjointSet,
+    entity_keys,
+    fuse_records,
+)
+from acq_pipeline.modules.discovery.merge import merge_sources, read_ndjson
+
+PH_HTML = {
+    "source": "producthunt_html",
+    "source_url": "https://www.producthunt.com/posts/acme-flow?ref=home",
+    "company_name": "Acme Flow",
+    "website": None,
+    "signals": {"rank": 1, "topics": ["SaaS"]},
+}
+PH_API = {
+    "source": "producthunt_api",
+    "source_url": "https://www.producthunt.com/posts/acme-flow",
+    "company_name": "Acme Flow",
+    "website": "https://www.acmeflow.io/?utm_source=ph",
+    "description": "Workflow automation",
+    "signals": {"upvotes": 120, "topics": ["SaaS", "Productivity"]},
+    "raw": {"$ref": "sha256:" + "0" * 64, "id": "42"},
+}
+DIRECTORY = {
+    "source": "generic_html",
+    "source_url": "https://dir.test/listing/77",
+    "company_name": "AcmeFlow, Inc.",
+    "website": "https://acmeflow.io/pricing",
+    "signals": {},
+}
+
+
+def _write_ndjson(path: Path, records: list[dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+
+
+def test_disjoint_set_unions_transitively() -> None:
+    groups = DisjointSet()
+    for _ in range(5):
+        groups.add()
+    groups.union(0, 3)
+    groups.union(3, 4)
+    assert groups.find(4) == groups.find(0) != groups.find(1)
+    assert groups.union(4, 0) == groups.find(3)
+
+
+def test_keys_and_fusion() -> None:
+    assert entity_keys(PH_HTML) == [
+        "key:producthunt.com/posts/acme-flow",
+        "ph:acme-flow",
+    ]
+    assert "domain:acmeflow.io" in entity_keys(PH_API)
+    assert entity_keys(DIRECTORY, ["website", "name"]) == [
+        "domain:acmeflow.io",
+        "name:acmeflow",
+    ]
+
+    fused = fuse_records([PH_HTML, PH_API, DIRECTORY])
+    assert fused["source"] == "producthunt_html"
+    assert fused["website"] == PH_API["website"]
+    assert fused["description"] == "Workflow automation"
+    assert fused["raw"] == PH_API["raw"]
+    assert fused["signals"] == {
+        "rank": 1,
+        "topics": ["SaaS", "Productivity"],
+        "upvotes": 120,
+        "sources": ["producthunt_html", "producthunt_api", "generic_html"],
+    }
+    assert PH_HTML["signals"] == {"rank": 1, "topics": ["SaaS"]}
+
+
+def test_merge_fuses_entities_across_sources(
+    tmp_path: Path, make_cfg: Callable[..., ProjectConfig]
+) -> None:
+    data_dir = tmp_path / "data"
+    cfg = make_cfg()
+    run_date = date(2026, 1, 5)
+    other = {**DIRECTORY, "company_name": "Beta", "website": "https://beta.io"}
+    # Same name, different company: joined only when "name" is opted in.
+    namesake = {
+        **DIRECTORY,
+        "source_url": "https://dir.test/listing/78",
+        "company_name": "Acme Flow",
+        "website": "https://acmeflow.dev",
+    }
+    for source, records in (
+        ("producthunt_html", [PH_HTML]),
+        ("producthunt_api", [PH_API]),
+        ("generic_html", [DIRECTORY, other, namesake]),
+    ):
+        _write_ndjson(data_dir / "raw" / source / "2026-01-05" / "leads.ndjson", records)
+    sources = ["producthunt_html", "producthunt_api", "generic_html"]
+
+    assert merge_sources(cfg, sources, run_date)["output_count"] == 5
+    summary = merge_sources(cfg, sources, run_date, entities=True)
+    assert summary["output_count"] == 3
+    assert summary["deduped_count"] == 2
+    merged = read_ndjson(Path(summary["output_path"]))
+    assert [record["company_name"] for record in merged] == [
+        "Acme Flow",
+        "Beta",
+        "Acme Flow",
+    ]
+    assert merged[2]["website"] == "https://acmeflow.dev"
+    assert merged[0]["signals"]["sources"] == sources
+    assert merged[0]["signals"]["upvotes"] == 120
@@ -0,0 +1,127 @@
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from acq_pipeline.config import ProjectConfig
+from acq_pipeline.modules.discovery.fetch_pool import fetch_many
+from acq_pipeline.modules.discovery.generic_html import run_generic_html
+
+
+SETTINGS = {"live_scrape": {"max_workers": 4, "max_per_host": 1}}
+
+
+def test_fetch_many_caps_per_host_and_reports_errors() -> None:
+    lock = threading.Lock()
+    active: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    def _fetch(url: str) -> str:
+        host = url.split("/")[2]
+        with lock:
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+        time.sleep(0.01)
+        with lock:
+            active[host] -= 1
+        if url.endswith("/bad"):
+            raise RuntimeError("boom")
+        return url
+
+    urls = [f"https://a.example/{idx}" for idx in range(4)]
+    urls += [f"https://b.example/{idx}" for idx in range(3)] + ["https://b.example/bad"]
+    results = list(fetch_many(urls, _fetch, max_workers=4, max_per_host=2))
+
+    assert len(results) == len(urls)
+    assert peak["a.example"] <= 2
+    assert peak["b.example"] <= 2
+    errors = [result for result in results if result.error is not None]
+    assert [result.url for result in errors] == ["https://b.example/bad"]
+
+
+def test_run_generic_html_fetches_every_seed(
+    tmp_path: Path, make_cfg: Callable[..., ProjectConfig]
+) -> None:
+    fixture = Path("tests/fixtures/generic_html/sample_directory.html")
+    seed_a = tmp_path / "a.html"
+    seed_b = tmp_path / "b.html"
+    seed_a.write_text(fixture.read_text(encoding="utf-8"), encoding="utf-8")
+    seed_b.write_text(fixture.read_text(encoding="utf-8"), encoding="utf-8")
+    missing = tmp_path / "missing.html"
+
+    cfg = make_cfg(
+        SETTINGS,
+        {
+            "sources": {
+                "generic_html": {
+                    "seed_urls": [str(seed_a), str(seed_b), f"file://{missing}"],
+                    "base_url": "https://example.com/",
+                    "selectors": {
+                        "card": "div.card",
+                        "name": ".name",
+                        "url": "a::attr(href)",
+                        "description": ".desc",
+                    },
+                }
+            }
+        },
+    )
+
+    payload = run_generic_html(cfg, limit=100, run_date=date(2025, 12, 23))
+
+    assert payload["count"] == 10
+    assert payload["seed_counts"] == {
+        str(seed_a): 5,
+        str(seed_b): 5,
+        f"file://{missing}": 0,
+    }
+    assert list(payload["seed_errors"]) == [f"file://{missing}"]
+    assert payload["throttled_seconds"] == 0.0
+
+
+def test_max_pages_never_drops_seeds(
+    tmp_path: Path, make_cfg: Callable[..., ProjectConfig]
+) -> None:
+    fixture = Path("tests/fixtures/generic_html/sample_directory.html")
+    seeds = []
+    for idx in range(5):
+        seed = tmp_path / f"{idx}.html"
+        seed.write_text(fixture.read_text(encoding="utf-8"), encoding="utf-8")
+        seeds.append(str(seed))
+    cfg = make_cfg(
+        SETTINGS,
+        {
+            "generic_html": {
+                "seed_urls": seeds,
+                "base_url": "https://example.com/",
+                "max_pages": 2,
+                "selectors": {
+                    "card": "div.card",
+                    "name": ".name",
+                    "url": "a::attr(href)",
+                    "description": ".desc",
+                },
+            }
+        },
+    )
+
+    payload = run_generic_html(cfg, limit=100, run_date=date(2025, 12, 23))
+
+    assert payload["pages_fetched"] == 5
+    assert payload["count"] == 25
+    assert set(payload["seed_counts"].values()) == {5}
+    assert "pages_dropped" not in payload
+
+
+def test_run_generic_html_raises_when_all_seeds_fail(
+    tmp_path: Path, make_cfg: Callable[..., ProjectConfig]
+) -> None:
+    cfg = make_cfg(
+        SETTINGS,
+        {"generic_html": {"seed_urls": [f"file://{tmp_path / 'missing.html'}"]}},
+    )
+    with pytest.raises(FileNotFoundError):
+        run_generic_html(cfg, limit=10, run_date=date(2025, 12, 23))
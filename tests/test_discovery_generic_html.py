@@ -1,6 +1,13 @@
+from datetime import date
 from pathlib import Path
+from typing import Callable
 
-from acq_pipeline.modules.discovery.generic_html import fetch_html, parse_directory_html
+from acq_pipeline.config import ProjectConfig
+from acq_pipeline.modules.discovery.generic_html import (
+    fetch_html,
+    parse_directory_html,
+    run_generic_html,
+)
 
 
 def test_parse_directory_html_fixture() -> None:
@@ -34,3 +41,41 @@ def test_parse_directory_html_fixture() -> None:
 def test_fetch_html_local_file() -> None:
     html = fetch_html("tests/fixtures/generic_html/sample_directory.html")
     assert "Alpha Corp" in html
+
+
+def _paginated_sources(**overrides: object) -> dict:
+    source_cfg = {
+        "seed_urls": ["tests/fixtures/generic_html/paginated/page1.html"],
+        "base_url": "https://example.com/",
+        "selectors": {
+            "card": "div.card",
+            "name": ".name",
+            "url": "a::attr(href)",
+            "description": ".desc",
+            "next": "a.next::attr(href)",
+        },
+    }
+    source_cfg.update(overrides)
+    return {"generic_html": source_cfg}
+
+
+def test_run_generic_html_follows_next_links(
+    make_cfg: Callable[..., ProjectConfig],
+) -> None:
+    run_date = date(2025, 12, 23)
+    cfg = make_cfg(sources=_paginated_sources())
+
+    payload = run_generic_html(cfg, limit=100, run_date=run_date)
+    assert payload["pages_fetched"] == 3
+    assert payload["count"] == 6
+
+    capped = run_generic_html(
+        make_cfg(sources=_paginated_sources(max_pages=1)), limit=100, run_date=run_date
+    )
+    assert capped["pages_fetched"] == 2
+    assert capped["count"] == 4
+    assert [url.rsplit("/", 1)[-1] for url in capped["pages_dropped"]] == ["page3.html"]
+
+    limited = run_generic_html(cfg, limit=3, run_date=run_date)
+    assert limited["pages_fetched"] == 2
+    assert limited["count"] == 3
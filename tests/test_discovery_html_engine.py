@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import pytest
+
+from acq_pipeline.modules.discovery.generic_html import parse_directory_html
+from acq_pipeline.modules.discovery.html_engine import ENGINES, select_cards
+from acq_pipeline.modules.discovery.producthunt_html import (
+    parse_producthunt_listing_html,
+)
+
+
+def _rows(leads: list) -> list[dict]:
+    rows = [lead.to_dict() for lead in leads]
+    for row in rows:
+        row.pop("discovered_at")
+    return rows
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_engines_match_on_fixtures(engine: str) -> None:
+    directory = Path("tests/fixtures/generic_html/sample_directory.html").read_text(
+        encoding="utf-8"
+    )
+    listing = Path("tests/fixtures/producthunt_html/sample_listing.html").read_text(
+        encoding="utf-8"
+    )
+    selectors = {
+        "card": "div.card",
+        "name": ".name",
+        "url": "a::attr(href)",
+        "description": ".desc",
+    }
+
+    expected_directory = parse_directory_html(
+        directory, "generic_html", "https://example.com/", selectors
+    )
+    expected_listing = parse_producthunt_listing_html(
+        listing, base_url="https://www.producthunt.com/"
+    )
+
+    assert _rows(
+        parse_directory_html(
+            directory, "generic_html", "https://example.com/", selectors, engine
+        )
+    ) == _rows(expected_directory)
+    assert _rows(
+        parse_producthunt_listing_html(
+            listing, base_url="https://www.producthunt.com/", engine=engine
+        )
+    ) == _rows(expected_listing)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_engine_text_skips_comments_and_scripts(engine: str) -> None:
+    html = (
+        '<div class="card" data-x="1"><p class="desc"> a <!-- hidden --> '
+        "<b> x &amp; y </b> tail <script>var s = 1</script></p>"
+        '<a class="link" rel="nofollow" href=" /x ">go</a></div>'
+    )
+    (card,) = select_cards(html, "div.card", engine=engine)
+
+    assert card.text(".desc") == "ax & ytail"
+    assert card.text(".missing") is None
+    assert card.attr("a.link", "href") == " /x "
+    assert card.attr("a.link", "rel") == ""
+    assert card.texts("b") == ["x & y"]
+
+
+def test_unknown_engine_rejected() -> None:
+    with pytest.raises(ValueError):
+        select_cards("<div></div>", "div", engine="regex")
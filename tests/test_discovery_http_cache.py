@@ -0,0 +1,87 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from acq_pipeline.modules.discovery.http_cache import HttpCache
+from acq_pipeline.modules.discovery.transport import HttpClient
+
+
+class _EtagHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    full_responses = 0
+    not_modified = 0
+
+    def do_GET(self) -> None:
+        if self.headers.get("If-None-Match") == '"v1"':
+            type(self).not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        type(self).full_responses += 1
+        body = b"<html>cached body</html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        return
+
+
+def test_fetch_text_revalidates_with_etag(tmp_path: Path) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EtagHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/listing"
+    try:
+        cache = HttpCache(tmp_path / "cache", ttl_seconds=0)
+        with HttpClient(cache=cache) as client:
+            assert client.fetch_text(url) == "<html>cached body</html>"
+            assert client.fetch_text(url) == "<html>cached body</html>"
+
+        reopened = HttpCache(tmp_path / "cache", ttl_seconds=3600)
+        with HttpClient(cache=reopened) as client:
+            assert client.fetch_text(url) == "<html>cached body</html>"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert _EtagHandler.full_responses == 1
+    assert _EtagHandler.not_modified == 1
+    assert cache.counts() == {"hits": 1, "misses": 1, "revalidated": 1}
+    assert reopened.counts() == {"hits": 1, "misses": 0, "revalidated": 0}
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = HttpCache(tmp_path / "cache", ttl_seconds=3600, max_bytes=10)
+    cache.store("https://a.example/", b"aaaa", "utf-8", {})
+    cache.store("https://b.example/", b"bbbb", "utf-8", {})
+    entry_a = cache.lookup("https://a.example/")
+    assert entry_a is not None
+    cache.read(entry_a)
+
+    cache.store("https://c.example/", b"cccc", "utf-8", {"ETag": '"c"'})
+
+    assert cache.lookup("https://a.example/") is not None
+    assert cache.lookup("https://b.example/") is None
+    entry_c = cache.lookup("https://c.example/")
+    assert entry_c is not None
+    assert HttpCache.conditional_headers(entry_c) == {"If-None-Match": '"c"'}
+
+
+def test_cache_keeps_metadata_per_entry(tmp_path: Path) -> None:
+    first = HttpCache(tmp_path / "cache")
+    second = HttpCache(tmp_path / "cache")
+    first.store("https://a.example/", b"aaaa", "utf-8", {})
+    second.store("https://b.example/", b"bbbb", "utf-8", {})
+
+    assert not (tmp_path / "cache" / "index.json").exists()
+    assert len(list((tmp_path / "cache" / "bodies").glob("*.json"))) == 2
+    entry = second.lookup("https://a.example/")
+    assert entry is not None
+    assert second.read(entry) == "aaaa"
+    assert HttpCache(tmp_path / "cache").lookup("https://b.example/") is not None
@@ -0,0 +1,163 @@
+import shutil
+from datetime import date
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from acq_pipeline.config import ProjectConfig
+from acq_pipeline.modules.discovery.filter import run_filter
+from acq_pipeline.modules.discovery.lead_store import (
+    INSERT_BATCH_SIZE,
+    LeadStore,
+    StageWriter,
+    open_store,
+)
+from acq_pipeline.modules.discovery.merge import merge_sources
+from acq_pipeline.modules.discovery.schema import Lead
+from acq_pipeline.modules.discovery.storage import iter_ndjson, write_leads
+from acq_pipeline.modules.dossier.io import build_dossiers
+from acq_pipeline.pipeline import run_pipeline
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _settings(backend: str) -> dict:
+    return {
+        "http_cache": {"enabled": False},
+        "storage": {"backend": backend, "compression": "none"},
+    }
+
+
+def _lead(name: str, website: str, source: str, description: str = "") -> Lead:
+    return Lead(
+        source=source,
+        source_url=f"https://{source}.test/{name}",
+        discovered_at="2026-01-05T00:00:00Z",
+        company_name=name,
+        website=website,
+        description=description,
+    )
+
+
+def test_lead_store_indexes_partitions_and_history(tmp_path: Path) -> None:
+    records = [
+        {"source": "a", "company_name": "Acme", "website": "https://acme.io/", "filter_score": 3},
+        {"source": "a", "company_name": "Beta", "website": "https://beta.io", "filter_score": 1},
+    ]
+    with LeadStore(tmp_path / "leads.sqlite") as store:
+        assert store.write("merged", "2026-01-01", records) == 2
+        store.write("raw", "2026-01-02", records[:1], source="a")
+        assert store.write("merged", "2026-01-01", records[1:]) == 1
+
+        assert store.count("merged", "2026-01-01") == 1
+        assert store.has_partition("raw", "2026-01-02", source="a")
+        assert not store.has_partition("raw", "2026-01-02", source="b")
+        assert [r["company_name"] for r in store.iter_records("raw", "2026-01-02")] == [
+            "Acme"
+        ]
+        assert list(store.iter_records("merged", "2026-01-01", min_score=2)) == []
+        store.write("rejected", "2026-01-01", [])
+        assert store.has_partition("rejected", "2026-01-01")
+        assert not store.has_partition("rejected", "2026-01-02")
+
+        history = store.history("acme.io")
+        assert [item["run_date"] for item in history] == ["2026-01-02"]
+        assert history[0]["filter_score"] == 3
+        mode = store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_sqlite_backend_runs_merge_filter_dossier(
+    tmp_path: Path, make_cfg: Callable[..., ProjectConfig]
+) -> None:
+    cfg = make_cfg(_settings("sqlite"))
+    run_date = date(2026, 1, 5)
+    write_leads(
+        cfg,
+        "alpha",
+        [_lead("Acme", "https://acme.io", "alpha", "b2b saas subscription platform")],
+        run_date=run_date,
+    )
+    write_leads(
+        cfg,
+        "beta",
+        [
+            _lead("Acme", "https://acme.io/", "beta"),
+            _lead("Gamma", "https://gamma.io", "beta", "consumer game"),
+        ],
+        run_date=run_date,
+    )
+    assert not list((tmp_path / "data").rglob("*.ndjson*"))
+
+    merged = merge_sources(cfg, ["alpha", "beta"], run_date)
+    assert merged["input_counts"] == {"alpha": 1, "beta": 2}
+    assert merged["output_count"] == 2
+
+    filtered = run_filter(cfg, run_date, threshold=2)
+    assert filtered["input_count"] == 2
+    assert filtered["kept_count"] == 1
+
+    dossiers = build_dossiers(cfg, run_date, limit=5)
+    assert dossiers["input_count"] == 1
+    assert dossiers["written_count"] == 1
+
+    with open_store(cfg) as store:
+        stages = {item["stage"] for item in store.history("acme.io")}
+    assert stages == {"raw", "merged", "candidates"}
+
+
+def test_both_backend_keeps_ndjson_and_store_in_step(
+    tmp_path: Path, make_cfg: Callable[..., ProjectConfig]
+) -> None:
+    seed = tmp_path / "seed.html"
+    shutil.copy(FIXTURES / "generic_html" / "sample_directory.html", seed)
+    sources = {
+        "sources": {
+            "generic_html": {
+                "enabled": True,
+                "seed_urls": [str(seed)],
+                "base_url": "https://example.com/",
+                "selectors": {
+                    "card": "div.card",
+                    "name": ".name",
+                    "url": "a::attr(href)",
+                    "description": ".desc",
+                },
+            }
+        }
+    }
+    cfg = make_cfg(_settings("both"), sources)
+    run_date = date(2026, 1, 5)
+
+    first = run_pipeline(cfg, run_date=run_date)
+    assert first["ok"]
+    merged = first["stages"]["merge"]["payload"]
+    with open_store(cfg) as store:
+        assert store.count("merged", "2026-01-05") == merged["output_count"]
+
+    second = run_pipeline(cfg, run_date=run_date)
+    assert {item["status"] for item in second["stages"].values()} == {"skipped"}
+
+
+def test_failed_stage_write_leaves_both_backends_unchanged(
+    tmp_path: Path, make_cfg: Callable[..., ProjectConfig]
+) -> None:
+    cfg = make_cfg(_settings("both"))
+    path = tmp_path / "data" / "interim" / "merged" / "2026-01-05" / "leads.ndjson"
+    old = [{"source": "a", "company_name": "Acme", "website": "https://acme.io"}]
+    with StageWriter(cfg, "merged", "2026-01-05", path) as writer:
+        writer.write_many(old)
+
+    with pytest.raises(RuntimeError):
+        with StageWriter(cfg, "merged", "2026-01-05", path) as writer:
+            for idx in range(INSERT_BATCH_SIZE + 1):
+                writer.write({"source": "a", "company_name": f"New {idx}"})
+            raise RuntimeError("stage failed")
+
+    assert [record["company_name"] for record in iter_ndjson(path)] == ["Acme"]
+    with open_store(cfg) as store:
+        assert [r["company_name"] for r in store.iter_records("merged", "2026-01-05")] == [
+            "Acme"
+        ]
+        assert store._conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0] == 1
@@ -1,9 +1,21 @@
 import json
+import threading
+import time
 from datetime import date
 from pathlib import Path
+from typing import Callable
 
-from acq_pipeline.config import ProjectConfig, ProjectPaths
+import pytest
+
+from acq_pipeline.config import ProjectConfig
 from acq_pipeline.modules.discovery.merge import merge_sources, read_ndjson
+from acq_pipeline.modules.discovery.offset_index import open_offset_index
+from acq_pipeline.modules.discovery.seen_index import open_seen_index
+from acq_pipeline.modules.discovery.storage import (
+    append_records,
+    compressed_path,
+    partition_lock,
+)
 
 
 def _write_ndjson(path: Path, records: list[dict]) -> None:
@@ -14,19 +26,11 @@ def _write_ndjson(path: Path, records: list[dict]) -> None:
             f.write("\n")
 
 
-def test_merge_sources_dedup(tmp_path: Path) -> None:
+def test_merge_sources_dedup(
+    tmp_path: Path, make_cfg: Callable[..., ProjectConfig]
+) -> None:
     data_dir = tmp_path / "data"
-    cfg = ProjectConfig(
-        paths=ProjectPaths(
-            repo_root=tmp_path,
-            configs_dir=tmp_path / "configs",
-            data_dir=data_dir,
-            outputs_dir=tmp_path / "outputs",
-            proof_dir=tmp_path / "proof",
-        ),
-        settings={},
-        sources={},
-    )
+    cfg = make_cfg()
 
     run_date = date(2025, 12, 23)
     run_date_str = run_date.isoformat()
@@ -71,3 +75,169 @@ def test_merge_sources_dedup(tmp_path: Path) -> None:
 
     output_records = read_ndjson(expected_output)
     assert len(output_records) == 3
+
+
+def test_merge_new_only_drops_keys_from_earlier_runs(
+    tmp_path: Path, make_cfg: Callable[..., ProjectConfig]
+) -> None:
+    data_dir = tmp_path / "data"
+    cfg = make_cfg()
+
+    def _run(day: date, names: list[str]) -> dict:
+        path = data_dir / "raw" / "producthunt_api" / day.isoformat() / "leads.ndjson"
+        _write_ndjson(
+            path,
+            [{"website": f"https://{name}.io", "company_name": name} for name in names],
+        )
+        return merge_sources(cfg, ["producthunt_api"], run_date=day, new_only=True)
+
+    first = _run(date(2026, 1, 5), ["acme", "beta"])
+    assert first["output_count"] == 2
+    assert first["seen_before_count"] == 0
+
+    second = _run(date(2026, 1, 12), ["acme", "gamma"])
+    assert second["output_count"] == 1
+    assert second["seen_before_count"] == 1
+    merged = read_ndjson(Path(second["output_path"]))
+    assert [record["company_name"] for record in merged] == ["gamma"]
+
+    rerun = _run(date(2026, 1, 12), ["acme", "gamma"])
+    assert rerun["output_count"] == 1
+
+    with open_seen_index(cfg) as index:
+        assert index.lookup("acme.io") == ("2026-01-05", "2026-01-12")
+        assert index.lookup("gamma.io") == ("2026-01-12", "2026-01-12")
+        assert index.lookup("delta.io") is None
+        assert len(index) == 3
+
+
+@pytest.mark.parametrize("new_only", [False, True])
+def test_spilled_merge_matches_in_memory_merge(
+    tmp_path: Path, make_cfg: Callable[..., ProjectConfig], new_only: bool
+) -> None:
+    outputs = {}
+    for spill in (False, True):
+        data_dir = tmp_path / str(spill) / "data"
+            # ~10 KB per run: a few hundred records spill many runs.
+        cfg = make_cfg(
+            {"merge": {"spill": spill, "memory_mb": 0.01}}, root=tmp_path / str(spill)
+        )
+        for day, offset in ((date(2026, 1, 5), 0), (date(2026, 1, 12), 150)):
+            for source, step in (("generic_html", 1), ("producthunt_html", 3)):
+                path = data_dir / "raw" / source / day.isoformat() / "leads.ndjson"
+                _write_ndjson(
+                    path,
+                    [
+                        {
+                            "website": f"https://co-{idx % 120}.io",
+                            "company_name": f"{source} {idx}",
+                        }
+                        for idx in range(offset, offset + 300, step)
+                    ]
+                    + [{"description": "no key"}, {"description": "also no key"}],
+                )
+            summary = merge_sources(
+                cfg, ["generic_html", "producthunt_html"], day, new_only=new_only
+            )
+        merged = read_ndjson(Path(summary["output_path"]))
+        with open_seen_index(cfg) as index:
+            outputs[spill] = (summary["output_count"], merged, len(index))
+
+    assert not list((tmp_path / "True" / "data" / "tmp" / "merge").iterdir())
+    assert outputs[True] == outputs[False]
+    count, merged, _ = outputs[True]
+    assert count == len(merged) > 0
+    if not new_only:
+        assert merged[0]["company_name"] == "generic_html 150"
+
+
+@pytest.mark.parametrize("compression", ["none", "gzip"])
+def test_incremental_merge_reads_only_appended_lines(
+    tmp_path: Path, make_cfg: Callable[..., ProjectConfig], compression: str
+) -> None:
+    data_dir = tmp_path / "data"
+    cfg = make_cfg(
+        {"storage": {"compression": compression}, "merge": {"incremental": True}}
+    )
+    run_date = date(2026, 2, 1)
+    raw = data_dir / "raw"
+    inputs = {
+        source: compressed_path(raw / source / "2026-02-01" / "leads.ndjson", compression)
+        for source in ("generic_html", "producthunt_api")
+    }
+    sources = list(inputs)
+
+    def _append(source: str, *names: str) -> None:
+        records = [{"company_name": name, "website": f"https://{name}.io"} for name in names]
+        append_records(inputs[source], records, compression)
+
+    _append("generic_html", "alpha", "beta")
+    _append("producthunt_api", "alpha")
+    first = merge_sources(cfg, sources, run_date)
+    assert first["output_count"] == 2 and "incremental" not in first
+
+    _append("generic_html", "gamma", "alpha")
+    _append("producthunt_api", "delta")
+    second = merge_sources(cfg, sources, run_date, reuse=True)
+    assert second["incremental"] == {"new_input_count": 3, "appended_count": 2}
+    assert second["input_counts"] == {"generic_html": 4, "producthunt_api": 2}
+    assert second["output_count"] == 4 and second["deduped_count"] == 2
+    output = Path(second["output_path"])
+    names = [record["company_name"] for record in read_ndjson(output)]
+    assert names == ["alpha", "beta", "gamma", "delta"]
+    if compression == "none":
+        index = open_offset_index(output)
+        assert index is not None and len(index) == 4
+        index.close()
+    assert merge_sources(cfg, sources, run_date, reuse=True)["skipped"] is True
+
+    full = merge_sources(cfg, sources, run_date, incremental=False)
+    assert {k: full[k] for k in ("input_counts", "output_count", "deduped_count")} == {
+        k: second[k] for k in ("input_counts", "output_count", "deduped_count")
+    }
+
+    # A rewritten input forces a full merge, which records a fresh state.
+    inputs["producthunt_api"].unlink()
+    _append("producthunt_api", "epsilon")
+    rewritten = merge_sources(cfg, sources, run_date)
+    assert "incremental" not in rewritten and rewritten["output_count"] == 4
+
+    # An append that died before its state was recorded is cut off.
+    with output.open("ab") as f:
+        f.write(b'{"company_name": "torn')
+    _append("producthunt_api", "zeta")
+    resumed = merge_sources(cfg, sources, run_date)
+    assert resumed["incremental"]["appended_count"] == 1
+    names = [record["company_name"] for record in read_ndjson(output)]
+    assert names == ["alpha", "beta", "gamma", "epsilon", "zeta"]
+
+
+def test_tail_merge_waits_for_an_append_in_progress(
+    tmp_path: Path, make_cfg: Callable[..., ProjectConfig]
+) -> None:
+    data_dir = tmp_path / "data"
+    cfg = make_cfg({"merge": {"incremental": True}})
+    run_date = date(2026, 2, 1)
+    input_path = data_dir / "raw" / "generic_html" / "2026-02-01" / "leads.ndjson"
+    append_records(input_path, [{"company_name": "alpha", "website": "https://alpha.io"}])
+    merge_sources(cfg, ["generic_html"], run_date)
+
+    started = threading.Event()
+
+    def _slow_append() -> None:
+        with partition_lock(input_path), input_path.open("a", encoding="utf-8") as f:
+            f.write('{"company_name": "beta", ')
+            f.flush()
+            started.set()
+            time.sleep(0.2)
+            f.write('"website": "https://beta.io"}\n')
+
+    writer = threading.Thread(target=_slow_append)
+    writer.start()
+    started.wait()
+    payload = merge_sources(cfg, ["generic_html"], run_date)
+    writer.join()
+
+    assert payload["incremental"]["appended_count"] == 1
+    names = [record["company_name"] for record in read_ndjson(Path(payload["output_path"]))]
+    assert names == ["alpha", "beta"]
@@ -0,0 +1,90 @@
+import json
+from datetime import date
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from acq_pipeline.config import ProjectConfig
+from acq_pipeline.modules.discovery.merge import merge_sources, read_ndjson
+from acq_pipeline.modules.discovery.near_dup import (
+    NearDupIndex,
+    NearDupSettings,
+    near_dup_settings,
+    normalize_name,
+)
+
+
+def _write_ndjson(path: Path, records: list[dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def test_index_keeps_first_lead_of_each_cluster() -> None:
+    assert {normalize_name(n) for n in ("Acme, Inc.", "ACME", "acme.io")} == {"acme"}
+    description = "Workflow automation for finance teams"
+    index = NearDupIndex(NearDupSettings())
+    offered = [
+        ("Acme, Inc.", description),
+        ("Acme", description + "."),
+        ("acme.io", description),
+        ("Beta", description),
+        ("Acme", "Dating app for dogs"),
+        (None, None),
+    ]
+    matches = [
+        index.add(position, {"company_name": name, "description": text})
+        for position, (name, text) in enumerate(offered)
+    ]
+    assert matches == [None, 0, 0, None, None, None]
+    assert len(index) == 3
+
+
+def test_settings_validate_banding(make_cfg: Callable[..., ProjectConfig]) -> None:
+    def _cfg(near_dup: dict) -> ProjectConfig:
+        return make_cfg({"merge": {"near_dup": near_dup}})
+
+    assert near_dup_settings(_cfg({"num_perm": 64, "bands": 8})).rows == 8
+    with pytest.raises(ValueError):
+        near_dup_settings(_cfg({"num_perm": 100, "bands": 16}))
+
+
+@pytest.mark.parametrize("spill", [False, True])
+def test_merge_collapses_near_duplicates_when_enabled(
+    tmp_path: Path, make_cfg: Callable[..., ProjectConfig], spill: bool
+) -> None:
+    data_dir = tmp_path / "data"
+    cfg = make_cfg({"merge": {"spill": spill}})
+    run_date = date(2026, 1, 5)
+    description = "B2B workflow automation for finance teams"
+    _write_ndjson(
+        data_dir / "raw" / "generic_html" / "2026-01-05" / "leads.ndjson",
+        [
+            {"company_name": "Acme, Inc.", "website": "https://acme.com", "description": description},
+            {"company_name": "Beta", "website": "https://beta.io", "description": "CRM for clinics"},
+        ],
+    )
+    _write_ndjson(
+        data_dir / "raw" / "producthunt_api" / "2026-01-05" / "leads.ndjson",
+        [
+            {"company_name": "Acme", "website": "https://acme.io", "description": description},
+            {"company_name": "Acme", "website": "https://acme.io", "description": description},
+            {"company_name": "Beta", "website": "https://beta.io", "description": "exact dup"},
+        ],
+    )
+    sources = ["generic_html", "producthunt_api"]
+
+    plain = merge_sources(cfg, sources, run_date)
+    assert plain["output_count"] == 3 and "near_dup_count" not in plain
+
+    collapsed = merge_sources(cfg, sources, run_date, near_dup=True, reuse=True)
+    assert collapsed.get("skipped") is None
+    assert collapsed["output_count"] == 2
+    # The second acme.io copy is an exact duplicate, counted once as such.
+    assert collapsed["near_dup_count"] == 1
+    assert collapsed["deduped_count"] == 2
+    assert collapsed["output_count"] + 3 == sum(collapsed["input_counts"].values())
+    merged = read_ndjson(Path(collapsed["output_path"]))
+    assert [record["company_name"] for record in merged] == ["Acme, Inc.", "Beta"]
@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from acq_pipeline.modules.discovery.offset_index import (
+    build_offset_index,
+    index_path_for,
+    open_offset_index,
+)
+from acq_pipeline.modules.discovery.storage import NdjsonWriter, append_ndjson
+
+
+def _records(start: int, stop: int) -> list[dict]:
+    return [
+        {"company_name": f"Zoë {idx}", "website": f"https://co-{idx}.io/"}
+        for idx in range(start, stop)
+    ]
+
+
+def test_writer_sidecar_gives_random_access_and_key_lookup(tmp_path: Path) -> None:
+    path = tmp_path / "leads.ndjson"
+    with NdjsonWriter(path, index=True) as writer:
+        writer.write_many(_records(0, 50))
+        writer.write({"company_name": "Dup", "website": "https://co-7.io"})
+
+    index = open_offset_index(path)
+    assert index is not None
+    with index:
+        assert len(index) == 51
+        assert index.record(0)["company_name"] == "Zoë 0"
+        assert index.record(49)["website"] == "https://co-49.io/"
+        assert [r["company_name"] for r in index.records(10, 12)] == ["Zoë 10", "Zoë 11"]
+        assert [r["company_name"] for r in index.find("co-7.io")] == ["Zoë 7", "Dup"]
+        assert index.find("missing.io") == []
+
+    with NdjsonWriter(path, append=True, index=True) as writer:
+        writer.write_many(_records(50, 60))
+    with open_offset_index(path) as index:
+        assert len(index) == 61
+        assert index.record(60)["company_name"] == "Zoë 59"
+        assert index.find("co-3.io")[0]["company_name"] == "Zoë 3"
+
+
+def test_stale_or_compressed_partitions_have_no_index(tmp_path: Path) -> None:
+    path = tmp_path / "leads.ndjson"
+    with NdjsonWriter(path, index=True) as writer:
+        writer.write_many(_records(0, 3))
+    append_ndjson(path, {"company_name": "Late"})
+    assert open_offset_index(path) is None
+
+    build_offset_index(path)
+    with open_offset_index(path) as index:
+        assert index.record(3) == {"company_name": "Late"}
+
+    with NdjsonWriter(path, compression="gzip", index=True) as writer:
+        writer.write_many(_records(0, 3))
+    assert not index_path_for(path).exists()
+    assert open_offset_index(writer.path) is None
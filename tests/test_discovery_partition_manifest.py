@@ -0,0 +1,97 @@
+import hashlib
+import os
+from datetime import date
+from pathlib import Path
+from typing import Callable
+
+from acq_pipeline.config import ProjectConfig
+from acq_pipeline.modules.discovery.filter import run_filter
+from acq_pipeline.modules.discovery.merge import merge_sources
+from acq_pipeline.modules.discovery.partition_manifest import (
+    existing_record_count,
+    read_partition_manifest,
+)
+from acq_pipeline.modules.discovery.schema import Lead
+from acq_pipeline.modules.discovery.storage import append_ndjson, write_leads
+from acq_pipeline.modules.dossier.io import build_dossiers
+
+
+GZIP = {"storage": {"compression": "gzip"}}
+
+
+def _leads(*names: str) -> list[Lead]:
+    return [
+        Lead(
+            source="generic_html",
+            source_url=f"https://dir.test/{name}",
+            discovered_at="2026-01-05T00:00:00Z",
+            company_name=name,
+            website=f"https://{name}.io",
+            description="b2b saas workflow automation",
+        )
+        for name in names
+    ]
+
+
+def test_writers_record_counts_hashes_and_inputs(make_cfg: Callable[..., ProjectConfig]) -> None:
+    cfg = make_cfg(GZIP)
+    run_date = date(2026, 1, 5)
+    raw_path = write_leads(cfg, "generic_html", _leads("acme", "beta"), run_date=run_date)
+    write_leads(cfg, "generic_html", _leads("gamma"), run_date=run_date)
+
+    raw = read_partition_manifest(raw_path.parent)
+    assert raw["stage"] == "raw"
+    assert raw["record_count"] == 3
+    recorded = raw["outputs"]["leads.ndjson.gz"]
+    assert recorded["size"] == raw_path.stat().st_size
+    assert recorded["sha256"] == hashlib.sha256(raw_path.read_bytes()).hexdigest()
+    assert existing_record_count(raw_path.parent / "leads.ndjson") == 3
+
+    merged = merge_sources(cfg, ["generic_html"], run_date, reuse=True)
+    manifest = read_partition_manifest(Path(merged["output_path"]).parent)
+    assert manifest["record_count"] == 3
+    assert manifest["params"] == {"sources": ["generic_html"], "new_only": False}
+    assert manifest["inputs"][str(raw_path)]["sha256"] == recorded["sha256"]
+    assert manifest["wall_time_s"] >= 0
+
+    filtered = run_filter(cfg, run_date, threshold=2, reuse=True)
+    dossiers = build_dossiers(cfg, run_date, limit=2, reuse=True)
+    for directory in (Path(filtered["candidates_path"]).parent, Path(dossiers["output_dir"])):
+        assert read_partition_manifest(directory)["complete"] is True
+    assert read_partition_manifest(Path(dossiers["output_dir"]))["record_count"] == 2
+
+
+def test_unchanged_inputs_short_circuit_until_something_changes(
+    make_cfg: Callable[..., ProjectConfig],
+) -> None:
+    cfg = make_cfg(GZIP)
+    run_date = date(2026, 1, 5)
+    write_leads(cfg, "generic_html", _leads("acme", "beta"), run_date=run_date)
+
+    first = merge_sources(cfg, ["generic_html"], run_date, reuse=True)
+    assert "skipped" not in first
+    again = merge_sources(cfg, ["generic_html"], run_date, reuse=True)
+    assert again == {**first, "skipped": True}
+
+    assert run_filter(cfg, run_date, reuse=True).get("skipped") is None
+    assert run_filter(cfg, run_date, reuse=True)["skipped"] is True
+    assert run_filter(cfg, run_date, threshold=5, reuse=True).get("skipped") is None
+
+    write_leads(cfg, "generic_html", _leads("gamma"), run_date=run_date)
+    rerun = merge_sources(cfg, ["generic_html"], run_date, reuse=True)
+    assert rerun.get("skipped") is None
+    assert rerun["output_count"] == 3
+
+    merged_path = Path(rerun["output_path"])
+    os.utime(merged_path, ns=(0, 0))
+    assert merge_sources(cfg, ["generic_html"], run_date, reuse=True).get("skipped") is None
+
+
+def test_in_place_appends_make_the_manifest_stale(
+    make_cfg: Callable[..., ProjectConfig],
+) -> None:
+    cfg = make_cfg(GZIP)
+    cfg.settings["storage"]["compression"] = "none"
+    path = write_leads(cfg, "generic_html", _leads("acme"), run_date=date(2026, 1, 5))
+    append_ndjson(path, {"company_name": "stray"})
+    assert existing_record_count(path) == 2
@@ -0,0 +1,92 @@
+import json
+from datetime import date
+from pathlib import Path
+from typing import Callable
+
+from acq_pipeline.config import ProjectConfig
+from acq_pipeline.modules.discovery.filter import run_filter, score_record
+from acq_pipeline.modules.discovery.merge import merge_sources
+from acq_pipeline.modules.discovery.payload_store import PayloadStore, is_ref
+from acq_pipeline.modules.discovery.producthunt_api import parse_producthunt_response
+from acq_pipeline.modules.discovery.storage import iter_ndjson, write_leads
+from acq_pipeline.modules.dossier.io import build_dossiers
+
+
+def _response() -> dict:
+    topics = {"edges": [{"node": {"name": "SaaS", "slug": "saas"}}]}
+    edges = [
+        {
+            "node": {
+                "id": str(idx),
+                "name": f"Flow {idx}",
+                "tagline": "Workflow automation",
+                "description": "Long launch copy " * 40,
+                "url": f"https://www.producthunt.com/posts/flow-{idx}",
+                "website": f"https://flow-{idx}.io",
+                "votesCount": idx,
+                "topics": topics,
+            }
+        }
+        for idx in range(3)
+    ]
+    return {"data": {"posts": {"edges": edges}}}
+
+
+def test_store_is_content_addressed(tmp_path: Path) -> None:
+    store = PayloadStore(tmp_path)
+    ref = store.put({"b": 1, "a": [1, 2]})
+    assert store.put({"a": [1, 2], "b": 1}) == ref
+    assert ref in store and store.get(ref) == {"a": [1, 2], "b": 1}
+    assert len(list(tmp_path.rglob("*.json"))) == 1
+
+    record = {"raw": store.externalize({"id": "7", "x": "y"})}
+    assert is_ref(record["raw"]) and record["raw"]["id"] == "7"
+    assert store.resolve(record)["raw"] == {"id": "7", "x": "y"}
+
+
+def test_partitions_carry_refs_and_outputs_match(
+    tmp_path: Path, make_cfg: Callable[..., ProjectConfig]
+) -> None:
+    run_date = date(2026, 1, 5)
+    sizes = {}
+    dossiers = {}
+    # Parsed once: discovered_at is stamped per parse.
+    leads = parse_producthunt_response(_response())
+    for raw_store in (False, True):
+        cfg = make_cfg(
+            {"storage": {"raw_store": raw_store}}, root=tmp_path / str(raw_store)
+        )
+        path = write_leads(cfg, "producthunt_api", leads, run_date=run_date)
+        sizes[raw_store] = path.stat().st_size
+        assert leads[0].raw["description"]
+
+        merge_sources(cfg, ["producthunt_api"], run_date)
+        filtered = run_filter(cfg, run_date, threshold=2)
+        assert filtered["kept_count"] == 3
+        build_dossiers(cfg, run_date, limit=1)
+        dossier = next((tmp_path / str(raw_store) / "outputs").rglob("flow-0-*.md"))
+        dossiers[raw_store] = dossier.read_text(encoding="utf-8")
+
+    assert sizes[True] * 2 < sizes[False]
+    assert dossiers[True] == dossiers[False]
+    records = list(iter_ndjson(path))
+    assert all(is_ref(record["raw"]) for record in records)
+    assert [record["raw"]["id"] for record in records] == ["0", "1", "2"]
+    candidates = Path(filtered["candidates_path"])
+    assert "+saas" in next(iter_ndjson(candidates))["filter_reasons"]
+
+
+def test_scores_match_with_and_without_the_store(tmp_path: Path) -> None:
+    response = json.loads(
+        Path("tests/fixtures/producthunt_api/sample_response.json").read_text(
+            encoding="utf-8"
+        )
+    )
+    store = PayloadStore(tmp_path)
+    for lead in parse_producthunt_response(response):
+        inline = lead.to_dict()
+        moved = {**inline, "raw": store.externalize(lead.raw)}
+        assert is_ref(moved["raw"])
+        for path in tmp_path.rglob("*.json"):
+            path.unlink()
+        assert score_record(moved) == score_record(inline)
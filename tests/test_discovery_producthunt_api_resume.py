@@ -0,0 +1,174 @@
+import json
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+from acq_pipeline.config import ProjectConfig
+from acq_pipeline.modules.discovery import producthunt_api
+from acq_pipeline.modules.discovery.lead_store import open_store
+from acq_pipeline.modules.discovery.offset_index import index_path_for
+from acq_pipeline.modules.discovery.partition_manifest import read_partition_manifest
+from acq_pipeline.modules.discovery.producthunt_api import (
+    checkpoint_path,
+    read_checkpoint,
+    run_producthunt_live,
+)
+
+
+SETTINGS = {"live_scrape": {"sleep_seconds": 0, "max_retries": 1}}
+
+
+class _Response:
+    status_code = 200
+    headers: dict[str, str] = {}
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        self._data = data
+
+    def raise_for_status(self) -> None:
+        return
+
+    def json(self) -> dict[str, Any]:
+        return self._data
+
+
+class _PagedClient:
+    """Serves three pages of two posts each, optionally failing on one page."""
+
+    def __init__(self, fail_on_page: int | None = None) -> None:
+        self.fail_on_page = fail_on_page
+        self.cursors: list[str | None] = []
+
+    def post(self, url: str, **kwargs: Any) -> _Response:
+        after = kwargs["json"]["variables"]["after"]
+        self.cursors.append(after)
+        page = 0 if after is None else int(after)
+        if page == self.fail_on_page:
+            raise RuntimeError("network down")
+        edges = [
+            {"node": {"id": f"{page}-{idx}", "name": f"Post {page}-{idx}"}}
+            for idx in range(2)
+        ]
+        return _Response(
+            {
+                "data": {
+                    "posts": {
+                        "edges": edges,
+                        "pageInfo": {
+                            "endCursor": str(page + 1),
+                            "hasNextPage": page < 2,
+                        },
+                    }
+                }
+            }
+        )
+
+
+def test_live_crawl_resumes_from_checkpoint(
+    tmp_path: Path,
+    make_cfg: Callable[..., ProjectConfig],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("PRODUCTHUNT_DEV_TOKEN", "token")
+    cfg = make_cfg(SETTINGS)
+    run_date = date(2025, 12, 23)
+
+    failing = _PagedClient(fail_on_page=2)
+    monkeypatch.setattr(producthunt_api, "get_client", lambda cfg: failing)
+    with pytest.raises(RuntimeError):
+        run_producthunt_live(cfg, limit=10, run_date=run_date)
+
+    output_path = tmp_path / "data/raw/producthunt_api/2025-12-23/live/leads.ndjson"
+    checkpoint = read_checkpoint(checkpoint_path(output_path))
+    assert checkpoint is not None
+    assert checkpoint["after"] == "2"
+    assert checkpoint["count"] == 4
+    with output_path.open("a", encoding="utf-8") as f:
+        f.write('{"partial": ')
+
+    healthy = _PagedClient()
+    monkeypatch.setattr(producthunt_api, "get_client", lambda cfg: healthy)
+    payload = run_producthunt_live(cfg, limit=10, run_date=run_date, resume=True)
+
+    assert healthy.cursors == ["2"]
+    assert payload["count"] == 6
+    lines = output_path.read_text(encoding="utf-8").splitlines()
+    ids = [json.loads(line)["raw"]["id"] for line in lines]
+    assert ids == ["0-0", "0-1", "1-0", "1-1", "2-0", "2-1"]
+    assert read_checkpoint(checkpoint_path(output_path))["complete"] is True
+    assert read_partition_manifest(output_path.parent)["record_count"] == 6
+
+
+def test_appending_live_crawl_counts_existing_rows(
+    tmp_path: Path,
+    make_cfg: Callable[..., ProjectConfig],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("PRODUCTHUNT_DEV_TOKEN", "token")
+    monkeypatch.setattr(producthunt_api, "get_client", lambda cfg: _PagedClient())
+    cfg = make_cfg(SETTINGS)
+    run_date = date(2025, 12, 23)
+
+    run_producthunt_live(cfg, limit=10, run_date=run_date)
+    run_producthunt_live(cfg, limit=10, run_date=run_date)
+
+    output_path = tmp_path / "data/raw/producthunt_api/2025-12-23/live/leads.ndjson"
+    assert len(output_path.read_text(encoding="utf-8").splitlines()) == 12
+    assert read_partition_manifest(output_path.parent)["record_count"] == 12
+
+
+def test_live_crawl_writes_through_storage_backend(
+    tmp_path: Path,
+    make_cfg: Callable[..., ProjectConfig],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("PRODUCTHUNT_DEV_TOKEN", "token")
+    cfg = make_cfg(SETTINGS)
+    cfg.settings["storage"] = {"backend": "both"}
+    run_date = date(2025, 12, 23)
+
+    failing = _PagedClient(fail_on_page=2)
+    monkeypatch.setattr(producthunt_api, "get_client", lambda cfg: failing)
+    with pytest.raises(RuntimeError):
+        run_producthunt_live(cfg, limit=10, run_date=run_date)
+
+    output_path = tmp_path / "data/raw/producthunt_api/2025-12-23/live/leads.ndjson"
+    assert read_checkpoint(checkpoint_path(output_path))["rows"] == 4
+    # A page stored after the last checkpoint is dropped on resume.
+    with open_store(cfg) as store:
+        store.write(
+            "raw",
+            "2025-12-23",
+            [{"name": "stray", "raw": {"id": "stray"}}],
+            source="producthunt_api",
+            replace=False,
+        )
+
+    healthy = _PagedClient()
+    monkeypatch.setattr(producthunt_api, "get_client", lambda cfg: healthy)
+    run_producthunt_live(cfg, limit=10, run_date=run_date, resume=True)
+
+    with open_store(cfg) as store:
+        records = list(store.iter_records("raw", "2025-12-23", ["producthunt_api"]))
+    assert [record["raw"]["id"] for record in records] == [
+        "0-0", "0-1", "1-0", "1-1", "2-0", "2-1"
+    ]
+    assert index_path_for(output_path).exists()
+
+
+def test_resume_rejects_changed_query(
+    make_cfg: Callable[..., ProjectConfig],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("PRODUCTHUNT_DEV_TOKEN", "token")
+    monkeypatch.setattr(producthunt_api, "get_client", lambda cfg: _PagedClient())
+    cfg = make_cfg(SETTINGS)
+    run_date = date(2025, 12, 23)
+    run_producthunt_live(cfg, limit=2, run_date=run_date)
+
+    with pytest.raises(ValueError):
+        run_producthunt_live(
+            cfg, limit=2, run_date=run_date, order="NEWEST", resume=True
+        )
@@ -0,0 +1,135 @@
+import json
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable
+
+from acq_pipeline.config import ProjectConfig
+from acq_pipeline.modules.discovery.producthunt_partition import (
+    PartitionSettings,
+    format_datetime,
+    next_window_hours,
+    parse_datetime,
+    run_producthunt_partitioned,
+)
+
+
+def _partition(partition: dict) -> dict:
+    return {"producthunt_api": {"partition": partition}}
+
+
+class _HourlyPosts:
+    """One post per hour; the post at each window's end is returned twice."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.windows: list[tuple[str, str]] = []
+
+    def __call__(self, variables: dict[str, Any]) -> tuple[dict, dict]:
+        start = parse_datetime(variables["postedAfter"])
+        end = parse_datetime(variables["postedBefore"])
+        with self.lock:
+            if variables["after"] is None:
+                self.windows.append((variables["postedAfter"], variables["postedBefore"]))
+        hours = []
+        cursor = start
+        while cursor <= end:
+            hours.append(cursor)
+            cursor += timedelta(hours=1)
+        offset = int(variables["after"] or 0)
+        page = hours[offset : offset + variables["first"]]
+        edges = [
+            {"node": {"id": format_datetime(hour), "name": f"Post {hour:%d %H}h"}}
+            for hour in page
+        ]
+        next_offset = offset + len(page)
+        return (
+            {
+                "data": {
+                    "posts": {
+                        "edges": edges,
+                        "pageInfo": {
+                            "endCursor": str(next_offset),
+                            "hasNextPage": next_offset < len(hours),
+                        },
+                    }
+                }
+            },
+            {"X-Rate-Limit-Limit": "6250"},
+        )
+
+
+def test_next_window_hours_splits_and_merges() -> None:
+    settings = PartitionSettings(
+        min_window_hours=1, max_window_hours=48, target_pages=4
+    )
+    assert next_window_hours(24, 9, settings) == 12
+    assert next_window_hours(24, 1, settings) == 48
+    assert next_window_hours(24, 3, settings) == 24
+    assert next_window_hours(1, 9, settings) == 1
+
+
+def test_partitioned_crawl_dedups_across_windows(
+    make_cfg: Callable[..., ProjectConfig],
+) -> None:
+    cfg = make_cfg(
+        sources=_partition({"window_hours": 12, "target_pages": 1, "max_workers": 3})
+    )
+    fetch = _HourlyPosts()
+    start = datetime(2025, 12, 1)
+    payload = run_producthunt_partitioned(
+        cfg,
+        limit=1000,
+        run_date=date(2025, 12, 23),
+        posted_after=start.isoformat(),
+        posted_before=(start + timedelta(hours=72)).isoformat(),
+        fetch=fetch,
+    )
+
+    output_path = Path(payload["output_path"])
+    ids = [
+        json.loads(line)["raw"]["id"]
+        for line in output_path.read_text(encoding="utf-8").splitlines()
+    ]
+    assert len(ids) == 73
+    assert len(set(ids)) == 73
+    assert payload["count"] == 73
+    assert payload["duplicates_dropped"] == payload["windows"] - 1
+    assert payload["windows"] == len(fetch.windows)
+    assert payload["rate_limit"] == {"X-Rate-Limit-Limit": "6250"}
+    # Workers start windows concurrently, so check the covered span, not order.
+    assert min(start for start, _ in fetch.windows) == "2025-12-01T00:00:00Z"
+    assert max(end for _, end in fetch.windows) == "2025-12-04T00:00:00Z"
+
+
+def test_dense_windows_are_split_and_appends_skip_known_posts(
+    make_cfg: Callable[..., ProjectConfig],
+) -> None:
+    cfg = make_cfg(
+        sources=_partition(
+            {"window_hours": 72, "min_window_hours": 6, "target_pages": 1, "max_workers": 2}
+        )
+    )
+    fetch = _HourlyPosts()
+    start = datetime(2025, 12, 1)
+    kwargs: dict[str, Any] = {
+        "limit": 1000,
+        "run_date": date(2025, 12, 23),
+        "posted_after": start.isoformat(),
+        "posted_before": (start + timedelta(hours=72)).isoformat(),
+        "fetch": fetch,
+    }
+    payload = run_producthunt_partitioned(cfg, **kwargs)
+
+    # 73 posts at 20 per page: the 72h window is abandoned after its second
+    # page; its 36h halves finish in two.
+    assert payload["windows"] == 2
+    assert len(fetch.windows) == 3
+    assert payload["count"] == 73
+    assert payload["duplicates_dropped"] == 1
+
+    again = run_producthunt_partitioned(cfg, **kwargs)
+    assert again["count"] == 0
+    assert again["duplicates_dropped"] == 73 + 1
+    lines = Path(again["output_path"]).read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 73
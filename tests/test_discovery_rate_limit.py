@@ -0,0 +1,93 @@
+from typing import Callable
+
+from acq_pipeline.config import ProjectConfig
+from acq_pipeline.modules.discovery.rate_limit import (
+    RateLimiter,
+    RateLimitSettings,
+    TokenBucket,
+    rate_limit_settings,
+)
+from acq_pipeline.modules.discovery.transport import HttpClient
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_paces_and_pauses() -> None:
+    clock = _Clock()
+    bucket = TokenBucket(2.0, clock=clock)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 2.0
+    clock.now += 10.0
+    assert bucket.reserve() == 0.0
+
+    bucket.pause(30.0)
+    assert bucket.reserve() == 30.0
+
+
+def test_rate_limiter_adapts_from_headers() -> None:
+    clock = _Clock()
+    limiter = RateLimiter(RateLimitSettings(sleep_seconds=5.0), clock=clock)
+    assert limiter.bucket("producthunt_api").interval == 5.0
+
+    limiter.observe(
+        "producthunt_api",
+        {"X-Rate-Limit-Remaining": "1000", "X-Rate-Limit-Reset": "100"},
+    )
+    assert limiter.bucket("producthunt_api").interval == 0.1
+
+    limiter.observe(
+        "producthunt_api",
+        {"X-Rate-Limit-Remaining": "900", "X-Rate-Limit-Reset": "90"},
+    )
+    assert limiter.bucket("producthunt_api").interval == 10.0
+
+    limiter.observe(
+        "producthunt_api",
+        {"x-rate-limit-remaining": "0", "x-rate-limit-reset": "45"},
+    )
+    limiter.reserve("producthunt_api")
+    assert limiter.reserve("producthunt_api") >= 45.0
+
+
+def test_rate_limiter_pauses_on_429() -> None:
+    clock = _Clock()
+    limiter = RateLimiter(RateLimitSettings(sleep_seconds=0.0), clock=clock)
+    limiter.observe("api.example.com", {"Retry-After": "7"}, status_code=429)
+    assert limiter.reserve("api.example.com") == 7.0
+
+
+def test_client_reports_time_held_by_the_limiter() -> None:
+    clock = _Clock()
+    limiter = RateLimiter(RateLimitSettings(sleep_seconds=0.0), clock=clock)
+    client = HttpClient(limiter=limiter)
+    assert client.throttled_seconds() == 0.0
+
+    limiter.observe("api.example.com", {"Retry-After": "7"}, status_code=429)
+    before = client.throttled_seconds()
+    limiter.reserve("api.example.com")
+    assert client.throttled_seconds(since=before) == 7.0
+    assert HttpClient().throttled_seconds() == 0.0
+
+
+def test_rate_limit_settings_reads_config(make_cfg: Callable[..., ProjectConfig]) -> None:
+    cfg = make_cfg(
+        {
+            "rate_limits": {
+                "per_source_sleep_seconds": 3,
+                "per_source": {"ProductHunt_API": 0.5},
+            }
+        }
+    )
+    settings = rate_limit_settings(cfg)
+    limiter = RateLimiter(settings)
+
+    assert settings.sleep_seconds == 3.0
+    assert limiter.bucket("producthunt_api").interval == 0.5
+    assert limiter.bucket("example.com").interval == 3.0
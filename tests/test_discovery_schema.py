@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from acq_pipeline.modules.discovery.schema import Lead
@@ -15,11 +17,31 @@ def test_lead_roundtrip() -> None:
         raw={"raw_key": "raw_value"},
     )
 
-    rebuilt = Lead.from_dict(lead.to_dict())
+    data = lead.to_dict()
+    rebuilt = Lead.from_dict(data)
 
     assert rebuilt == lead
+    rebuilt.signals["extra"] = 2
+    rebuilt.raw.clear()
+    assert data["signals"] == {"signal": 1}
+    assert data["raw"] == {"raw_key": "raw_value"}
 
 
 def test_lead_missing_required_fields() -> None:
     with pytest.raises(ValueError):
         Lead.from_dict({"source": "demo", "source_url": "https://example.com"})
+
+
+def test_lead_to_json_matches_to_dict_encoding() -> None:
+    lead = Lead(
+        source="demo",
+        source_url="https://example.com/source/\"quoted\"",
+        discovered_at="2024-01-01T00:00:00Z",
+        company_name="Zoë 山田",
+        signals={"votes": 3, "ratio": 0.5, "tags": ["b2b", None]},
+        raw={"nested": {"k": "v"}},
+    )
+
+    assert lead.to_json() == json.dumps(lead.to_dict(), ensure_ascii=False)
+    assert Lead.from_dict(json.loads(lead.to_json())) == lead
+    assert not hasattr(lead, "__dict__")
@@ -0,0 +1,183 @@
+import json
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from acq_pipeline.modules.discovery.schema import Lead
+from acq_pipeline.modules.discovery.storage import (
+    NdjsonWriter,
+    append_leads,
+    compressed_path,
+    find_ndjson,
+    iter_ndjson,
+    json_decoder,
+    lock_path_for,
+    partition_lock,
+    write_ndjson,
+)
+
+
+def _lines(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_ndjson_writer_replaces_atomically(tmp_path: Path) -> None:
+    path = tmp_path / "out" / "leads.ndjson"
+    assert write_ndjson(path, [{"id": 1}, {"id": 2}]) == 2
+
+    with pytest.raises(RuntimeError):
+        with NdjsonWriter(path) as writer:
+            writer.write({"id": 3})
+            raise RuntimeError("interrupted")
+
+    assert _lines(path) == [{"id": 1}, {"id": 2}]
+    assert sorted(path.parent.iterdir()) == [path, lock_path_for(path)]
+
+
+def test_ndjson_writer_append_keeps_existing_lines(tmp_path: Path) -> None:
+    path = tmp_path / "leads.ndjson"
+    write_ndjson(path, [{"id": 1}])
+
+    with NdjsonWriter(path, append=True, fsync=True, buffer_size=16) as writer:
+        assert writer.write_many({"id": idx} for idx in range(2, 50)) == 48
+
+    assert [record["id"] for record in _lines(path)] == list(range(1, 50))
+
+
+def test_ndjson_writer_appends_in_place_and_rolls_back(tmp_path: Path) -> None:
+    path = tmp_path / "leads.ndjson"
+    write_ndjson(path, [{"id": 1}])
+    inode = path.stat().st_ino
+    with path.open("ab") as f:
+        f.write(b'{"id": 2, "to')  # left by a killed appender
+
+    with NdjsonWriter(path, append=True, index=True) as writer:
+        writer.write({"id": 3})
+    assert path.stat().st_ino == inode
+    assert _lines(path) == [{"id": 1}, {"id": 3}]
+
+    size = path.stat().st_size
+    with pytest.raises(RuntimeError):
+        with NdjsonWriter(path, append=True, buffer_size=16) as writer:
+            writer.write_many({"id": idx} for idx in range(4, 20))
+            raise RuntimeError("interrupted")
+    assert path.stat().st_size == size
+    assert _lines(path) == [{"id": 1}, {"id": 3}]
+
+
+def test_iter_ndjson_streams_records(tmp_path: Path) -> None:
+    path = tmp_path / "leads.ndjson"
+    path.write_text('{"id": 1}\n\n{"id": 2}\n{"id": 3, "score": NaN}\n', encoding="utf-8")
+
+    for name in ("auto", "json"):
+        records = list(iter_ndjson(path, decoder=json_decoder(name)))
+        assert [record["id"] for record in records] == [1, 2, 3]
+
+    path.write_text("[1, 2]\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="must be a dict"):
+        list(iter_ndjson(path))
+
+    with pytest.raises(ValueError, match="Unknown JSON decoder"):
+        json_decoder("simdjson")
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_compressed_partitions_round_trip(tmp_path: Path, compression: str) -> None:
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    path = tmp_path / "leads.ndjson"
+    write_ndjson(path, [{"id": 1, "name": "Café"}])
+
+    with NdjsonWriter(path, append=True, compression=compression) as writer:
+        writer.write({"id": 2, "name": "東京"})
+    assert writer.path == compressed_path(path, compression)
+    assert find_ndjson(path) == writer.path
+    assert not path.exists()
+
+    with NdjsonWriter(path, append=True, compression=compression) as writer:
+        writer.write({"id": 3})
+    assert [record["id"] for record in iter_ndjson(path)] == [1, 2, 3]
+    assert list(iter_ndjson(path))[1]["name"] == "東京"
+
+
+def test_append_leads_sizes_are_truncation_points(tmp_path: Path) -> None:
+    path = compressed_path(tmp_path / "leads.ndjson", "gzip")
+    leads = [
+        Lead(source="s", source_url=f"https://example.com/{idx}", discovered_at="t")
+        for idx in range(4)
+    ]
+    size = append_leads(path, leads[:2], compression="gzip")
+    append_leads(path, leads[2:], compression="gzip")
+    assert len(list(iter_ndjson(path))) == 4
+
+    with path.open("ab") as f:
+        f.truncate(size)
+    urls = [record["source_url"] for record in iter_ndjson(path)]
+    assert urls == ["https://example.com/0", "https://example.com/1"]
+
+
+def _append_worker(path: str, worker: int, compression: str) -> None:
+    for batch in range(20):
+        leads = [
+            Lead(
+                source="producthunt_api",
+                source_url=f"https://ph.test/{worker}/{batch}/{idx}",
+                discovered_at="2026-01-05T00:00:00Z",
+                company_name=f"w{worker}-b{batch}-{idx}",
+                description="x" * 2000,
+            )
+            for idx in range(25)
+        ]
+        append_leads(Path(path), leads, compression=compression)
+
+
+def _writer_worker(path: str, worker: int) -> None:
+    for batch in range(5):
+        with NdjsonWriter(Path(path), append=True) as writer:
+            writer.write_many({"worker": worker, "batch": batch, "i": i} for i in range(50))
+
+
+@pytest.mark.parametrize("compression", ["none", "gzip"])
+def test_parallel_appenders_never_interleave_or_drop_lines(
+    tmp_path: Path, compression: str
+) -> None:
+    path = compressed_path(tmp_path / "leads.ndjson", compression)
+    ctx = multiprocessing.get_context("fork")
+    procs = [
+        ctx.Process(target=_append_worker, args=(str(path), worker, compression))
+        for worker in range(4)
+    ]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+        assert proc.exitcode == 0
+
+    names = [record["company_name"] for record in iter_ndjson(path)]
+    assert len(names) == len(set(names)) == 4 * 20 * 25
+    assert lock_path_for(path) == tmp_path / "leads.ndjson.lock"
+
+
+def test_appending_writers_serialize_across_processes_and_threads(tmp_path: Path) -> None:
+    path = tmp_path / "leads.ndjson"
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_writer_worker, args=(str(path), w)) for w in range(3)]
+    for proc in procs:
+        proc.start()
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        list(pool.map(lambda w: _writer_worker(str(path), w), range(3, 6)))
+    for proc in procs:
+        proc.join()
+        assert proc.exitcode == 0
+
+    records = list(iter_ndjson(path))
+    assert len(records) == 6 * 5 * 50
+    assert len({(r["worker"], r["batch"], r["i"]) for r in records}) == len(records)
+
+    # Re-entrant for the holder, whichever variant of the partition it names.
+    with partition_lock(path), partition_lock(compressed_path(path, "gzip")):
+        with NdjsonWriter(path, append=True) as writer:
+            writer.write({"worker": -1})
+    assert sum(1 for _ in iter_ndjson(path)) == len(records) + 1
@@ -1,8 +1,9 @@
 import json
 from datetime import date
 from pathlib import Path
+from typing import Callable
 
-from acq_pipeline.config import ProjectConfig, ProjectPaths
+from acq_pipeline.config import ProjectConfig
 from acq_pipeline.modules.discovery.schema import Lead
 from acq_pipeline.modules.discovery.storage import write_leads
 
@@ -11,18 +12,8 @@ def _read_ndjson(path: Path) -> list[dict]:
     return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
 
 
-def test_write_leads_modes_and_overwrite(tmp_path: Path) -> None:
-    cfg = ProjectConfig(
-        paths=ProjectPaths(
-            repo_root=tmp_path,
-            configs_dir=tmp_path / "configs",
-            data_dir=tmp_path / "data",
-            outputs_dir=tmp_path / "outputs",
-            proof_dir=tmp_path / "proof",
-        ),
-        settings={},
-        sources={},
-    )
+def test_write_leads_modes_and_overwrite(make_cfg: Callable[..., ProjectConfig]) -> None:
+    cfg = make_cfg()
 
     run_date = date(2025, 12, 23)
     leads_fixture = [
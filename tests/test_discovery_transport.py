@@ -0,0 +1,58 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+from acq_pipeline.config import ProjectConfig
+from acq_pipeline.modules.discovery.generic_html import fetch_html
+from acq_pipeline.modules.discovery.transport import (
+    HttpClient,
+    get_client,
+    transport_settings,
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    peers: set[int] = set()
+    user_agents: list[str] = []
+
+    def do_GET(self) -> None:
+        self.peers.add(self.client_address[1])
+        self.user_agents.append(self.headers.get("User-Agent", ""))
+        body = b"<html>ok</html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        return
+
+
+def test_client_reuses_connections_per_host(make_cfg: Callable[..., ProjectConfig]) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        cfg = make_cfg({"live_scrape": {"timeout_seconds": 5, "user_agent": "test-agent/1"}})
+        url = f"http://127.0.0.1:{server.server_address[1]}/page"
+        with HttpClient(transport_settings(cfg)) as client:
+            for _ in range(3):
+                assert fetch_html(url, client=client) == "<html>ok</html>"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert len(_Handler.peers) == 1
+    assert _Handler.user_agents == ["test-agent/1"] * 3
+
+
+def test_get_client_is_shared_per_settings(make_cfg: Callable[..., ProjectConfig]) -> None:
+    cfg = make_cfg({"live_scrape": {"pool_size": 4, "headers": {"Accept": "text/html"}}})
+    client = get_client(cfg)
+
+    assert get_client(cfg) is client
+    assert client.settings.pool_size == 4
+    assert ("Accept", "text/html") in client.settings.headers
+    assert get_client(make_cfg({"live_scrape": {"pool_size": 5}})) is not client
@@ -0,0 +1,109 @@
+import shutil
+from datetime import date
+from pathlib import Path
+from typing import Callable
+
+from acq_pipeline.config import ProjectConfig
+from acq_pipeline.pipeline import Stage, run_pipeline, run_stages
+
+FIXTURES = Path(__file__).parent / "fixtures"
+NO_CACHE = {"http_cache": {"enabled": False}}
+
+
+def _sources(tmp_path: Path) -> dict:
+    seed = tmp_path / "seed.html"
+    shutil.copy(FIXTURES / "generic_html" / "sample_directory.html", seed)
+    shutil.copy(FIXTURES / "producthunt_api" / "sample_response.json", tmp_path)
+    return {
+        "sources": {
+            "generic_html": {
+                "enabled": True,
+                "seed_urls": [str(seed)],
+                "base_url": "https://example.com/",
+                "selectors": {
+                    "card": "div.card",
+                    "name": ".name",
+                    "url": "a::attr(href)",
+                    "description": ".desc",
+                },
+            },
+            "producthunt_api": {
+                "enabled": True,
+                "mode": "fixture",
+                "fixture_path": "sample_response.json",
+            },
+            "wellfound": {"enabled": True},
+        }
+    }
+
+
+def _statuses(payload: dict) -> dict[str, str]:
+    return {name: item["status"] for name, item in payload["stages"].items()}
+
+
+def test_run_pipeline_skips_unchanged_stages(
+    tmp_path: Path, make_cfg: Callable[..., ProjectConfig]
+) -> None:
+    cfg = make_cfg(NO_CACHE, _sources(tmp_path))
+    run_date = date(2026, 1, 5)
+
+    first = run_pipeline(cfg, run_date=run_date)
+    assert first["ok"]
+    assert set(_statuses(first).values()) == {"ran"}
+    assert first["unsupported_sources"] == ["wellfound"]
+    merge = first["stages"]["merge"]["payload"]
+    assert set(merge["input_counts"]) == {"generic_html", "producthunt_api"}
+    assert (tmp_path / "outputs" / "dossiers" / "2026-01-05" / "_index.json").exists()
+
+    second = run_pipeline(cfg, run_date=run_date)
+    assert set(_statuses(second).values()) == {"skipped"}
+    assert second["stages"]["merge"]["payload"]["output_count"] == merge["output_count"]
+    assert not (tmp_path / "data" / "state" / "pipeline").exists()
+
+    seed = tmp_path / "seed.html"
+    seed.write_text(
+        seed.read_text(encoding="utf-8").replace("</body>", "<!-- edit --></body>"),
+        encoding="utf-8",
+    )
+    third = run_pipeline(cfg, run_date=run_date)
+    assert _statuses(third)["fetch:generic_html"] == "ran"
+    assert _statuses(third)["fetch:producthunt_api"] == "skipped"
+
+    forced = run_pipeline(cfg, run_date=run_date, force=True)
+    assert set(_statuses(forced).values()) == {"ran"}
+
+
+def test_run_pipeline_reruns_paginated_fetch(
+    tmp_path: Path, make_cfg: Callable[..., ProjectConfig]
+) -> None:
+    cfg = make_cfg(NO_CACHE, _sources(tmp_path))
+    generic = cfg.sources["sources"]["generic_html"]
+    generic["selectors"]["next"] = "a.next::attr(href)"
+    run_date = date(2026, 1, 5)
+
+    run_pipeline(cfg, run_date=run_date)
+    second = run_pipeline(cfg, run_date=run_date)
+
+    assert _statuses(second)["fetch:generic_html"] == "ran"
+    assert _statuses(second)["fetch:producthunt_api"] == "skipped"
+
+
+def test_run_stages_blocks_dependents_of_failed_stage(tmp_path: Path) -> None:
+    def _boom(reuse: bool) -> dict:
+        raise RuntimeError("fetch failed")
+
+    def _ok(reuse: bool) -> dict:
+        return {}
+
+    stages = [
+        Stage("a", run=_boom),
+        Stage("b", run=_ok),
+        Stage("c", run=_ok, deps=("a", "b")),
+        Stage("d", run=_ok, deps=("c",)),
+    ]
+    results = run_stages(stages)
+
+    assert results["a"]["status"] == "failed"
+    assert results["b"]["status"] == "ran"
+    assert results["c"] == {"status": "blocked", "blocked_by": ["a"]}
+    assert results["d"] == {"status": "blocked", "blocked_by": ["c"]}